@@ -0,0 +1,99 @@
+"""
+access_log.py
+─────────────
+Structured, sampled access logs that never block a request.
+
+    {"ts": 1760859000.123, "route": "/api/predict", "status": 200,
+     "latency_ms": 8.41, "batch": 1, "errors": 0,
+     "model_version": "26cdd64cf2de", "cache_hit": null}
+
+``errors`` counts the profiles in the request that were rejected (an
+out-of-range score answered with an error body or card, not a prediction);
+``cache_hit`` is the lookup backend's answer for the request's primary
+prediction, not for any extra scoring done after it.
+
+``AccessLog.record(...)`` is the only thing on the request path: a
+``random()`` for sampling and a tuple appended to a bounded ``deque`` (the
+ring buffer — atomic under the GIL, no lock, oldest entries overwritten
+when full).  A daemon thread wakes every ``FLUSH_INTERVAL`` seconds,
+drains the ring, formats the lines and writes them in one call, so JSON
+encoding and I/O happen off the request thread.  Entries lost to a full
+ring are counted in ``dropped``.
+
+    ADMISSION_ACCESS_LOG          "-" (stderr, default), a file path, or "off"
+    ADMISSION_ACCESS_LOG_SAMPLE   fraction of requests logged (default 1.0)
+    ADMISSION_ACCESS_LOG_RING     ring size in entries (default 65536)
+"""
+
+import atexit
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+LOG_TARGET  = os.environ.get("ADMISSION_ACCESS_LOG", "-")
+LOG_SAMPLE  = float(os.environ.get("ADMISSION_ACCESS_LOG_SAMPLE", 1.0))
+RING_SIZE   = int(os.environ.get("ADMISSION_ACCESS_LOG_RING", 65536))
+
+FLUSH_INTERVAL = 0.25
+FIELDS = ("ts", "route", "status", "latency_ms", "batch", "errors", "model_version", "cache_hit")
+
+
+class AccessLog:
+    """Ring buffer of access entries drained by a background writer."""
+
+    def __init__(self, target=LOG_TARGET, sample=LOG_SAMPLE, ring_size=RING_SIZE):
+        self.target = target
+        self.sample = sample if target != "off" else 0.0
+        self.ring = deque(maxlen=ring_size)
+        self.recorded = self.written = 0
+        self._thread = None
+        if self.sample > 0:
+            self._thread = threading.Thread(target=self._run, name="access-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    @property
+    def dropped(self):
+        return self.recorded - self.written - len(self.ring)
+
+    def record(self, route, status, latency_ms, batch=1, model_version=None, cache_hit=None,
+               errors=0):
+        if self.sample <= 0 or (self.sample < 1 and random.random() >= self.sample):
+            return
+        self.ring.append((time.time(), route, status, latency_ms, batch, errors,
+                          model_version, cache_hit))
+        self.recorded += 1
+
+    # ── Writer thread ──────────────────────────────────────
+    def _run(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        entries = []
+        while True:
+            try:
+                entries.append(self.ring.popleft())
+            except IndexError:
+                break
+        if not entries:
+            return
+        lines = []
+        for e in entries:
+            row = dict(zip(FIELDS, e))
+            row["ts"] = round(row["ts"], 3)
+            row["latency_ms"] = round(row["latency_ms"], 3)
+            lines.append(json.dumps(row, separators=(",", ":")))
+        text = "\n".join(lines) + "\n"
+        if self.target == "-":
+            sys.stderr.write(text)
+            sys.stderr.flush()
+        else:
+            with open(self.target, "a") as f:
+                f.write(text)
+        self.written += len(entries)
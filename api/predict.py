@@ -1,156 +1,304 @@
 """
 Vercel Python serverless function — /api/predict
 POST body (JSON):
-  { degree, exam_type, exam_score, work_exp, cgpa, sop, lor, research, country }
+  { degree, exam_type, exam_score, work_exp, cgpa, sop, lor, research, country,
+    percentiles?, concordance?, curves?, recommend?, exam_scores?, similar? }
 Response (JSON):
-  { prediction, verdict, bar_color, scorecard, tips, fit_warning }
+  { prediction, verdict, bar_color, scorecard, tips, fit_warning,
+    percentiles?, concordance?, curves?, recommendations?, similar? }
+
+``percentiles: true`` adds where the profile ranks (0–100) among past
+applicants to the same country and degree:
+  { n, CGPA, <exam_type>, Chance_of_Admit }   (null if there are none)
+
+``concordance: true`` converts a language-exam score to IELTS / TOEFL / PTE /
+DET (concordance.py), scores every exam × country variant in one batched
+call and adds the best exam per country (null for GRE profiles):
+  { scores: { <exam>: score },
+    by_country: { <country>: { best_exam, prediction, verdict, fit_warning,
+                               predictions: { <exam>: prediction } } } }
+
+``curves: true`` (CGPA, SOP, LOR and the profile's exam), one feature or a
+list of features from CGPA / SOP / LOR / IELTS / TOEFL / PTE / DET / GRE
+(any other type is a 400) adds how the admit chance moves along each one
+for the profile's country and degree, precomputed per model version (pdp.py):
+  { <feature>: { grid: [...], pd: [...], ice: [[...], ...] } }
+(``pd`` averages 30 past applicants; ``ice`` returns 8 of their curves)
+
+``recommend: k`` (1–20) adds the k best (country, degree, exam) combinations
+for the profile out of all 195, scored in one batched call (recommend.py).
+Other language exams use the concordance of the applicant's score; GRE (or
+any exam) needs ``exam_scores: { <exam>: score }``; an unknown exam or
+out-of-range score there is a 400:
+  [ { country, degree, exam_type, exam_score, prediction, verdict, fit_warning } ]
+
+``similar: k`` (1–20) adds the k most similar past applicants to the
+same country and degree, nearest first (null if the index is not built):
+  [ { exam_type, exam_score, cgpa, sop, lor, work_exp, research, chance,
+      distance } ]
+
+GET (also routed from /api/health) — readiness probe:
+  { status, warm, model_version, backend, timings, uptime_s, shadow? }
+  200 once the model is loaded and warmed, 503 otherwise.
+
+With ``ADMISSION_PROFILE`` (a fraction) or an ``X-Admission-Profile`` header
+matching ``ADMISSION_PROFILE_TOKEN``, the request is stack-sampled and the
+aggregate written as collapsed stacks + a top-N table (see profiler.py).
+
+Each request is logged as one JSON line by a background writer
+(``ADMISSION_ACCESS_LOG*``, see access_log.py).
+
+With ``ADMISSION_SHADOW_MODEL`` set, a sampled fraction of requests is also
+scored by that candidate on a background thread (see shadow.py); ``shadow``
+in the health response summarises how it differs.  Responses are unchanged.
 """
 
 import json
 import os
-import pickle
-import numpy as np
+import sys
+import threading
+import time
+from contextlib import nullcontext
 from http.server import BaseHTTPRequestHandler
 
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from access_log import AccessLog  # noqa: E402
+from inference import EXAM_LIMITS, InferenceEngine, invalid_score_error  # noqa: E402
+from profiler import HEADER as PROFILE_HEADER, SamplingProfiler  # noqa: E402
+from shadow import ShadowScorer  # noqa: E402
+
 # ── Load model once (module-level = cached between warm invocations) ──
 _base = os.path.dirname(os.path.abspath(__file__))
 _pkl  = os.path.join(_base, "..", "model.pkl")
 
-with open(_pkl, "rb") as f:
-    _p = pickle.load(f)
+_STARTED = time.time()
+ENGINE = InferenceEngine.from_pickle(_pkl)
+# Run a synthetic batch now so the cold start pays for page faults and
+# first-call set-up, not the first user's request.
+ENGINE.warm_up()
+# Candidate model scored off the request path (None unless configured)
+SHADOW = ShadowScorer.from_env()
+PROFILER = SamplingProfiler("api")
+ACCESS_LOG = AccessLog()
+# Per-thread facts about the request being served, for its access-log line
+_REQUEST = threading.local()
 
-MODEL       = _p["model"]
-COUNTRY_MAP = _p["country_map"]
-EXAM_MAP    = _p["exam_map"]
-DEGREE_MAP  = _p["degree_map"]
+TIPS = {
+    "low_cgpa":       "CGPA below 7.0 — address the gap in your SOP; highlight strong final-year grades.",
+    "weak_sop":       "Weak SOP — focus on 'why this program', specific goals, and unique value you bring.",
+    "weak_lor":       "Weak LOR — choose recommenders who know your work well, not just senior titles.",
+    "no_research":    "No research — a short assistantship or paper significantly boosts top-school admits.",
+    "no_experience":  "No work/internship experience — even short internships or projects strengthen Masters applications.",
+    "internship":     "Good — internship/project counted. Full-time experience further strengthens competitive programs.",
+    "strong_profile": "Strong profile — consider applying to reach/top-ranked schools in your target country.",
+}
 
-EXAM_LIMITS = {
-    "IELTS": (0, 9), "TOEFL": (0, 120),
-    "PTE": (10, 90), "DET": (10, 160), "GRE": (260, 340)
+FIT_WARNINGS = {
+    "gre_in_eu":    "Most EU universities don't require GRE. Consider adding IELTS/TOEFL for {country}.",
+    "gre_expected": "Many top programs in {country} expect GRE alongside a language test. Check requirements.",
 }
 
-EU_COUNTRIES  = {"France", "Germany", "Netherlands", "Sweden", "Switzerland"}
-GRE_COUNTRIES = {"USA", "Canada", "Singapore", "Australia"}
 
+MAX_SIMILAR = 20
+MAX_RECOMMEND = 20
 
-def _predict(body):
-    degree     = body["degree"]
-    exam_type  = body["exam_type"]
-    exam_score = float(body["exam_score"])
-    work_exp   = int(body["work_exp"])
-    cgpa       = float(body["cgpa"])
-    sop        = float(body["sop"])
-    lor        = float(body["lor"])
-    research   = int(body["research"])
-    country    = body["country"]
-
-    # Validate exam score
-    lo, hi = EXAM_LIMITS[exam_type]
-    if not (lo <= exam_score <= hi):
-        return {"error": f"Invalid {exam_type} score. Allowed: {lo}–{hi}"}
-
-    # Normalise exams to a 0-1 scale so that a 13/90 PTE doesn't skew the model
-    # compared to a 13/9 IELTS (which is impossible but the model sees raw numbers).
-    # Since the model was trained on these raw columns, we need to map the user's
-    # input for the **chosen** exam, and leave others at 0.
-    ielts = toefl = pte = det = gre = 0.0
-    
-    # We apply a ratio based on the max score of the chosen exam versus others,
-    # or just use the raw score if that's how the model was trained. 
-    # But wait, Random Forests are scale-invariant per feature! 
-    # The real issue is if the model wasn't trained on PTE/DET properly.
-    # Let's ensure the raw value is exactly applied to the correct column.
-    
-    if exam_type == "IELTS":   ielts = exam_score
-    elif exam_type == "TOEFL": toefl = exam_score
-    elif exam_type == "PTE":   pte   = exam_score
-    elif exam_type == "DET":   det   = exam_score
-    elif exam_type == "GRE":   gre   = exam_score
-
-    # Add penalty to prediction if exam score is very low relative to its max
-    lo, hi = EXAM_LIMITS[exam_type]
-    exam_percent = (exam_score - lo) / (hi - lo) if hi > lo else 0
-     
-    features = [[
-        DEGREE_MAP[degree], work_exp, cgpa, sop, lor, research,
-        ielts, toefl, pte, det, gre,
-        EXAM_MAP[exam_type], COUNTRY_MAP[country],
-    ]]
-
-    raw_pred = float(np.clip(MODEL.predict(features)[0], 0, 1)) * 100
-    
-    # Penalty for exceptionally low exam scores (e.g. PTE 13/90 is only 3%!)
-    # If the user scores in the bottom 30% of their exam, heavily penalize the admit chance.
-    penalty = 0
-    if exam_percent < 0.35:
-        penalty = (0.35 - exam_percent) * 100 * 1.5  # Drops chance significantly
-        
-    pred = round(max(0.0, raw_pred - penalty), 2)
-
-    if pred >= 70:
-        verdict, bar_color = "Strong Admit", "#22c55e"
-    elif pred >= 45:
-        verdict, bar_color = "Moderate Chance", "#f59e0b"
-    else:
-        verdict, bar_color = "Low Chance", "#ef4444"
-
-    # Scorecard
-    def rate(val, strong, avg):
-        if val >= strong: return "Strong"
-        if val >= avg:    return "Average"
-        return "Weak"
-
-    internship = bool(body.get("internship", False))
 
-    scorecard = {
-        "CGPA":       {"value": cgpa,       "rating": rate(cgpa,     8.0, 7.0)},
-        "SOP":        {"value": sop,        "rating": rate(sop,      4.5, 3.0)},
-        "LOR":        {"value": lor,        "rating": rate(lor,      4.5, 3.0)},
-        "Work Exp":   {"value": work_exp,   "rating": rate(work_exp, 4,   2)},
-        "Research":   {"value": research,   "rating": "Strong" if research else "Weak"},
-        "Internship": {"value": internship, "rating": "Strong" if internship else "Weak"},
+def _profile(body):
+    # Unknown options are a 400 with their own message, not a KeyError in encode()
+    for field, label, known in (("country", "country", ENGINE.country_map),
+                                ("degree", "degree", ENGINE.degree_map),
+                                ("exam_type", "exam type", EXAM_LIMITS)):
+        if body[field] not in known:
+            raise ValueError(f"Unknown {label}: {body[field]}")
+    return {
+        "degree":     body["degree"],
+        "exam_type":  body["exam_type"],
+        "exam_score": float(body["exam_score"]),
+        "work_exp":   int(body["work_exp"]),
+        "cgpa":       float(body["cgpa"]),
+        "sop":        float(body["sop"]),
+        "lor":        float(body["lor"]),
+        "research":   int(body["research"]),
+        "country":    body["country"],
+        "internship": bool(body.get("internship", False)),
     }
 
-    # Tips
-    tips = []
-    if cgpa < 7.0:
-        tips.append("CGPA below 7.0 — address the gap in your SOP; highlight strong final-year grades.")
-    if sop < 3.0:
-        tips.append("Weak SOP — focus on 'why this program', specific goals, and unique value you bring.")
-    if lor < 3.0:
-        tips.append("Weak LOR — choose recommenders who know your work well, not just senior titles.")
-    if not research:
-        tips.append("No research — a short assistantship or paper significantly boosts top-school admits.")
-    if work_exp == 0 and not internship:
-        tips.append("No work/internship experience — even short internships or projects strengthen Masters applications.")
-    if work_exp == 0 and internship:
-        tips.append("Good — internship/project counted. Full-time experience further strengthens competitive programs.")
-    if work_exp > 0 and cgpa >= 8.0 and research:
-        tips.append("Strong profile — consider applying to reach/top-ranked schools in your target country.")
-
-    # Country–exam fit
-    fit_warning = ""
-    if exam_type == "GRE" and country in EU_COUNTRIES:
-        fit_warning = f"Most EU universities don't require GRE. Consider adding IELTS/TOEFL for {country}."
-    elif exam_type in ("IELTS","TOEFL","PTE","DET") and country in GRE_COUNTRIES:
-        fit_warning = f"Many top programs in {country} expect GRE alongside a language test. Check requirements."
+
+def _response(p, r):
+    if r.error:
+        return {"error": r.error}
+
+    scorecard = {
+        "CGPA":       {"value": p["cgpa"],       "rating": r.ratings["CGPA"]},
+        "SOP":        {"value": p["sop"],        "rating": r.ratings["SOP"]},
+        "LOR":        {"value": p["lor"],        "rating": r.ratings["LOR"]},
+        "Work Exp":   {"value": p["work_exp"],   "rating": r.ratings["Work Exp"]},
+        "Research":   {"value": p["research"],   "rating": r.ratings["Research"]},
+        "Internship": {"value": p["internship"], "rating": r.ratings["Internship"]},
+    }
+    fit_warning = FIT_WARNINGS[r.fit].format(country=p["country"]) if r.fit else ""
 
     return {
-        "prediction": pred,
-        "verdict":    verdict,
-        "bar_color":  bar_color,
+        "prediction": r.prediction,
+        "verdict":    r.verdict,
+        "bar_color":  r.bar_color,
         "scorecard":  scorecard,
-        "tips":       tips,
+        "tips":       [TIPS[t] for t in r.tips],
         "fit_warning": fit_warning,
     }
 
 
+def _predict(body):
+    with SHADOW.primary() if SHADOW is not None else nullcontext():
+        return _score(body)
+
+
+def _exam_scores(body):
+    """Validated ``exam_scores`` for ``recommend``; raises ValueError (400)."""
+    extra = {}
+    for exam, score in (body.get("exam_scores") or {}).items():
+        if exam not in EXAM_LIMITS:
+            raise ValueError(f"Unknown exam: {exam}")
+        lo, hi = EXAM_LIMITS[exam]
+        if not lo <= float(score) <= hi:
+            raise ValueError(invalid_score_error(exam))
+        extra[exam] = float(score)
+    return extra
+
+
+def _score(body):
+    p = _profile(body)
+    # Reject a malformed request before any scoring work
+    if body.get("recommend"):
+        extra = _exam_scores(body)
+        k_recommend = max(1, min(int(body["recommend"]), MAX_RECOMMEND))
+    if body.get("curves"):
+        features = _curve_features(p, body["curves"])
+    t0 = time.perf_counter()
+    r = ENGINE.predict(p)
+    # Read now: concordance / recommend below make further backend calls
+    _REQUEST.cache_hit = getattr(ENGINE.backend, "last_hit", None)
+    if SHADOW is not None:
+        SHADOW.submit(p, r, (time.perf_counter() - t0) * 1000)
+    out = _response(p, r)
+    if body.get("percentiles") and not r.error:
+        out["percentiles"] = ENGINE.percentile_ranks(p, r)
+    if body.get("concordance") and not r.error:
+        out["concordance"] = _concordance(p)
+    if body.get("curves") and not r.error:
+        out["curves"] = _curves(p, features)
+    if body.get("recommend") and not r.error:
+        out["recommendations"] = _recommendations(dict(p, exam_scores=extra), k_recommend)
+    if body.get("similar") and not r.error:
+        k = max(1, min(int(body["similar"]), MAX_SIMILAR))
+        found = ENGINE.similar_applicants([p], k)
+        out["similar"] = found[0] if found is not None else None
+    return out
+
+
+def _curve_features(p, requested):
+    from pdp import FEATURES
+
+    if requested is True:
+        requested = ["CGPA", "SOP", "LOR", p["exam_type"]]
+    elif isinstance(requested, str):
+        requested = [requested]
+    elif not isinstance(requested, list):
+        raise ValueError("curves must be true, a feature name or a list of feature names")
+    return [f for f in requested if f in FEATURES]
+
+
+def _curves(p, features):
+    from pdp import drawn_ice
+
+    # The same ICE_DRAWN lines the Gradio chart draws (~22 KB → ~8 KB per
+    # predict); widen the float32 arrays first so rounding survives JSON
+    return {
+        f: {k: np.round(v.astype(float), 2).tolist()
+            for k, v in (("grid", grid), ("pd", pd), ("ice", drawn_ice(ice)))}
+        for f, (grid, pd, ice) in ENGINE.dependence_curves(p, features).items()
+    }
+
+
+def _recommendations(p, k):
+    recs = ENGINE.recommend([p], k)[0]
+    for rec in recs:
+        fit = rec.pop("fit")
+        rec["fit_warning"] = FIT_WARNINGS[fit].format(country=rec["country"]) if fit else ""
+    return recs
+
+
+def _concordance(p):
+    variants = ENGINE.exam_variants(p)
+    if variants is None:
+        return None
+    scores, by_country = variants
+    out = {}
+    for country, results in by_country.items():
+        # Highest chance wins; on a tie, the exam the applicant already has
+        best = max(results, key=lambda e: (results[e].prediction, e == p["exam_type"]))
+        r = results[best]
+        out[country] = {
+            "best_exam":   best,
+            "prediction":  r.prediction,
+            "verdict":     r.verdict,
+            "fit_warning": FIT_WARNINGS[r.fit].format(country=country) if r.fit else "",
+            "predictions": {exam: res.prediction for exam, res in results.items()},
+        }
+    return {"scores": scores, "by_country": out}
+
+
+def _health():
+    health = {
+        "status":        "ok" if ENGINE.warm else "warming",
+        "warm":          ENGINE.warm,
+        "model_version": ENGINE.version,
+        "backend":       ENGINE.backend.name,
+        "timings":       ENGINE.timings,
+        "uptime_s":      round(time.time() - _STARTED, 1),
+    }
+    if SHADOW is not None:
+        health["shadow"] = SHADOW.summary()
+    return health
+
+
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
-        length = int(self.headers.get("Content-Length", 0))
-        body   = json.loads(self.rfile.read(length))
-        result = _predict(body)
-        self._json(200, result)
+        t0 = time.perf_counter()
+        status, result, body = 500, None, None
+        _REQUEST.cache_hit = None
+        try:
+            with PROFILER.sample(self.headers.get(PROFILE_HEADER)):
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    body   = json.loads(self.rfile.read(length))
+                    if not isinstance(body, dict):
+                        raise ValueError("request body must be a JSON object")
+                    result = _predict(body)
+                    status = 200
+                except KeyError as exc:
+                    if not exc.args or exc.args[0] in body:
+                        raise  # a lookup failing on a field that IS there is a bug, not a 400
+                    result, status = {"error": f"missing field {exc}"}, 400
+                except (TypeError, ValueError) as exc:  # malformed JSON, fields or options
+                    result, status = {"error": str(exc)}, 400
+                self._json(status, result)
+        finally:
+            ACCESS_LOG.record(self.path, status, (time.perf_counter() - t0) * 1000,
+                              model_version=ENGINE.version, cache_hit=_REQUEST.cache_hit,
+                              errors=int(status == 200 and "error" in result))
+        PROFILER.flush()
+
+    def do_GET(self):
+        t0 = time.perf_counter()
+        health = _health()
+        status = 200 if health["warm"] else 503
+        self._json(status, health)
+        ACCESS_LOG.record(self.path, status, (time.perf_counter() - t0) * 1000,
+                          batch=0, model_version=ENGINE.version)
 
     def do_OPTIONS(self):
         self._json(200, {})
@@ -160,10 +308,10 @@ class handler(BaseHTTPRequestHandler):
         self.send_response(status)
         self.send_header("Content-Type",  "application/json")
         self.send_header("Access-Control-Allow-Origin",  "*")
-        self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", f"Content-Type, {PROFILE_HEADER}")
         self.end_headers()
         self.wfile.write(payload)
 
     def log_message(self, *_):
-        pass  # suppress default access logs
+        pass  # replaced by the structured ACCESS_LOG (access_log.py)
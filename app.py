@@ -1,9 +1,15 @@
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestRegressor
 import gradio as gr
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 import os
+import time
+
+from access_log import AccessLog
+from inference import EngineLoader
+from profiler import SamplingProfiler
+from result_card import country_chip, notice_card, render_result
+from retrain import OUTCOMES_HEADER, OutcomeGate, Retrainer, record_outcome
 
 # ----------------------------------------
 # ALL SUPPORTED COUNTRIES (13 total)
@@ -30,310 +36,113 @@ COUNTRY_FLAGS = {
     "USA":         "🇺🇸",
 }
 
-# ISO codes for flagcdn.com — renders real flag images on any OS
-COUNTRY_ISO = {
-    "Australia": "au", "Canada": "ca", "France": "fr", "Germany": "de",
-    "Ireland": "ie", "Netherlands": "nl", "New Zealand": "nz", "Singapore": "sg",
-    "Sweden": "se", "Switzerland": "ch", "UAE": "ae", "UK": "gb", "USA": "us",
-}
-
-def flag_img(country, h=14):
-    iso = COUNTRY_ISO.get(country, "un")
-    return (f"<img src='https://flagcdn.com/20x15/{iso}.png' "
-            f"style='height:{h}px;border-radius:2px;"
-            f"vertical-align:middle;margin-right:4px;object-fit:cover'>")
-
 # Dropdown keeps emoji text; plain name extracted in predict fn
 COUNTRIES_DISPLAY = [f"{COUNTRY_FLAGS[c]} {c}" for c in COUNTRIES]
 
 EXAM_TYPES = ["IELTS", "TOEFL", "PTE", "DET", "GRE"]
 DEGREE_LEVELS = ["Undergraduate", "Masters", "PhD"]
 
-EXAM_LIMITS = {
-    "IELTS":  (0, 9),
-    "TOEFL":  (0, 120),
-    "PTE":    (10, 90),
-    "DET":    (10, 160),
-    "GRE":    (260, 340),
-}
-
 # ----------------------------------------
-# LOAD & PREPARE DATASET
+# QUEUE / BATCHING  (override via env, e.g. in vercel.json)
 # ----------------------------------------
-base_dir = os.path.dirname(os.path.abspath(__file__))
-csv_path = os.path.join(base_dir, "Admission_Predict_Final_With_Degree.csv")
-data = pd.read_csv(csv_path)
-data.columns = data.columns.str.strip()
+MAX_BATCH_SIZE    = int(os.environ.get("GRADIO_MAX_BATCH_SIZE", 16))
+CONCURRENCY_LIMIT = int(os.environ.get("GRADIO_CONCURRENCY_LIMIT", 1))
+QUEUE_SIZE        = int(os.environ.get("GRADIO_QUEUE_SIZE", 256))
 
 # ----------------------------------------
-# LOAD MODEL  (pkl → fast; fallback → train)
+# LOAD MODEL  (prebuilt model.pkl only; built in background on opt-in)
 # ----------------------------------------
-pkl_path = os.path.join(base_dir, "model.pkl")
-
-if os.path.exists(pkl_path):
-    import pickle
-    with open(pkl_path, "rb") as f:
-        _p = pickle.load(f)
-    model, country_map, exam_map, degree_map = (
-        _p["model"], _p["country_map"], _p["exam_map"], _p["degree_map"]
-    )
-    print("✅ Loaded model.pkl")
-
-else:
-    print("⚠️  model.pkl not found — training now (run train_model.py to pre-build)...")
-    exam_columns = ["IELTS", "TOEFL", "PTE", "DET", "GRE"]
-    data[exam_columns] = data[exam_columns].fillna(0)
-
-    np.random.seed(99); n = 80
-    uae_rows = pd.DataFrame({
-        "Degree_Level":          np.random.choice(["Undergraduate","Masters","PhD"], n, p=[.3,.55,.15]),
-        "Country_Aiming":        "UAE",
-        "Exam_Type":             np.random.choice(["IELTS","TOEFL","PTE"], n, p=[.55,.35,.10]),
-        "IELTS":                 np.where(np.random.choice(["IELTS","TOEFL","PTE"], n, p=[.55,.35,.10])=="IELTS",
-                                          np.round(np.random.uniform(6.0, 9.0, n), 1), 0.0),
-        "TOEFL":                 np.where(np.random.choice(["IELTS","TOEFL","PTE"], n, p=[.55,.35,.10])=="TOEFL",
-                                          np.random.randint(80, 118, n).astype(float), 0.0),
-        "PTE":                   np.where(np.random.choice(["IELTS","TOEFL","PTE"], n, p=[.55,.35,.10])=="PTE",
-                                          np.random.randint(50, 88, n).astype(float), 0.0),
-        "DET": 0.0, "GRE": 0.0,
-        "CGPA":                  np.round(np.random.uniform(6.0, 9.8, n), 2),
-        "SOP":                   np.round(np.random.uniform(1.0, 5.0, n) * 2) / 2,
-        "LOR":                   np.round(np.random.uniform(1.0, 5.0, n) * 2) / 2,
-        "Research":              np.random.randint(0, 2, n),
-        "Work_Experience_Years": np.random.randint(0, 10, n),
-        "Chance_of_Admit":       np.round(np.random.uniform(0.38, 0.88, n), 2),
-    })
-    data = pd.concat([data, uae_rows], ignore_index=True)
-
-    data["Country_Aiming"]  = data["Country_Aiming"].astype("category")
-    data["Country_Encoded"] = data["Country_Aiming"].cat.codes
-    country_map = dict(zip(data["Country_Aiming"].cat.categories, data["Country_Aiming"].cat.codes.unique()))
-
-    data["Exam_Type"]    = data["Exam_Type"].astype("category")
-    data["Exam_Encoded"] = data["Exam_Type"].cat.codes
-    exam_map = dict(zip(data["Exam_Type"].cat.categories, data["Exam_Type"].cat.codes.unique()))
-
-    data["Degree_Level"]   = data["Degree_Level"].astype("category")
-    data["Degree_Encoded"] = data["Degree_Level"].cat.codes
-    degree_map = dict(zip(data["Degree_Level"].cat.categories, data["Degree_Level"].cat.codes.unique()))
-
-    X_cols = ["Degree_Encoded","Work_Experience_Years","CGPA","SOP","LOR","Research",
-              "IELTS","TOEFL","PTE","DET","GRE","Exam_Encoded","Country_Encoded"]
-    model = RandomForestRegressor(n_estimators=200, random_state=42)
-    model.fit(data[X_cols], data["Chance_of_Admit"])
-    print("✅ Model trained successfully.")
+# Startup never trains and never imports pandas.  The loader thread unpickles
+# model.pkl, then loads the side artifacts it finds: the percentile index (a
+# read of the CSV with the csv module), similar_applicants.pkl and
+# pdp_curves.pkl (a curve missing from it is computed on first use from CSV
+# rows, see pdp.py).  If model.pkl is missing and ADMISSION_AUTO_BUILD=1, it
+# trains with train_model.build_artifact on all cores first.  /ready answers 503
+# until the engine is usable, and clicks wait up to READY_TIMEOUT seconds.
+loader = EngineLoader(build_if_missing=os.environ.get("ADMISSION_AUTO_BUILD") == "1")
+READY_TIMEOUT = float(os.environ.get("ADMISSION_READY_TIMEOUT", 10))
+
+# Reported outcomes go to outcomes.jsonl; with ADMISSION_RETRAIN_INTERVAL > 0
+# a background round grows trees on them and the loader hot-swaps the result.
+retrainer = Retrainer(on_publish=lambda _stats: loader.reload())
+# POST /outcomes feeds training data: shared token + per-client rate limit
+OUTCOME_GATE = OutcomeGate()
+
+# Opt-in stack sampling of clicks (ADMISSION_PROFILE=<fraction>, profiler.py)
+PROFILER = SamplingProfiler("gradio")
+# One JSON line per click / batch, written off the request thread (access_log.py)
+ACCESS_LOG = AccessLog()
+# Partial-dependence charts on the card (plus the profile's exam), see pdp.py
+CHART_FEATURES = ["CGPA", "SOP", "LOR"]
+
+
+def _log(route, engine, t0, results, cache_hit):
+    ACCESS_LOG.record(route, 200, (time.perf_counter() - t0) * 1000, len(results),
+                      engine.version, cache_hit, errors=sum(1 for r in results if r.error))
+
+
+def _not_ready_card():
+    return notice_card(loader.error or "⏳ The model is still loading — please try again in a moment.")
 
 
 # ----------------------------------------
 # PREDICTION FUNCTION
 # ----------------------------------------
-def predict_admission(degree, exam_type, exam_score, work_exp,
-                      cgpa, sop, lor, research, country_display,
-                      internship):
+def _profile(degree, exam_type, exam_score, work_exp,
+             cgpa, sop, lor, research, country_display, internship):
     # Strip flag prefix — e.g. "🇦🇺 Australia" → "Australia"
     country = country_display.split(" ", 1)[1] if " " in country_display else country_display
-    country_icon = COUNTRY_FLAGS.get(country, "")
-
-    min_score, max_score = EXAM_LIMITS[exam_type]
-    if exam_score < min_score or exam_score > max_score:
-        return (
-            f"<div style='padding:18px;border-radius:14px;"
-            f"background:rgba(220,38,38,.15);border:1px solid rgba(220,38,38,.4);"
-            f"color:#fca5a5;font-size:1rem;text-align:center'>"
-            f"❌ <strong>Invalid score for {exam_type}.</strong><br>"
-            f"Allowed range: {min_score} – {max_score}</div>"
-        )
-
-    ielts = toefl = pte = det = gre = 0
-    if exam_type == "IELTS":   ielts = exam_score
-    elif exam_type == "TOEFL": toefl = exam_score
-    elif exam_type == "PTE":   pte   = exam_score
-    elif exam_type == "DET":   det   = exam_score
-    elif exam_type == "GRE":   gre   = exam_score
-
-    features = [[
-        degree_map[degree],
-        work_exp, cgpa, sop, lor, research,
-        ielts, toefl, pte, det, gre,
-        exam_map[exam_type],
-        country_map[country],
-    ]]
-
-    pred = model.predict(features)[0]
-    pred = round(float(np.clip(pred, 0, 1)) * 100, 2)
-
-    # ── Verdict ──────────────────────────────────────────
-    if pred >= 70:
-        emoji, bar_color, verdict = "🎉", "#22c55e", "Strong Admit"
-    elif pred >= 45:
-        emoji, bar_color, verdict = "🎯", "#f59e0b", "Moderate Chance"
-    else:
-        emoji, bar_color, verdict = "📉", "#ef4444", "Low Chance"
-
-    research_label = "Yes ✅" if research == 1 else "No ❌"
-
-    # ── Profile strength scorecard ────────────────────────
-    def score_bar(label, icon, val, strong_thresh, avg_thresh, unit=""):
-        if val >= strong_thresh:
-            c, tag = "#22c55e", "Strong"
-        elif val >= avg_thresh:
-            c, tag = "#f59e0b", "Average"
-        else:
-            c, tag = "#ef4444", "Weak"
-        pct = min(int((val / strong_thresh) * 100), 100)
-        return (
-            f"<div style='margin:7px 0'>"
-            f"<div style='display:flex;justify-content:space-between;"
-            f"font-size:0.82rem;color:#d6d3d1;margin-bottom:3px'>"
-            f"<span>{icon} {label}</span>"
-            f"<span style='color:{c};font-weight:700'>{val}{unit} — {tag}</span></div>"
-            f"<div style='background:rgba(255,255,255,.08);border-radius:999px;height:6px'>"
-            f"<div style='width:{pct}%;height:100%;background:{c};"
-            f"border-radius:999px'></div></div></div>"
-        )
-
-    scorecard = (
-        score_bar("CGPA",            "📊", cgpa,     8.0,  7.0) +
-        score_bar("SOP Strength",    "📄", sop,      4.5,  3.0, "/5") +
-        score_bar("LOR Strength",    "📋", lor,      4.5,  3.0, "/5") +
-        score_bar("Work Experience", "💼", work_exp, 4,    2,   " yrs")
-    )
-    research_score = (
-        "<div style='margin:7px 0;display:flex;justify-content:space-between;"
-        "font-size:0.82rem;color:#d6d3d1'>"
-        f"<span>🔬 Research Experience</span>"
-        f"<span style='color:{'#22c55e' if research else '#ef4444'};font-weight:700'>"
-        f"{'Yes — Strong' if research else 'No — Weak'}</span></div>"
-    )
-    scorecard += research_score
-
-    # ── Actionable tips ───────────────────────────────────
-    tips = []
-    if cgpa < 7.0:
-        tips.append("📊 <b>CGPA below 7.0</b> — Address this gap directly in your SOP; "
-                    "highlight upward trends or strong final-year grades.")
-    if sop < 3.0:
-        tips.append("📄 <b>Weak SOP</b> — A compelling SOP can compensate for other gaps. "
-                    "Focus on your 'why this program' and specific research/career goals.")
-    if lor < 3.0:
-        tips.append("📋 <b>Weak LOR</b> — Request LORs from professors or managers who "
-                    "know your work well, not just senior titles.")
-    if not research:
-        tips.append("🔬 <b>No research experience</b> — Even a short research assistantship "
-                    "or published paper significantly boosts Masters admits at top schools.")
-    if work_exp == 0 and not internship:
-        tips.append("💼 <b>No work/internship experience</b> — Even short internships, "
-                    "projects, or co-ops significantly strengthen professional Masters applications.")
-    if work_exp == 0 and internship:
-        tips.append("💼 <b>Good — internship/project counted</b>. Full-time experience further "
-                    "strengthens your application for competitive programs.")
-    if work_exp > 0 and cgpa >= 8.0 and research:
-        tips.append("✨ <b>Strong overall profile</b> — Consider applying to reach schools "
-                    "in your target country; your profile can handle competitive programs.")
-
-    # ── Country–exam compatibility ────────────────────────
-    eu_countries   = {"France", "Germany", "Netherlands", "Sweden", "Switzerland"}
-    uk_countries   = {"UK", "Ireland"}
-    gre_countries  = {"USA", "Canada", "Singapore", "Australia"}
-
-    fit_warning = ""
-    if exam_type == "GRE" and country in eu_countries:
-        fit_warning = (
-            "⚠️ <b>Heads up:</b> Most <b>EU universities</b> (France, Germany, Netherlands, "
-            "Sweden, Switzerland) do <b>not require GRE</b>. "
-            "Consider adding an IELTS or TOEFL score for language proficiency."
-        )
-    elif exam_type in ("IELTS", "TOEFL", "PTE", "DET") and country in gre_countries:
-        fit_warning = (
-            f"💡 <b>Tip:</b> Many top programs in <b>{country}</b> for Masters "
-            f"expect a <b>GRE score</b> alongside a language test. "
-            f"Check if your target programs require GRE."
-        )
-
-    # ── Build HTML ────────────────────────────────────────
-    hr = "<hr style='border:none;border-top:1px solid rgba(139,92,246,.2);margin:14px 0'>"
-    sec = ("<div style='color:#fcd34d;font-weight:700;font-size:0.8rem;"
-           "letter-spacing:.06em;text-transform:uppercase;margin-bottom:6px'>")
-
-    details_html = (
-        "<div style='display:grid;grid-template-columns:1fr 1fr;"
-        "gap:6px 24px;margin:10px 0 0;font-size:0.85rem;color:#d6d3d1'>"
-        f"<span>🎓 <b style='color:#fcd34d'>Degree</b></span><span>{degree}</span>"
-        f"<span>🌍 <b style='color:#fcd34d'>Country</b></span>"
-        f"<span>{flag_img(country)}{country}</span>"
-        f"<span>📝 <b style='color:#fcd34d'>Exam</b></span><span>{exam_type} — {exam_score}</span>"
-        f"<span>📊 <b style='color:#fcd34d'>CGPA</b></span><span>{cgpa}</span>"
-        f"<span>📄 <b style='color:#fcd34d'>SOP</b></span><span>{sop}/5</span>"
-        f"<span>📋 <b style='color:#fcd34d'>LOR</b></span><span>{lor}/5</span>"
-        f"<span>🔬 <b style='color:#fcd34d'>Research</b></span><span>{research_label}</span>"
-        f"<span>💼 <b style='color:#fcd34d'>Work Exp</b></span><span>{work_exp} yr(s)</span>"
-        "</div>"
-    )
+    return {
+        "degree": degree, "exam_type": exam_type, "exam_score": exam_score,
+        "work_exp": work_exp, "cgpa": cgpa, "sop": sop, "lor": lor,
+        "research": research, "country": country, "internship": internship,
+    }
 
-    tips_html = ""
-    if tips:
-        tips_html = (
-            hr + sec + "💡 Improvement Tips</div>"
-            "<ul style='margin:6px 0 0 4px;padding-left:16px;"
-            "color:#d6d3d1;font-size:0.85rem;line-height:1.7'>"
-            + "".join(f"<li>{t}</li>" for t in tips) +
-            "</ul>"
-        )
-
-    fit_html = ""
-    if fit_warning:
-        fit_html = (
-            hr +
-            f"<div style='background:rgba(251,191,36,.08);"
-            f"border:1px solid rgba(251,191,36,.3);"
-            f"border-radius:10px;padding:10px 14px;"
-            f"font-size:0.85rem;color:#fde68a'>{fit_warning}</div>"
-        )
-
-    html = (
-        "<div style='"
-        "background:linear-gradient(135deg,rgba(109,40,217,.22),rgba(79,70,229,.18));"
-        "border:1.5px solid rgba(139,92,246,.55);"
-        "border-radius:18px;padding:24px 28px;"
-        "box-shadow:0 0 32px rgba(109,40,217,.3);"
-        "font-family:Inter,sans-serif'>"
-
-        # Big result
-        "<div style='text-align:center'>"
-        f"<div style='font-size:3.2rem;font-weight:800;line-height:1;"
-        f"display:flex;justify-content:center;align-items:center;gap:12px'>"
-        f"<span style='-webkit-text-fill-color:initial;-webkit-background-clip:initial'>{emoji}</span>"
-        f"<span style='background:linear-gradient(90deg,#a78bfa,#818cf8);"
-        f"-webkit-background-clip:text;-webkit-text-fill-color:transparent'>{pred}%</span></div>"
-        f"<div style='color:{bar_color};font-weight:700;"
-        f"font-size:1.1rem;margin-top:6px'>{verdict}</div>"
-        "</div>"
-
-        # Progress bar
-        f"<div style='margin:16px 0 4px;background:rgba(255,255,255,.08);"
-        f"border-radius:999px;height:10px;overflow:hidden'>"
-        f"<div style='width:{pred}%;height:100%;"
-        f"background:linear-gradient(90deg,{bar_color},{bar_color}99);"
-        f"border-radius:999px'></div></div>"
-        f"<div style='display:flex;justify-content:space-between;"
-        f"font-size:0.75rem;color:#a8a29e;margin-bottom:4px'>"
-        f"<span>0%</span><span>50% Moderate</span><span>70% Strong</span></div>"
 
-        # Profile summary
-        + hr + sec + "📋 Your Profile</div>" + details_html
+def _card(engine, r, p):
+    """Result card with the precomputed dependence charts for ``p``."""
+    curves = None if r.error else engine.dependence_curves(p, CHART_FEATURES + [p["exam_type"]])
+    return render_result(r, p, curves, engine.version)
 
-        # Scorecard
-        + hr + sec + "📈 Profile Strength</div>" + scorecard
 
-        # Tips
-        + tips_html
+def predict_admission(degree, exam_type, exam_score, work_exp,
+                      cgpa, sop, lor, research, country_display,
+                      internship):
+    engine = loader.get(READY_TIMEOUT)
+    if engine is None:
+        return _not_ready_card()
+    t0 = time.perf_counter()
+    with PROFILER.sample():
+        p = _profile(degree, exam_type, exam_score, work_exp,
+                     cgpa, sop, lor, research, country_display, internship)
+        r = engine.predict(p)
+        cache_hit = getattr(engine.backend, "last_hit", None)
+        html = _card(engine, r, p)
+    _log("gradio/predict_admission", engine, t0, [r], cache_hit)
+    PROFILER.flush()
+    return html
 
-        # Country fit
-        + fit_html
 
-        + "</div>"
-    )
-    return html
+def predict_admission_batch(degree, exam_type, exam_score, work_exp,
+                            cgpa, sop, lor, research, country_display,
+                            internship):
+    """Gradio ``batch=True`` variant: every argument is a list (one item per
+    queued click) and all valid rows are scored in ONE forest call."""
+    engine = loader.get(READY_TIMEOUT)
+    if engine is None:
+        return [[_not_ready_card()] * len(degree)]
+    t0 = time.perf_counter()
+    with PROFILER.sample():
+        profiles = [_profile(*args) for args in zip(
+            degree, exam_type, exam_score, work_exp,
+            cgpa, sop, lor, research, country_display, internship,
+        )]
+        results = engine.predict_many(profiles)
+        cache_hit = getattr(engine.backend, "last_hit", None)
+        cards = [_card(engine, r, p) for r, p in zip(results, profiles)]
+    _log("gradio/predict_admission_batch", engine, t0, results, cache_hit)
+    PROFILER.flush()
+    return [cards]
 
 
 # ----------------------------------------
@@ -566,15 +375,7 @@ with gr.Blocks() as demo:
         ),
     )
 
-    _chips = " ".join(
-        f"<span style='display:inline-block;margin:3px 4px;"
-        f"padding:4px 13px;border-radius:999px;"
-        f"background:rgba(245, 158, 11,.10);"
-        f"border:1px solid rgba(245, 158, 11,.3);"
-        f"color:#fcd34d;font-size:0.8rem;font-weight:600'>"
-        f"{flag_img(c)}{c}</span>"
-        for c in COUNTRIES
-    )
+    _chips = " ".join(country_chip(c) for c in COUNTRIES)
     gr.HTML(
         "<div style='text-align:center;margin-top:18px'>"
         "<div style='color:#6b7280;font-size:0.75rem;"
@@ -585,17 +386,56 @@ with gr.Blocks() as demo:
     )
 
     btn.click(
-        fn=predict_admission,
+        fn=predict_admission_batch,
         inputs=[degree, exam_type, exam_score, work_exp,
                 cgpa, sop, lor, research, country, internship],
         outputs=output,
+        api_name="predict",
+        batch=True,
+        max_batch_size=MAX_BATCH_SIZE,
+        concurrency_limit=CONCURRENCY_LIMIT,
     )
 
+# Queued clicks arriving within one worker turn are merged into a batch of up
+# to MAX_BATCH_SIZE; CONCURRENCY_LIMIT batches run at once and QUEUE_SIZE caps
+# the waiting line (extra users get "queue full" instead of unbounded waits).
+demo.queue(max_size=QUEUE_SIZE, default_concurrency_limit=CONCURRENCY_LIMIT)
+
 # ----------------------------------------
 # VERCEL: mount Gradio inside FastAPI
 # ----------------------------------------
 fast_app = FastAPI()
+fast_app.add_event_handler("startup", loader.start)
+fast_app.add_event_handler("startup", retrainer.start)
+
+
+@fast_app.get("/ready")
+def ready():
+    """Readiness probe — 200 once the model is loaded, 503 before."""
+    status = loader.status()
+    status["retrain"] = {"last": retrainer.last, "error": retrainer.error}
+    return JSONResponse(status, status_code=200 if loader.ready else 503)
+
+
+@fast_app.post("/outcomes")
+async def outcomes(request: Request):
+    """Record a real admit/reject result: a profile plus ``admitted``.
+    Needs the outcomes token header and is rate-limited per client."""
+    denied = OUTCOME_GATE.check(request.headers.get(OUTCOMES_HEADER),
+                                request.client.host if request.client else "")
+    if denied:
+        return JSONResponse({"error": denied[1]}, status_code=denied[0])
+    try:
+        # The append takes a lock and writes a file; keep it off the event loop
+        row = await run_in_threadpool(record_outcome, await request.json())
+    except ValueError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=400)
+    return JSONResponse({"recorded": row}, status_code=201)
+
+
 app = gr.mount_gradio_app(fast_app, demo, path="/")
 
 if __name__ == "__main__":
+    loader.start()
+    retrainer.start()
     demo.launch(share=True) 
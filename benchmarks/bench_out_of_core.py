@@ -0,0 +1,93 @@
+"""
+bench_out_of_core.py
+────────────────────
+Out-of-core histogram GBM (train_model.py --out-of-core) vs. the in-memory
+200-tree forest on a synthetic CSV: the real dataset resampled with jitter
+up to --rows.  Each trainer runs in its own subprocess so peak RSS
+(ru_maxrss) is measured per mode; both are scored on the same holdout rows
+(every 5th).
+
+Resampling repeats real rows, so holdout rows have near-duplicates in the
+training split and the fully grown forest's holdout score is inflated by
+memorisation; use ``train_model.py --out-of-core --compare`` on the real
+CSV for the accuracy comparison.  This script is about time and memory.
+
+The forest is capped at --forest-rows: fully grown trees on millions of
+rows do not fit in memory, which is the point of the out-of-core path.
+
+Usage:
+    python benchmarks/bench_out_of_core.py [--rows 1000000] [--forest-rows 100000]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE_DIR)
+
+
+def write_csv(rows, path, seed=0):
+    import numpy as np
+    import pandas as pd
+
+    from train_model import csv_path
+
+    base = pd.read_csv(csv_path)
+    rng = np.random.default_rng(seed)
+    written = 0
+    with open(path, "w", newline="") as f:
+        while written < rows:
+            n = min(200_000, rows - written)
+            chunk = base.iloc[rng.integers(0, len(base), n)].copy()
+            cg = [c for c in chunk.columns if c.strip() == "CGPA"][0]
+            chunk[cg] = np.clip(chunk[cg] + rng.normal(0, 0.2, n), 6.0, 10.0).round(2)
+            chunk.to_csv(f, header=written == 0, index=False)
+            written += n
+
+
+def child(mode, path):
+    import train_model as tm
+
+    if mode == "binned":
+        report = tm.build_binned_artifact(path)["report"]
+    else:
+        report = tm.forest_baseline(path)
+    report["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    print(json.dumps(report))
+
+
+def run(mode, path):
+    out = subprocess.run([sys.executable, __file__, "--child", mode, path],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--forest-rows", type=int, default=100_000)
+    ap.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return child(*args.child)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows, modes in sorted({args.forest_rows: ("binned", "forest"),
+                                   args.rows: ("binned",)}.items()):
+            path = os.path.join(tmp, f"{rows}.csv")
+            write_csv(rows, path)
+            for mode in modes:
+                r = run(mode, path)
+                train_s = r.get("bin_s", 0) + r["train_s"]
+                print(f"{mode:7s} {rows:>10,} rows  {train_s:8.1f} s  "
+                      f"RSS {r['max_rss_mb']:7.1f} MB  holdout R² {r['holdout']['r2']:.4f}  "
+                      f"MAE {r['holdout']['mae']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
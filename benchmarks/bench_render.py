@@ -0,0 +1,277 @@
+"""
+bench_render.py
+───────────────
+Microbenchmark for the Gradio result card: the original f-string renderer
+(frozen below as ``legacy_render``) vs the precompiled templates in
+result_card.render_result (plus inference.build_prediction, which now holds
+the verdict / tip logic).  Reports time and allocations per call, and checks
+that both produce byte-identical HTML.  No model needed — raw is sampled.
+
+Usage:
+    python benchmarks/bench_render.py [--calls 20000]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference import EXAM_LIMITS, build_prediction  # noqa: E402
+from result_card import COUNTRY_ISO, render_result  # noqa: E402
+
+
+# ----------------------------------------
+# BASELINE — renderer as it was in app.py
+# ----------------------------------------
+def _legacy_flag_img(country, h=14):
+    iso = COUNTRY_ISO.get(country, "un")
+    return (f"<img src='https://flagcdn.com/20x15/{iso}.png' "
+            f"style='height:{h}px;border-radius:2px;"
+            f"vertical-align:middle;margin-right:4px;object-fit:cover'>")
+
+
+def legacy_render(pred, degree, country, exam_type, exam_score,
+                  work_exp, cgpa, sop, lor, research, internship):
+    if pred >= 70:
+        emoji, bar_color, verdict = "🎉", "#22c55e", "Strong Admit"
+    elif pred >= 45:
+        emoji, bar_color, verdict = "🎯", "#f59e0b", "Moderate Chance"
+    else:
+        emoji, bar_color, verdict = "📉", "#ef4444", "Low Chance"
+
+    research_label = "Yes ✅" if research == 1 else "No ❌"
+
+    def score_bar(label, icon, val, strong_thresh, avg_thresh, unit=""):
+        if val >= strong_thresh:
+            c, tag = "#22c55e", "Strong"
+        elif val >= avg_thresh:
+            c, tag = "#f59e0b", "Average"
+        else:
+            c, tag = "#ef4444", "Weak"
+        pct = min(int((val / strong_thresh) * 100), 100)
+        return (
+            f"<div style='margin:7px 0'>"
+            f"<div style='display:flex;justify-content:space-between;"
+            f"font-size:0.82rem;color:#d6d3d1;margin-bottom:3px'>"
+            f"<span>{icon} {label}</span>"
+            f"<span style='color:{c};font-weight:700'>{val}{unit} — {tag}</span></div>"
+            f"<div style='background:rgba(255,255,255,.08);border-radius:999px;height:6px'>"
+            f"<div style='width:{pct}%;height:100%;background:{c};"
+            f"border-radius:999px'></div></div></div>"
+        )
+
+    scorecard = (
+        score_bar("CGPA",            "📊", cgpa,     8.0,  7.0) +
+        score_bar("SOP Strength",    "📄", sop,      4.5,  3.0, "/5") +
+        score_bar("LOR Strength",    "📋", lor,      4.5,  3.0, "/5") +
+        score_bar("Work Experience", "💼", work_exp, 4,    2,   " yrs")
+    )
+    scorecard += (
+        "<div style='margin:7px 0;display:flex;justify-content:space-between;"
+        "font-size:0.82rem;color:#d6d3d1'>"
+        f"<span>🔬 Research Experience</span>"
+        f"<span style='color:{'#22c55e' if research else '#ef4444'};font-weight:700'>"
+        f"{'Yes — Strong' if research else 'No — Weak'}</span></div>"
+    )
+
+    tips = []
+    if cgpa < 7.0:
+        tips.append("📊 <b>CGPA below 7.0</b> — Address this gap directly in your SOP; "
+                    "highlight upward trends or strong final-year grades.")
+    if sop < 3.0:
+        tips.append("📄 <b>Weak SOP</b> — A compelling SOP can compensate for other gaps. "
+                    "Focus on your 'why this program' and specific research/career goals.")
+    if lor < 3.0:
+        tips.append("📋 <b>Weak LOR</b> — Request LORs from professors or managers who "
+                    "know your work well, not just senior titles.")
+    if not research:
+        tips.append("🔬 <b>No research experience</b> — Even a short research assistantship "
+                    "or published paper significantly boosts Masters admits at top schools.")
+    if work_exp == 0 and not internship:
+        tips.append("💼 <b>No work/internship experience</b> — Even short internships, "
+                    "projects, or co-ops significantly strengthen professional Masters applications.")
+    if work_exp == 0 and internship:
+        tips.append("💼 <b>Good — internship/project counted</b>. Full-time experience further "
+                    "strengthens your application for competitive programs.")
+    if work_exp > 0 and cgpa >= 8.0 and research:
+        tips.append("✨ <b>Strong overall profile</b> — Consider applying to reach schools "
+                    "in your target country; your profile can handle competitive programs.")
+
+    eu_countries  = {"France", "Germany", "Netherlands", "Sweden", "Switzerland"}
+    gre_countries = {"USA", "Canada", "Singapore", "Australia"}
+
+    fit_warning = ""
+    if exam_type == "GRE" and country in eu_countries:
+        fit_warning = (
+            "⚠️ <b>Heads up:</b> Most <b>EU universities</b> (France, Germany, Netherlands, "
+            "Sweden, Switzerland) do <b>not require GRE</b>. "
+            "Consider adding an IELTS or TOEFL score for language proficiency."
+        )
+    elif exam_type in ("IELTS", "TOEFL", "PTE", "DET") and country in gre_countries:
+        fit_warning = (
+            f"💡 <b>Tip:</b> Many top programs in <b>{country}</b> for Masters "
+            f"expect a <b>GRE score</b> alongside a language test. "
+            f"Check if your target programs require GRE."
+        )
+
+    hr = "<hr style='border:none;border-top:1px solid rgba(139,92,246,.2);margin:14px 0'>"
+    sec = ("<div style='color:#fcd34d;font-weight:700;font-size:0.8rem;"
+           "letter-spacing:.06em;text-transform:uppercase;margin-bottom:6px'>")
+
+    details_html = (
+        "<div style='display:grid;grid-template-columns:1fr 1fr;"
+        "gap:6px 24px;margin:10px 0 0;font-size:0.85rem;color:#d6d3d1'>"
+        f"<span>🎓 <b style='color:#fcd34d'>Degree</b></span><span>{degree}</span>"
+        f"<span>🌍 <b style='color:#fcd34d'>Country</b></span>"
+        f"<span>{_legacy_flag_img(country)}{country}</span>"
+        f"<span>📝 <b style='color:#fcd34d'>Exam</b></span><span>{exam_type} — {exam_score}</span>"
+        f"<span>📊 <b style='color:#fcd34d'>CGPA</b></span><span>{cgpa}</span>"
+        f"<span>📄 <b style='color:#fcd34d'>SOP</b></span><span>{sop}/5</span>"
+        f"<span>📋 <b style='color:#fcd34d'>LOR</b></span><span>{lor}/5</span>"
+        f"<span>🔬 <b style='color:#fcd34d'>Research</b></span><span>{research_label}</span>"
+        f"<span>💼 <b style='color:#fcd34d'>Work Exp</b></span><span>{work_exp} yr(s)</span>"
+        "</div>"
+    )
+
+    tips_html = ""
+    if tips:
+        tips_html = (
+            hr + sec + "💡 Improvement Tips</div>"
+            "<ul style='margin:6px 0 0 4px;padding-left:16px;"
+            "color:#d6d3d1;font-size:0.85rem;line-height:1.7'>"
+            + "".join(f"<li>{t}</li>" for t in tips) +
+            "</ul>"
+        )
+
+    fit_html = ""
+    if fit_warning:
+        fit_html = (
+            hr +
+            f"<div style='background:rgba(251,191,36,.08);"
+            f"border:1px solid rgba(251,191,36,.3);"
+            f"border-radius:10px;padding:10px 14px;"
+            f"font-size:0.85rem;color:#fde68a'>{fit_warning}</div>"
+        )
+
+    return (
+        "<div style='"
+        "background:linear-gradient(135deg,rgba(109,40,217,.22),rgba(79,70,229,.18));"
+        "border:1.5px solid rgba(139,92,246,.55);"
+        "border-radius:18px;padding:24px 28px;"
+        "box-shadow:0 0 32px rgba(109,40,217,.3);"
+        "font-family:Inter,sans-serif'>"
+        "<div style='text-align:center'>"
+        f"<div style='font-size:3.2rem;font-weight:800;line-height:1;"
+        f"display:flex;justify-content:center;align-items:center;gap:12px'>"
+        f"<span style='-webkit-text-fill-color:initial;-webkit-background-clip:initial'>{emoji}</span>"
+        f"<span style='background:linear-gradient(90deg,#a78bfa,#818cf8);"
+        f"-webkit-background-clip:text;-webkit-text-fill-color:transparent'>{pred}%</span></div>"
+        f"<div style='color:{bar_color};font-weight:700;"
+        f"font-size:1.1rem;margin-top:6px'>{verdict}</div>"
+        "</div>"
+        f"<div style='margin:16px 0 4px;background:rgba(255,255,255,.08);"
+        f"border-radius:999px;height:10px;overflow:hidden'>"
+        f"<div style='width:{pred}%;height:100%;"
+        f"background:linear-gradient(90deg,{bar_color},{bar_color}99);"
+        f"border-radius:999px'></div></div>"
+        f"<div style='display:flex;justify-content:space-between;"
+        f"font-size:0.75rem;color:#a8a29e;margin-bottom:4px'>"
+        f"<span>0%</span><span>50% Moderate</span><span>70% Strong</span></div>"
+        + hr + sec + "📋 Your Profile</div>" + details_html
+        + hr + sec + "📈 Profile Strength</div>" + scorecard
+        + tips_html
+        + fit_html
+        + "</div>"
+    )
+
+
+# ----------------------------------------
+# WORKLOAD — what the Gradio sliders can send
+# ----------------------------------------
+def sample_calls(n, seed=7):
+    """(raw forest output, profile) pairs.  Exam scores stay above the
+    low-score penalty cut-off, which the original renderer never applied."""
+    rng = random.Random(seed)
+    calls = []
+    for _ in range(n):
+        exam_type = rng.choice(list(EXAM_LIMITS))
+        lo, hi = EXAM_LIMITS[exam_type]
+        calls.append((rng.uniform(0.05, 0.95), {
+            "degree":     rng.choice(["Undergraduate", "Masters", "PhD"]),
+            "country":    rng.choice(list(COUNTRY_ISO)),
+            "exam_type":  exam_type,
+            "exam_score": float(rng.randint(math.ceil(lo + 0.35 * (hi - lo)), hi)),
+            "work_exp":   rng.randint(0, 10),
+            "cgpa":       round(rng.uniform(6.0, 10.0), 1),
+            "sop":        rng.randint(2, 10) / 2,
+            "lor":        rng.randint(2, 10) / 2,
+            "research":   rng.randint(0, 1),
+            "internship": rng.choice([False, True]),
+        }))
+    return calls
+
+
+def legacy(raw, p):
+    return legacy_render(round(raw * 100, 2), p["degree"], p["country"], p["exam_type"],
+                         p["exam_score"], p["work_exp"], p["cgpa"], p["sop"], p["lor"],
+                         p["research"], p["internship"])
+
+
+def templated(raw, p):
+    return render_result(build_prediction(p, raw), p)
+
+
+def time_per_call(fn, calls, repeats=5):
+    """Best of ``repeats`` passes, in µs per call (least scheduler noise)."""
+    for args in calls[:500]:             # warm caches / bytecode
+        fn(*args)
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for args in calls:
+            fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(calls) * 1e6
+
+
+def alloc_per_call(fn, calls):
+    """Mean peak of transient heap allocated while rendering one card (bytes)."""
+    peak_total = 0
+    tracemalloc.start()
+    try:
+        for args in calls:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            out = fn(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - base
+            del out
+    finally:
+        tracemalloc.stop()
+    return peak_total / len(calls)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=20000)
+    args = ap.parse_args()
+
+    calls = sample_calls(args.calls)
+    for c in calls:
+        assert legacy(*c) == templated(*c), f"HTML mismatch for {c}"
+    print(f"✅ {len(calls)} renders byte-identical")
+
+    print(f"\n{'renderer':<12}{'µs/call':>10}{'peak bytes/call':>17}")
+    for name, fn in (("legacy", legacy), ("templates", templated)):
+        us = time_per_call(fn, calls)
+        peak = alloc_per_call(fn, calls[:2000])
+        print(f"{name:<12}{us:>10.2f}{peak:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
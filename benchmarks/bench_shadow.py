@@ -0,0 +1,107 @@
+"""
+bench_shadow.py
+───────────────
+What shadow scoring (shadow.py) costs the primary request path: p50 / p99
+of api/predict.py's ``_predict`` with no shadow, and with a candidate
+scoring 10% and 100% of requests on the background thread.  Requests
+arrive at a fixed --rps (open loop), as live traffic does, so the shadow
+thread has the gaps between requests to work in.
+
+The candidate defaults to model.pkl cut down to its first half of trees,
+so the divergence summary has something to report; pass --candidate to
+trial a real artifact.
+
+Usage:
+    python benchmarks/bench_shadow.py [--requests 5000] [--rps 50] [--candidate model_candidate.pkl]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE_DIR)
+
+import numpy as np  # noqa: E402
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+from api import predict as api  # noqa: E402
+from inference import EXAM_LIMITS, load_artifact  # noqa: E402
+from shadow import ShadowScorer  # noqa: E402
+from train_model import save_artifact  # noqa: E402
+
+
+def bodies(n, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        exam = rng.choice(sorted(EXAM_LIMITS))
+        lo, hi = EXAM_LIMITS[exam]
+        out.append({
+            "degree": rng.choice(sorted(api.ENGINE.degree_map)), "exam_type": exam,
+            "exam_score": round(rng.uniform(lo, hi), 1), "work_exp": rng.randint(0, 10),
+            "cgpa": round(rng.uniform(6, 10), 2), "sop": round(rng.uniform(1, 5), 1),
+            "lor": round(rng.uniform(1, 5), 1), "research": rng.randint(0, 1),
+            "country": rng.choice(sorted(api.ENGINE.country_map)),
+        })
+    return out
+
+
+def half_forest(path):
+    payload = load_artifact()
+    forest = payload["model"]
+    forest.estimators_ = forest.estimators_[: len(forest.estimators_) // 2]
+    forest.n_estimators = len(forest.estimators_)
+    payload["version"] = f"{payload['version']}-half"
+    save_artifact(payload, path)
+
+
+def run(reqs, rps):
+    ms = np.empty(len(reqs))
+    start = time.perf_counter()
+    for i, body in enumerate(reqs):
+        wait = start + i / rps - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        t0 = time.perf_counter()
+        api._predict(body)
+        ms[i] = (time.perf_counter() - t0) * 1000
+    return ms
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=5000)
+    ap.add_argument("--rps", type=float, default=50)
+    ap.add_argument("--candidate")
+    args = ap.parse_args()
+
+    reqs = bodies(args.requests)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.candidate
+        if not path:
+            path = os.path.join(tmp, "candidate.pkl")
+            half_forest(path)
+
+        run(reqs[:200], args.rps)
+        for label, fraction in (("off", None), ("10%", 0.1), ("100%", 1.0)):
+            api.SHADOW = None if fraction is None else ShadowScorer.from_path(path, fraction=fraction).start()
+            ms = run(reqs, args.rps)
+            print(f"shadow {label:5s}  p50 {np.percentile(ms, 50):6.3f} ms   "
+                  f"p99 {np.percentile(ms, 99):6.3f} ms")
+            if api.SHADOW is not None:
+                while api.SHADOW._queue.qsize():
+                    time.sleep(0.05)
+                last = api.SHADOW.summary()
+        print("\nDivergence at 100%:")
+        for key, value in last.items():
+            print(f"  {key:18s} {value}")
+
+
+if __name__ == "__main__":
+    main()
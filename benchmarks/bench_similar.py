@@ -0,0 +1,98 @@
+"""
+bench_similar.py
+────────────────
+Build-time and query latency of similar_applicants.SimilarApplicantIndex on
+a synthetic dataset (the CSV resampled with jitter up to --rows), and a
+brute-force cross-check that the KD-tree returns the true nearest rows.
+
+Usage:
+    python benchmarks/bench_similar.py [--rows 1000000] [--k 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE_DIR)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from inference import EXAM_COLUMNS, EXAM_LIMITS, load_artifact  # noqa: E402
+from similar_applicants import SimilarApplicantIndex  # noqa: E402
+from train_model import csv_path  # noqa: E402
+
+
+def synthetic(n, seed=0):
+    base = pd.read_csv(csv_path)
+    base.columns = base.columns.str.strip()
+    base[EXAM_COLUMNS] = base[EXAM_COLUMNS].fillna(0)
+    rng = np.random.default_rng(seed)
+    data = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    data["CGPA"] = np.clip(data["CGPA"] + rng.normal(0, 0.3, n), 6.0, 10.0).round(2)
+    data["SOP"] = np.clip(data["SOP"] + rng.normal(0, 0.3, n), 1.0, 5.0).round(1)
+    data["LOR"] = np.clip(data["LOR"] + rng.normal(0, 0.3, n), 1.0, 5.0).round(1)
+    return data
+
+
+def random_profiles(n, countries, seed=1):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        exam_type = rng.choice(EXAM_COLUMNS)
+        lo, hi = EXAM_LIMITS[exam_type]
+        out.append({
+            "degree": rng.choice(["Undergraduate", "Masters", "PhD"]),
+            "exam_type": exam_type, "exam_score": rng.uniform(lo, hi),
+            "work_exp": rng.randint(0, 10), "cgpa": round(rng.uniform(6, 10), 1),
+            "sop": rng.randint(2, 10) / 2, "lor": rng.randint(2, 10) / 2,
+            "research": rng.randint(0, 1), "country": rng.choice(countries),
+        })
+    return out
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--k", type=int, default=5)
+    args = ap.parse_args()
+
+    payload = load_artifact()
+    data = synthetic(args.rows)
+    t0 = time.perf_counter()
+    index = SimilarApplicantIndex.build(data, payload["country_map"], payload["degree_map"])
+    print(f"build      {args.rows:>9,} rows  {time.perf_counter() - t0:7.2f} s")
+
+    countries = sorted(c for c in payload["country_map"] if c != "UAE")
+    profiles = random_profiles(256, countries)
+
+    # ── Cross-check against brute force ────────────────────
+    for p, found in zip(profiles[:50], index.query(profiles[:50], args.k)):
+        tree, _, _ = index.groups[(payload["country_map"][p["country"]],
+                                   payload["degree_map"][p["degree"]])]
+        points = np.asarray(tree.data)
+        d = np.sqrt(((points - index._features([p])[0]) ** 2).sum(axis=1))
+        expected = np.sort(d)[:args.k].round(4)
+        assert np.allclose([r["distance"] for r in found], expected), p
+    print("✅ KD-tree matches brute force")
+
+    single = best_of(lambda: [index.query([p], args.k) for p in profiles[:100]]) / 100
+    batch = best_of(lambda: index.query(profiles, args.k)) / len(profiles)
+    print(f"single     {single * 1000:7.3f} ms / query")
+    print(f"batch 256  {batch * 1000:7.3f} ms / query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+load_test_api.py
+────────────────
+Open-loop load test for the JSON API, against either the local dev server
+(start_api.py) or the Vercel stand-in (vercel_emulator.py).
+
+Request bodies are real applicant profiles drawn from the CSV (degree,
+country, exam and score, CGPA, SOP, LOR, research, experience), so the
+mix of exams, countries and score ranges matches production rather than
+uniform noise.  Each --rps step sends requests on a fixed schedule for
+--duration seconds; latency is measured from the scheduled send time, so
+queueing inside an overloaded server is counted instead of hidden.
+
+Per step it prints achieved throughput, p50 / p95 / p99 / max latency, the
+error rate and — on the emulator — cold starts, their p50 and the p99 of
+the warm requests alone.  The first step at which throughput falls below
+90% of the target, errors exceed 1% or the warm p99 exceeds --slo-ms is
+reported as the saturation point (cold starts are a separate cost, not a
+sign of overload).
+
+Usage:
+    python benchmarks/load_test_api.py --target vercel --rps 5 10 20 40
+    python benchmarks/load_test_api.py --target start_api --rps 10 50 100
+    python benchmarks/load_test_api.py --url http://localhost:8000   # existing server
+    python benchmarks/load_test_api.py --target vercel --idle-timeout 2 --pause 3   # force cold starts
+"""
+
+import argparse
+import csv
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CSV_PATH = os.path.join(BASE_DIR, "Admission_Predict_Final_With_Degree.csv")
+
+
+def load_profiles(path=CSV_PATH):
+    """One request body per CSV row, in the API's field names."""
+    bodies = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            row = {k.strip(): v.strip() for k, v in row.items()}
+            exam = row["Exam_Type"]
+            bodies.append({
+                "degree":     row["Degree_Level"],
+                "exam_type":  exam,
+                "exam_score": float(row[exam] or 0),
+                "work_exp":   int(float(row["Work_Experience_Years"])),
+                "cgpa":       float(row["CGPA"]),
+                "sop":        float(row["SOP"]),
+                "lor":        float(row["LOR"]),
+                "research":   int(float(row["Research"])),
+                "country":    row["Country_Aiming"],
+            })
+    return bodies
+
+
+def percentile(values, q):
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(q / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+# ----------------------------------------
+# SERVER
+# ----------------------------------------
+def start_server(target, port, args):
+    if target == "vercel":
+        cmd = [sys.executable, os.path.join("benchmarks", "vercel_emulator.py"), "--port", str(port),
+               "--max-instances", str(args.max_instances), "--idle-timeout", str(args.idle_timeout)]
+        ready_path = "/__emulator"
+    else:
+        cmd = [sys.executable, "start_api.py"]
+        ready_path = "/api/health"
+    env = dict(os.environ, PORT=str(port),
+               ADMISSION_ACCESS_LOG=os.environ.get("ADMISSION_ACCESS_LOG", "off"))
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 180
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url + ready_path, timeout=2)
+            return proc, url
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{target} server exited during startup")
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("server did not come up")
+
+
+# ----------------------------------------
+# LOAD
+# ----------------------------------------
+def post(url, body, timeout=60):
+    """(status, cold or None); status 0 means the connection failed."""
+    parts = urllib.parse.urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    try:
+        payload = json.dumps(body).encode()
+        conn.request("POST", "/api/predict", payload, {"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        resp.read()
+        cold = resp.getheader("X-Emulator-Cold")
+        return resp.status, None if cold is None else cold == "1"
+    except OSError:
+        return 0, None
+    finally:
+        conn.close()
+
+
+def run_step(url, bodies, rps, duration, workers, rng):
+    n = max(1, int(rps * duration))
+    results = []
+    lock = threading.Lock()
+    start = time.perf_counter() + 0.05
+
+    def fire(i, body):
+        scheduled = start + i / rps
+        status, cold = post(url, body)
+        with lock:
+            results.append((time.perf_counter() - scheduled, status, cold))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i in range(n):
+            wait = start + i / rps - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            pool.submit(fire, i, rng.choice(bodies))
+    wall = max(time.perf_counter() - start, duration)
+    return results, wall
+
+
+def summarise(rps, results, wall):
+    lat = [r[0] * 1000 for r in results]
+    ok = [r for r in results if 200 <= r[1] < 300]
+    cold = [r[0] * 1000 for r in results if r[2]]
+    warm = [r[0] * 1000 for r in results if not r[2]] or lat
+    return {
+        "rps":      rps,
+        "achieved": len(ok) / wall,
+        "p50":      percentile(lat, 50),
+        "p95":      percentile(lat, 95),
+        "p99":      percentile(lat, 99),
+        "max":      max(lat),
+        "warm_p99": percentile(warm, 99),
+        "errors":   100 * (len(results) - len(ok)) / len(results),
+        "cold":     len(cold),
+        "cold_p50": percentile(cold, 50) if cold else float("nan"),
+    }
+
+
+def saturated(s, slo_ms):
+    if s["achieved"] < 0.9 * s["rps"]:
+        return f"throughput {s['achieved']:.1f} < 90% of {s['rps']:g} rps"
+    if s["errors"] > 1:
+        return f"error rate {s['errors']:.1f}%"
+    if s["warm_p99"] > slo_ms:
+        return f"warm p99 {s['warm_p99']:.0f} ms > {slo_ms:g} ms"
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--target", choices=["start_api", "vercel"], default="vercel")
+    ap.add_argument("--url", help="use an already running server instead of spawning one")
+    ap.add_argument("--rps", type=float, nargs="+", default=[5, 10, 20, 40, 80])
+    ap.add_argument("--duration", type=float, default=10, help="seconds per step")
+    ap.add_argument("--workers", type=int, default=64, help="client threads")
+    ap.add_argument("--slo-ms", type=float, default=1000, help="p99 budget for saturation")
+    ap.add_argument("--pause", type=float, default=0,
+                    help="idle seconds between steps (> --idle-timeout forces cold starts)")
+    ap.add_argument("--max-instances", type=int, default=4, help="emulator: concurrent instances")
+    ap.add_argument("--idle-timeout", type=float, default=300, help="emulator: keep-warm seconds")
+    ap.add_argument("--port", type=int, default=3100)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    bodies = load_profiles()
+    rng = random.Random(args.seed)
+    proc = None
+    if args.url:
+        url, label = args.url, "external"
+    else:
+        proc, url = start_server(args.target, args.port, args)
+        label = args.target
+    try:
+        # The very first request to a fresh server is the cold start
+        t0 = time.perf_counter()
+        post(url, rng.choice(bodies))
+        print(f"{label}: first request {1000 * (time.perf_counter() - t0):.0f} ms "
+              f"({len(bodies)} CSV profiles)\n")
+        print(f"{'rps':>7}{'achieved':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+              f"{'warm p99':>10}{'err %':>7}{'cold':>6}{'cold p50':>10}")
+        knee = None
+        for rps in args.rps:
+            if args.pause:
+                time.sleep(args.pause)
+            s = summarise(rps, *run_step(url, bodies, rps, args.duration, args.workers, rng))
+            print(f"{s['rps']:>7g}{s['achieved']:>10.1f}{s['p50']:>9.1f}{s['p95']:>9.1f}"
+                  f"{s['p99']:>9.1f}{s['max']:>9.1f}{s['warm_p99']:>10.1f}{s['errors']:>7.1f}{s['cold']:>6}"
+                  f"{s['cold_p50']:>10.1f}")
+            reason = saturated(s, args.slo_ms)
+            if reason and knee is None:
+                knee = (rps, reason)
+        print()
+        if knee:
+            print(f"Saturation point: {knee[0]:g} rps ({knee[1]})")
+        else:
+            print(f"No saturation up to {max(args.rps):g} rps")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+load_test_gradio.py
+───────────────────
+Concurrent-session load test for the Gradio UI in app.py.
+
+For every GRADIO_MAX_BATCH_SIZE in --batch-sizes a fresh `uvicorn app:app` is
+started, then --sessions concurrent gradio_client sessions each fire
+--requests clicks at /predict.  Prints p50/p95 latency and throughput so the
+effect of batching and concurrency limits is visible side by side.
+
+Usage:
+    python benchmarks/load_test_gradio.py
+    python benchmarks/load_test_gradio.py --batch-sizes 1 16 --sessions 1 8 32
+    python benchmarks/load_test_gradio.py --url http://localhost:7860   # existing server
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from gradio_client import Client
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+COUNTRIES = [
+    "🇦🇺 Australia", "🇨🇦 Canada", "🇫🇷 France", "🇩🇪 Germany", "🇮🇪 Ireland",
+    "🇳🇱 Netherlands", "🇳🇿 New Zealand", "🇸🇬 Singapore", "🇸🇪 Sweden",
+    "🇨🇭 Switzerland", "🇦🇪 UAE", "🇬🇧 UK", "🇺🇸 USA",
+]
+EXAM_LIMITS = {
+    "IELTS": (0, 9), "TOEFL": (0, 120),
+    "PTE": (10, 90), "DET": (10, 160), "GRE": (260, 340),
+}
+
+
+def random_profile(rng):
+    exam_type = rng.choice(list(EXAM_LIMITS))
+    lo, hi = EXAM_LIMITS[exam_type]
+    return (
+        rng.choice(["Undergraduate", "Masters", "PhD"]), exam_type,
+        float(rng.randint(lo, hi)), rng.randint(0, 10),
+        round(rng.uniform(6.0, 10.0), 1), rng.randint(2, 10) / 2,
+        rng.randint(2, 10) / 2, rng.randint(0, 1),
+        rng.choice(COUNTRIES), rng.choice([False, True]),
+    )
+
+
+def percentile(values, q):
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(q / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+# ----------------------------------------
+# SERVER
+# ----------------------------------------
+def start_server(port, batch_size, concurrency, queue_size):
+    env = dict(os.environ,
+               GRADIO_MAX_BATCH_SIZE=str(batch_size),
+               GRADIO_CONCURRENCY_LIMIT=str(concurrency),
+               GRADIO_QUEUE_SIZE=str(queue_size),
+               GRADIO_ANALYTICS_ENABLED="false")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 180
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url + "/config", timeout=2)
+            return proc, url
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("server did not come up")
+
+
+# ----------------------------------------
+# LOAD
+# ----------------------------------------
+def run_sessions(url, sessions, requests_per_session, seed=0):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    clients = [Client(url, verbose=False) for _ in range(sessions)]
+    start = threading.Barrier(sessions + 1)
+
+    def session(i):
+        rng = random.Random(seed + i)
+        start.wait()
+        for _ in range(requests_per_session):
+            t0 = time.perf_counter()
+            try:
+                clients[i].predict(*random_profile(rng), api_name="/predict")
+                with lock:
+                    latencies.append(time.perf_counter() - t0)
+            except Exception as exc:  # noqa: BLE001 — count, don't abort the run
+                with lock:
+                    errors.append(repr(exc))
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    for c in clients:
+        c.close()  # stop heartbeats, or uvicorn waits on them at shutdown
+    return latencies, errors, wall
+
+
+def report(label, sessions, latencies, errors, wall):
+    if latencies:
+        p50 = percentile(latencies, 50) * 1000
+        p95 = percentile(latencies, 95) * 1000
+    else:
+        p50 = p95 = float("nan")
+    print(f"{label:<10}{sessions:>9}{p50:>10.1f}{p95:>10.1f}"
+          f"{len(latencies) / wall:>10.1f}{len(errors):>8}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", help="use an already running server instead of spawning one")
+    ap.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16])
+    ap.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16, 32])
+    ap.add_argument("--requests", type=int, default=10, help="clicks per session")
+    ap.add_argument("--concurrency", type=int, default=1)
+    ap.add_argument("--queue-size", type=int, default=256)
+    ap.add_argument("--port", type=int, default=7861)
+    args = ap.parse_args()
+
+    print(f"{'batch':<10}{'sessions':>9}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}{'errors':>8}")
+    configs = [None] if args.url else args.batch_sizes
+    for batch_size in configs:
+        proc = None
+        if args.url:
+            url, label = args.url, "external"
+        else:
+            proc, url = start_server(args.port, batch_size, args.concurrency, args.queue_size)
+            label = str(batch_size)
+        try:
+            run_sessions(url, 1, 3)  # warm-up
+            for n in args.sessions:
+                report(label, n, *run_sessions(url, n, args.requests))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+
+
+if __name__ == "__main__":
+    main()
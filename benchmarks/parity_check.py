@@ -0,0 +1,182 @@
+"""
+parity_check.py
+───────────────
+Pins that every front end is a thin adapter over inference.InferenceEngine:
+for random profiles, the Gradio app (both the batched handler the Predict
+button is wired to and the single-click one), the serverless API and the
+legacy script must show the same admit chance, and the sklearn / compiled / lookup /
+packed backends must return bit-identical forest outputs.
+
+Those checks share one engine, so ``GOLDEN`` also pins the numbers the
+pre-engine code showed for fixed profiles (computed once with the baseline
+``api/predict.py::_predict`` and ``app.py::predict_admission`` on model
+``GOLDEN_VERSION``).  The old API already applied the low-exam-score
+penalty and must match exactly; the old Gradio app and legacy script did
+not, so they must match where no penalty applies and differ by exactly the
+penalty (printed) where it does.
+
+Exits non-zero on the first mismatch.  Needs model.pkl (python train_model.py).
+
+Usage:
+    python benchmarks/parity_check.py [--profiles 2000]
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import re
+import sys
+import warnings
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE_DIR)
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+import numpy as np  # noqa: E402
+
+from inference import EXAM_LIMITS, InferenceEngine, make_backend  # noqa: E402
+
+
+# Model the golden values were computed for (train_model.py, random_state=42)
+GOLDEN_VERSION = "26cdd64cf2de"
+
+# (degree, exam_type, exam_score, work_exp, cgpa, sop, lor, research, country),
+# baseline API prediction, baseline Gradio / legacy prediction
+GOLDEN = [
+    (("Masters", "IELTS", 7.0, 1, 8.2, 3.5, 4.0, 1, "Canada"), 71.68, 71.68),
+    (("Masters", "TOEFL", 105, 2, 8.8, 4.0, 4.5, 1, "USA"), 72.84, 72.84),
+    (("PhD", "GRE", 325, 0, 9.3, 4.5, 4.5, 1, "Germany"), 78.44, 78.44),
+    (("Undergraduate", "DET", 120, 0, 7.4, 3.0, 3.0, 0, "UK"), 53.94, 53.94),
+    (("Masters", "PTE", 65, 3, 7.9, 3.5, 3.5, 0, "Australia"), 57.89, 57.89),
+    (("Undergraduate", "IELTS", 6.0, 0, 6.8, 2.5, 2.5, 0, "Ireland"), 47.16, 47.16),
+    (("PhD", "TOEFL", 90, 4, 8.5, 4.5, 4.0, 1, "Netherlands"), 78.32, 78.32),
+    (("Masters", "GRE", 300, 1, 7.5, 3.0, 3.5, 0, "Singapore"), 54.52, 54.52),
+    # Bottom 35% of the exam's range: the penalty applies
+    (("Masters", "IELTS", 2.5, 1, 8.0, 3.5, 3.5, 1, "Canada"), 59.95, 70.78),
+    (("Undergraduate", "PTE", 25, 0, 7.0, 3.0, 3.0, 0, "New Zealand"), 24.7, 49.07),
+    (("PhD", "DET", 40, 2, 9.0, 4.0, 4.0, 1, "Sweden"), 54.05, 76.55),
+    (("Masters", "TOEFL", 20, 0, 6.5, 2.0, 2.0, 0, "France"), 17.05, 44.55),
+    (("Masters", "GRE", 270, 1, 8.6, 4.0, 4.0, 1, "USA"), 39.71, 73.45),
+]
+_GOLDEN_FIELDS = ("degree", "exam_type", "exam_score", "work_exp", "cgpa", "sop", "lor",
+                  "research", "country")
+
+
+def check_golden(api):
+    """Current predictions against the baseline code's, on GOLDEN."""
+    if api.ENGINE.version != GOLDEN_VERSION:
+        print(f"⚠️  golden values are for model {GOLDEN_VERSION}, not {api.ENGINE.version} — skipped")
+        return
+    for values, old_api, old_app in GOLDEN:
+        body = dict(zip(_GOLDEN_FIELDS, values))
+        got = api._predict(body)["prediction"]
+        r = api.ENGINE.predict(api._profile(body))
+        assert got == old_api, (body, got, old_api)
+        if r.penalty == 0:
+            assert got == old_app, (body, got, old_app)
+        else:
+            # old_app is the unpenalised chance rounded to 2 dp
+            expected = max(0.0, old_app - r.penalty)
+            assert abs(got - expected) <= 0.011, (body, got, expected)
+            print(f"   {values[1]:<5} {values[2]:<5} {values[8]:<12} Gradio/legacy {old_app:6.2f} → "
+                  f"{got:6.2f}  (penalty −{r.penalty:.2f} pp, as the API always applied)")
+    print(f"✅ {len(GOLDEN)} golden profiles match the baseline API; the Gradio app "
+          f"and legacy script differ only by the exam penalty")
+
+
+def _load_legacy():
+    path = os.path.join(BASE_DIR, "admission_abroad_predictor (1).py")
+    spec = importlib.util.spec_from_file_location("legacy_predictor", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def random_body(rng, countries):
+    exam_type = rng.choice(list(EXAM_LIMITS))
+    lo, hi = EXAM_LIMITS[exam_type]
+    return {
+        "degree":     rng.choice(["Undergraduate", "Masters", "PhD"]),
+        "exam_type":  exam_type,
+        "exam_score": rng.choice([lo - 1, hi + 1, lo, hi, float(rng.randint(lo, hi))]),
+        "work_exp":   rng.randint(0, 10),
+        "cgpa":       round(rng.uniform(6.0, 10.0), 1),
+        "sop":        rng.randint(2, 10) / 2,
+        "lor":        rng.randint(2, 10) / 2,
+        "research":   rng.randint(0, 1),
+        "country":    rng.choice(countries),
+        "internship": rng.choice([False, True]),
+    }
+
+
+_HTML_PRED = re.compile(r"-webkit-text-fill-color:transparent'>([0-9.]+)%</span>")
+_TEXT_PRED = re.compile(r"Admit: ([0-9.]+)%")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profiles", type=int, default=2000)
+    args = ap.parse_args()
+
+    import app
+    from api import predict as api
+    legacy = _load_legacy()
+
+    check_golden(api)
+
+    rng = random.Random(0)
+    countries = sorted(api.ENGINE.country_map)
+    bodies = [random_body(rng, countries) for _ in range(args.profiles)]
+
+    # ── Front ends agree on the number shown ───────────────
+    for body in bodies:
+        p = api._profile(body)
+        expected = api.ENGINE.predict(p)
+        js = api._predict(body)
+        html = app.predict_admission(
+            p["degree"], p["exam_type"], p["exam_score"], p["work_exp"], p["cgpa"],
+            p["sop"], p["lor"], p["research"],
+            f"{app.COUNTRY_FLAGS[p['country']]} {p['country']}", p["internship"],
+        )
+        text = legacy.predict_admission(
+            p["degree"], p["exam_type"], p["exam_score"], p["work_exp"], p["cgpa"],
+            p["sop"], p["lor"], p["research"], p["country"],
+        )
+        if expected.error:
+            assert "error" in js and "Invalid score" in html and text.startswith("❌"), body
+            continue
+        assert js["prediction"] == expected.prediction, (body, js)
+        assert float(_HTML_PRED.search(html).group(1)) == expected.prediction, body
+        assert float(_TEXT_PRED.search(text).group(1)) == round(expected.prediction, 2), body
+    print(f"✅ app / api / legacy agree on {len(bodies)} profiles")
+
+    # ── The batched Gradio handler (what btn.click serves) ─
+    for start in range(0, len(bodies), app.MAX_BATCH_SIZE):
+        chunk = [api._profile(b) for b in bodies[start:start + app.MAX_BATCH_SIZE]]
+        columns = [[p[k] for p in chunk] for k in (
+            "degree", "exam_type", "exam_score", "work_exp", "cgpa", "sop", "lor", "research")]
+        columns.append([f"{app.COUNTRY_FLAGS[p['country']]} {p['country']}" for p in chunk])
+        columns.append([p["internship"] for p in chunk])
+        (cards,) = app.predict_admission_batch(*columns)
+        assert len(cards) == len(chunk)
+        for p, html in zip(chunk, cards):
+            expected = api.ENGINE.predict(p)
+            if expected.error:
+                assert "Invalid score" in html, p
+            else:
+                assert float(_HTML_PRED.search(html).group(1)) == expected.prediction, p
+    print(f"✅ batched Gradio handler agrees in batches of {app.MAX_BATCH_SIZE}")
+
+    # ── Backends are interchangeable ───────────────────────
+    engine = InferenceEngine.from_pickle(backend="sklearn")
+    rows = np.array([engine.encode(api._profile(b)) for b in bodies], dtype=float)
+    reference = engine.backend.predict(rows)
+    for name in ("compiled", "lookup", "packed"):
+        got = make_backend(name, engine.model, engine.version).predict(rows)
+        assert np.array_equal(got, reference), f"{name} backend diverges"
+        print(f"✅ {name} backend bit-identical to sklearn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+vercel_emulator.py
+──────────────────
+Local stand-in for Vercel's Python runtime, for load tests that cannot
+reach Vercel.  It reads vercel.json and serves its functions the way the
+platform does, rather than the way start_api.py does:
+
+  • one invocation at a time per function instance — concurrency comes
+    from more instances, up to --max-instances, and excess requests wait
+  • a new instance is a fresh process that imports the function module
+    (a cold start: unpickling model.pkl, warm-up); an idle instance is
+    reused LIFO (warm) and recycled after --idle-timeout seconds
+  • ``memory`` from vercel.json (1024 MB) is enforced: an instance whose
+    RSS exceeds it is killed and the invocation fails with 500, as does an
+    invocation longer than ``maxDuration`` (504)
+  • ``rewrites`` apply (/api/health → /api/predict)
+
+Every response carries ``X-Emulator-Cold: 0|1``, ``X-Emulator-Init-Ms`` and
+``X-Emulator-Rss-Mb`` so a load generator can split cold from warm
+latency.  ``GET /__emulator`` returns pool statistics without invoking
+anything.
+
+Usage:
+    python benchmarks/vercel_emulator.py [--port 3000] [--max-instances 4] [--idle-timeout 300]
+"""
+
+import argparse
+import email.message
+import importlib.util
+import io
+import json
+import multiprocessing as mp
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def _rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+# ----------------------------------------
+# FUNCTION INSTANCE (child process)
+# ----------------------------------------
+def _invoke(module, method, path, headers, body):
+    """Run the module's ``handler`` class on one request without a socket."""
+    h = module.handler.__new__(module.handler)
+    h.rfile, h.wfile = io.BytesIO(body), io.BytesIO()
+    h.headers = email.message.Message()
+    for k, v in headers.items():
+        h.headers[k] = v
+    h.headers["Content-Length"] = str(len(body))
+    h.command, h.path, h.request_version = method, path, "HTTP/1.1"
+    h.requestline = f"{method} {path} HTTP/1.1"
+    h.client_address = ("127.0.0.1", 0)
+    h.close_connection = True
+    getattr(h, f"do_{method}")()
+    raw = h.wfile.getvalue()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, payload
+
+
+def instance_main(conn, function, memory_mb):
+    os.chdir(BASE_DIR)
+    sys.path.insert(0, BASE_DIR)
+    t0 = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("vercel_function", os.path.join(BASE_DIR, function))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    init_ms = (time.perf_counter() - t0) * 1000
+    conn.send(("ready", init_ms, _rss_mb()))
+    while True:
+        method, path, headers, body = conn.recv()
+        try:
+            status, payload = _invoke(module, method, path, headers, body)
+        except Exception as exc:  # an unhandled error is a 500, like the platform
+            status, payload = 500, json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode()
+        rss = _rss_mb()
+        conn.send((status, payload, rss))
+        if rss > memory_mb:
+            return  # the platform kills the instance; the parent sees the exit
+
+
+class Instance:
+    def __init__(self, ctx, function, memory_mb):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=instance_main, args=(child, function, memory_mb), daemon=True)
+        self.proc.start()
+        self.memory_mb = memory_mb
+        self.init_ms = None
+        self.cold = True
+        self.last_used = time.monotonic()
+
+    def call(self, method, path, headers, body, timeout):
+        """(status, payload, rss_mb); kills the instance on timeout or OOM."""
+        if self.init_ms is None:
+            if not self.conn.poll(timeout):
+                self.kill()
+                return 504, b'{"error": "FUNCTION_INVOCATION_TIMEOUT (init)"}', 0.0
+            try:
+                _, self.init_ms, _ = self.conn.recv()
+            except EOFError:
+                self.kill()
+                return 500, b'{"error": "FUNCTION_INVOCATION_FAILED (init)"}', 0.0
+        self.conn.send((method, path, headers, body))
+        if not self.conn.poll(timeout):
+            self.kill()
+            return 504, b'{"error": "FUNCTION_INVOCATION_TIMEOUT"}', 0.0
+        try:
+            status, payload, rss = self.conn.recv()
+        except EOFError:
+            self.kill()
+            return 500, b'{"error": "FUNCTION_INVOCATION_FAILED"}', 0.0
+        if rss > self.memory_mb:
+            self.kill()
+            return 500, json.dumps({"error": f"out of memory ({rss:.0f} MB > "
+                                             f"{self.memory_mb} MB)"}).encode(), rss
+        return status, payload, rss
+
+    @property
+    def alive(self):
+        return self.proc.is_alive()
+
+    def kill(self):
+        if self.proc.is_alive():
+            self.proc.kill()
+        self.proc.join(timeout=5)
+
+
+# ----------------------------------------
+# ROUTER
+# ----------------------------------------
+class FunctionPool:
+    """Instances of one function: LIFO reuse, scale-out to ``max_instances``,
+    recycling after ``idle_timeout`` seconds."""
+
+    def __init__(self, function, memory_mb, max_duration, max_instances, idle_timeout):
+        self.ctx = mp.get_context("spawn")
+        self.function = function
+        self.memory_mb = memory_mb
+        self.max_duration = max_duration
+        self.max_instances = max_instances
+        self.idle_timeout = idle_timeout
+        self.idle = []
+        self.busy = 0
+        self.stats = {"invocations": 0, "cold_starts": 0, "killed": 0, "queued": 0}
+        self._cv = threading.Condition()
+        threading.Thread(target=self._reap, daemon=True).start()
+
+    def _acquire(self):
+        with self._cv:
+            deadline = time.monotonic() + self.max_duration
+            while not self.idle and self.busy >= self.max_instances:
+                self.stats["queued"] += 1
+                if not self._cv.wait(deadline - time.monotonic()):
+                    return None
+            self.busy += 1
+            if self.idle:
+                return self.idle.pop()
+            self.stats["cold_starts"] += 1
+        return Instance(self.ctx, self.function, self.memory_mb)
+
+    def _release(self, inst):
+        with self._cv:
+            self.busy -= 1
+            if inst.alive:
+                inst.cold = False
+                inst.last_used = time.monotonic()
+                self.idle.append(inst)
+            else:
+                self.stats["killed"] += 1
+            self._cv.notify()
+
+    def _reap(self):
+        while True:
+            time.sleep(1)
+            now = time.monotonic()
+            with self._cv:
+                stale = [i for i in self.idle if now - i.last_used > self.idle_timeout]
+                self.idle = [i for i in self.idle if i not in stale]
+            for inst in stale:
+                inst.kill()
+
+    def invoke(self, method, path, headers, body):
+        inst = self._acquire()
+        if inst is None:
+            return 429, b'{"error": "TOO_MANY_REQUESTS (no instance free)"}', {}
+        cold = inst.cold
+        try:
+            status, payload, rss = inst.call(method, path, headers, body, self.max_duration)
+        finally:
+            self._release(inst)
+        with self._cv:
+            self.stats["invocations"] += 1
+        return status, payload, {
+            "X-Emulator-Cold": str(int(cold)),
+            "X-Emulator-Init-Ms": f"{inst.init_ms or 0:.1f}",
+            "X-Emulator-Rss-Mb": f"{rss:.1f}",
+        }
+
+    def status(self):
+        with self._cv:
+            return dict(self.stats, busy=self.busy, idle=len(self.idle),
+                        memory_mb=self.memory_mb, max_instances=self.max_instances)
+
+
+def load_config(path=os.path.join(BASE_DIR, "vercel.json")):
+    with open(path) as f:
+        return json.load(f)
+
+
+def make_handler(config, pools):
+    rewrites = {r["source"]: r["destination"] for r in config.get("rewrites", [])}
+
+    class EmulatorHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _route(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/__emulator":
+                return self._send(200, json.dumps({f: p.status() for f, p in pools.items()}).encode(), {})
+            path = rewrites.get(path, path)
+            pool = pools.get(path.lstrip("/") + ".py")
+            if pool is None:
+                return self._send(404, b'{"error": "NOT_FOUND"}', {})
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            headers = {k: v for k, v in self.headers.items() if k.lower() != "content-length"}
+            status, payload, extra = pool.invoke(self.command, self.path, headers, body)
+            self._send(status, payload, extra)
+
+        do_GET = do_POST = do_OPTIONS = _route
+
+        def _send(self, status, payload, extra):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for k, v in extra.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *_):
+            pass
+
+    return EmulatorHandler
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=3000)
+    ap.add_argument("--max-instances", type=int, default=4)
+    ap.add_argument("--idle-timeout", type=float, default=300,
+                    help="seconds an idle instance stays warm before it is recycled")
+    ap.add_argument("--memory", type=int, help="override vercel.json memory (MB)")
+    args = ap.parse_args()
+
+    config = load_config()
+    pools = {
+        fn: FunctionPool(fn, args.memory or spec.get("memory", 1024), spec.get("maxDuration", 10),
+                         args.max_instances, args.idle_timeout)
+        for fn, spec in config.get("functions", {}).items()
+    }
+    # Exit cleanly on SIGTERM so the daemonic instance processes go with us
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    server = ThreadingHTTPServer(("", args.port), make_handler(config, pools))
+    server.daemon_threads = True
+    print(f"Vercel emulator on http://localhost:{args.port}  "
+          f"({', '.join(f'{f}: {p.memory_mb} MB' for f, p in pools.items())})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+binned_gbm.py
+─────────────
+Out-of-core training: stream the dataset in chunks into a uint8 binned
+matrix on disk, then fit a histogram gradient-boosting model on it.
+
+    scan(chunks)           pass 1 — row count, categories, per-feature value counts
+    bin_to_disk(...)       pass 2 — uint8 bins, column-major np.memmap (13 B/row)
+    BinnedGBM.fit(...)     least-squares boosting, level-wise depth-limited trees
+
+Every feature in this dataset is discrete (slider steps, integer exam
+scores, 2-dp CGPA, category codes), so pass 1 keeps exact value counts
+and cuts at most 255 bins from them; edges are midpoints between observed
+values.  A split "bin <= b" is stored as the raw-feature test
+"x <= edges[b]", so the fitted model predicts straight from the same
+13-column rows the forest does and drops into model.pkl unchanged.
+
+Training memory is the binned matrix plus a handful of length-n vectors
+(residuals, node ids) — no DataFrame of the full history is ever built.
+
+Used by ``python train_model.py --out-of-core``.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from inference import FEATURE_COLUMNS
+
+MAX_BINS = 255
+MAX_DISTINCT = 65536
+
+CATEGORICAL = {
+    "Degree_Encoded":  "Degree_Level",
+    "Exam_Encoded":    "Exam_Type",
+    "Country_Encoded": "Country_Aiming",
+}
+NUMERIC = [c for c in FEATURE_COLUMNS if c not in CATEGORICAL]
+
+
+# ----------------------------------------
+# PASS 1 — SCAN
+# ----------------------------------------
+def scan(chunks):
+    """Row count, sorted categories per categorical column and
+    (values, counts) per numeric column over an iterable of DataFrames."""
+    n = 0
+    categories = {col: set() for col in CATEGORICAL.values()}
+    counts = {col: {} for col in NUMERIC}
+    for chunk in chunks:
+        n += len(chunk)
+        for col in categories:
+            categories[col].update(chunk[col].unique())
+        for col in NUMERIC:
+            values, c = np.unique(chunk[col].to_numpy(dtype=np.float64), return_counts=True)
+            acc = counts[col]
+            for v, k in zip(values.tolist(), c.tolist()):
+                acc[v] = acc.get(v, 0) + k
+            if len(acc) > MAX_DISTINCT:
+                raise ValueError(f"{col} has more than {MAX_DISTINCT} distinct values — "
+                                 "round it before out-of-core training")
+    categories = {col: sorted(vals) for col, vals in categories.items()}
+    counts = {col: (np.array(sorted(acc)), np.array([acc[v] for v in sorted(acc)]))
+              for col, acc in counts.items()}
+    return n, categories, counts
+
+
+def edges_from_counts(values, counts, max_bins=MAX_BINS):
+    """Midpoint cut edges giving at most ``max_bins`` bins of roughly equal mass."""
+    if len(values) <= max_bins:
+        keep = np.arange(len(values) - 1)
+    else:
+        cum = np.cumsum(counts)
+        targets = cum[-1] * np.arange(1, max_bins) / max_bins
+        keep = np.unique(np.searchsorted(cum, targets))
+        keep = keep[keep < len(values) - 1]
+    return (values[keep] + values[keep + 1]) / 2
+
+
+def category_maps(categories):
+    """Code = position in sorted order, i.e. pandas' ``cat.codes``."""
+    return {col: {c: i for i, c in enumerate(cats)} for col, cats in categories.items()}
+
+
+def chunk_matrix(chunk, maps):
+    """Raw 13-column float matrix in FEATURE_COLUMNS order."""
+    cols = []
+    for name in FEATURE_COLUMNS:
+        if name in CATEGORICAL:
+            col = CATEGORICAL[name]
+            cols.append(chunk[col].map(maps[col]).to_numpy(dtype=np.float64))
+        else:
+            cols.append(chunk[name].to_numpy(dtype=np.float64))
+    return np.column_stack(cols)
+
+
+# ----------------------------------------
+# PASS 2 — BIN TO DISK
+# ----------------------------------------
+def bin_matrix(X, edges):
+    out = np.empty((len(edges), X.shape[0]), dtype=np.uint8)
+    for f, e in enumerate(edges):
+        out[f] = np.searchsorted(e, X[:, f], side="left")
+    return out
+
+
+def bin_to_disk(chunks, n, maps, edges, holdout_every=5, workdir=None):
+    """Write train/holdout bins and targets to memmaps in ``workdir``.
+
+    Row ``i`` (in stream order) is held out when ``i % holdout_every == 0``
+    (``holdout_every=0`` keeps everything for training)."""
+    workdir = workdir or tempfile.mkdtemp(prefix="binned-")
+    n_hold = (n + holdout_every - 1) // holdout_every if holdout_every else 0
+    F = len(FEATURE_COLUMNS)
+
+    def mm(name, shape, dtype):
+        return np.memmap(os.path.join(workdir, name), dtype=dtype, mode="w+", shape=shape)
+
+    Xtr, ytr = mm("train.u8", (F, n - n_hold), np.uint8), mm("train.y", (n - n_hold,), np.float32)
+    Xho, yho = mm("hold.u8", (F, max(n_hold, 1)), np.uint8), mm("hold.y", (max(n_hold, 1),), np.float32)
+    start = tr = ho = 0
+    for chunk in chunks:
+        Xb = bin_matrix(chunk_matrix(chunk, maps), edges)
+        y = chunk["Chance_of_Admit"].to_numpy(dtype=np.float32)
+        hold = (np.arange(start, start + len(chunk)) % holdout_every == 0) if holdout_every \
+            else np.zeros(len(chunk), dtype=bool)
+        k = int(hold.sum())
+        Xho[:, ho:ho + k], yho[ho:ho + k] = Xb[:, hold], y[hold]
+        Xtr[:, tr:tr + len(chunk) - k], ytr[tr:tr + len(chunk) - k] = Xb[:, ~hold], y[~hold]
+        ho, tr, start = ho + k, tr + len(chunk) - k, start + len(chunk)
+    return (Xtr, ytr), (Xho[:, :n_hold], yho[:n_hold]), workdir
+
+
+# ----------------------------------------
+# MODEL
+# ----------------------------------------
+class BinnedGBM:
+    """Least-squares gradient boosting over pre-binned features.
+
+    Trees are complete binary trees of ``max_depth`` in heap order, stacked
+    into (n_trees, n_nodes) arrays; a leaf has feature -1 and keeps routing
+    to itself, so prediction walks every tree at once, level by level.
+    """
+
+    def __init__(self, n_rounds=300, learning_rate=0.05, max_depth=4,
+                 min_samples_leaf=10, l2=1.0):
+        self.n_rounds = n_rounds
+        self.learning_rate = learning_rate
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.l2 = l2
+
+    # ── Training ───────────────────────────────────────────
+    def fit(self, Xb, y, edges, verbose=False):
+        """``Xb`` is (n_features, n) uint8 bins, ``y`` length n."""
+        n_nodes = 2 ** (self.max_depth + 1) - 1
+        T = self.n_rounds
+        self.edges = edges
+        self.base = float(np.mean(y, dtype=np.float64))
+        self.feature = np.full((T, n_nodes), -1, dtype=np.int8)
+        self.threshold = np.full((T, n_nodes), np.inf)
+        self.value = np.zeros((T, n_nodes))
+        self.bin_threshold = np.zeros((T, n_nodes), dtype=np.uint8)
+
+        pred = np.full(len(y), self.base, dtype=np.float32)
+        for t in range(T):
+            resid = (y - pred).astype(np.float64)
+            node = self._grow(t, Xb, resid)
+            pred += self.value[t][node].astype(np.float32)
+            if verbose and (t + 1) % 50 == 0:
+                rmse = float(np.sqrt(np.mean((y - pred) ** 2)))
+                print(f"  round {t + 1:4d}  train RMSE {rmse:.4f}")
+        return self
+
+    def _grow(self, t, Xb, g):
+        """Grow tree ``t`` on residuals ``g``; return each row's leaf node."""
+        n = g.shape[0]
+        B = MAX_BINS + 1
+        node = np.zeros(n, dtype=np.int64)    # heap index
+        live = np.ones(n, dtype=bool)         # row still at a split candidate
+        feature, bthr, thr, value = (self.feature[t], self.bin_threshold[t],
+                                     self.threshold[t], self.value[t])
+        lam, min_leaf = self.l2, self.min_samples_leaf
+
+        for depth in range(self.max_depth + 1):
+            first = 2 ** depth - 1
+            width = 2 ** depth
+            rows = np.flatnonzero(live)
+            if not rows.size:
+                break
+            local = node[rows] - first
+            G = np.bincount(local, weights=g[rows], minlength=width)
+            N = np.bincount(local, minlength=width).astype(np.float64)
+            value[first:first + width] = np.where(N > 0, G / (N + lam), 0.0) * self.learning_rate
+            if depth == self.max_depth:
+                break
+
+            F = Xb.shape[0]
+            hg = np.empty((F, width, B))
+            hn = np.empty((F, width, B))
+            gr = g[rows]
+            for f in range(F):
+                key = local * B + Xb[f, rows]
+                hg[f] = np.bincount(key, weights=gr, minlength=width * B).reshape(width, B)
+                hn[f] = np.bincount(key, minlength=width * B).reshape(width, B)
+            GL, NL = np.cumsum(hg, axis=2), np.cumsum(hn, axis=2)
+            GR, NR = G[:, None] - GL, N[:, None] - NL
+            gain = GL ** 2 / (NL + lam) + GR ** 2 / (NR + lam) - (G ** 2 / (N + lam))[:, None]
+            gain[(NL < min_leaf) | (NR < min_leaf)] = -np.inf
+            # best (feature, bin) per node
+            flat = gain.transpose(1, 0, 2).reshape(width, F * B)
+            arg = np.argmax(flat, axis=1)
+            best_gain = flat[np.arange(width), arg]
+            best_f = np.where(best_gain > 0, arg // B, -1)
+            best_b = arg % B
+
+            split = best_f >= 0
+            ids = first + np.flatnonzero(split)
+            feature[ids] = best_f[split]
+            bthr[ids] = best_b[split]
+            thr[ids] = [self.edges[f][b] if b < len(self.edges[f]) else np.inf
+                        for f, b in zip(best_f[split], best_b[split])]
+
+            at = node[rows]
+            goes = feature[at] >= 0
+            right = Xb[np.maximum(feature[at], 0), rows] > bthr[at]
+            node[rows] = np.where(goes, 2 * at + 1 + right, at)
+            live[rows[~goes]] = False
+        return node
+
+    # ── Serving ────────────────────────────────────────────
+    def predict(self, X):
+        """Raw 13-column rows in, predictions out (all trees walked together)."""
+        X = np.asarray(X, dtype=np.float64)
+        T = self.feature.shape[0]
+        trees = np.arange(T)
+        node = np.zeros((X.shape[0], T), dtype=np.int64)
+        for _ in range(self.max_depth):
+            f = self.feature[trees, node]
+            x = X[np.arange(X.shape[0])[:, None], np.maximum(f, 0)]
+            step = 2 * node + 1 + (x > self.threshold[trees, node])
+            node = np.where(f >= 0, step, node)
+        return self.base + self.value[trees, node].sum(axis=1)
+
+    def predict_binned(self, Xb):
+        """Same as ``predict`` on pre-binned (n_features, n) data, chunked."""
+        out = np.empty(Xb.shape[1])
+        T = self.feature.shape[0]
+        trees = np.arange(T)
+        for s in range(0, Xb.shape[1], 8192):
+            cols = np.asarray(Xb[:, s:s + 8192]).T
+            node = np.zeros((cols.shape[0], T), dtype=np.int64)
+            for _ in range(self.max_depth):
+                f = self.feature[trees, node]
+                b = cols[np.arange(cols.shape[0])[:, None], np.maximum(f, 0)]
+                step = 2 * node + 1 + (b > self.bin_threshold[trees, node])
+                node = np.where(f >= 0, step, node)
+            out[s:s + cols.shape[0]] = self.base + self.value[trees, node].sum(axis=1)
+        return out
+
+    def prefault(self):
+        for arr in (self.feature, self.threshold, self.value):
+            arr.sum()
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.value,
+                                      self.bin_threshold))
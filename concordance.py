@@ -0,0 +1,87 @@
+"""
+concordance.py
+──────────────
+Language-exam concordance: what an IELTS 7.0 is worth in TOEFL, PTE or DET.
+
+The table is built once at import from published concordance anchors
+(ETS's TOEFL iBT–IELTS study, Pearson's PTE Academic–IELTS concordance,
+Duolingo's DET–IELTS table), expressed on a common IELTS-band axis and
+linearly interpolated between anchors.  Each exam's native score grid
+(IELTS half bands, TOEFL / PTE points, DET steps of 5) gets one row of
+equivalent scores in every language exam, so a conversion is an index
+computation and an array read.
+
+Anchors are the lower end of each published band range, so a converted
+score is the minimum that concords — never an inflated what-if.  GRE
+measures something else and has no concordance.
+
+    CONCORDANCE.convert("IELTS", 7.0)  →  {"IELTS": 7.0, "TOEFL": 94.0, "PTE": 66.0, "DET": 125.0}
+
+Used by ``InferenceEngine.exam_variants`` / ``"concordance": true`` in
+api/predict.py.
+"""
+
+import numpy as np
+
+from inference import EXAM_LIMITS, LANGUAGE_EXAMS
+
+# IELTS band → lower end of the concording score band in each exam.
+# Band 0 maps to each exam's floor so the whole valid range is covered.
+IELTS_BANDS = [0.0, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0, 8.5, 9.0]
+ANCHORS = {
+    "IELTS": IELTS_BANDS,
+    "TOEFL": [0,  31,  32,  35,  46,  60,  79,  94, 102, 110, 115, 118],
+    "PTE":   [10, 20,  23,  29,  36,  46,  56,  66,  76,  84,  89,  90],
+    "DET":   [10, 65,  75,  85,  95, 105, 115, 125, 135, 145, 155, 160],
+}
+
+# Native reporting step of each exam
+STEPS = {"IELTS": 0.5, "TOEFL": 1.0, "PTE": 1.0, "DET": 5.0}
+
+
+class ConcordanceTable:
+    """Dense exam → exam conversion arrays over every valid native score."""
+
+    def __init__(self, anchors=ANCHORS, steps=STEPS):
+        self.exams = list(LANGUAGE_EXAMS)
+        self.steps = steps
+        self.tables = {}
+        for src in self.exams:
+            lo, hi = EXAM_LIMITS[src]
+            grid = np.arange(lo, hi + steps[src] / 2, steps[src])
+            band = np.interp(grid, anchors[src], IELTS_BANDS)
+            table = np.empty((len(grid), len(self.exams)))
+            for j, dst in enumerate(self.exams):
+                score = np.interp(band, IELTS_BANDS, anchors[dst])
+                # Round DOWN to the target's reporting step: the equivalent
+                # is the lowest score that concords, never more
+                dlo, dhi = EXAM_LIMITS[dst]
+                step = steps[dst]
+                table[:, j] = np.clip(dlo + np.floor((score - dlo) / step + 1e-9) * step, dlo, dhi)
+            table[:, self.exams.index(src)] = grid
+            self.tables[src] = table
+
+    def convert(self, exam_type, score):
+        """Equivalent score in every language exam, or None for GRE."""
+        if exam_type not in self.tables:
+            return None
+        lo, hi = EXAM_LIMITS[exam_type]
+        step = self.steps[exam_type]
+        i = int(np.floor((min(max(score, lo), hi) - lo) / step + 1e-9))
+        row = self.tables[exam_type][i]
+        out = {exam: float(v) for exam, v in zip(self.exams, row)}
+        out[exam_type] = float(score)   # the applicant's own score, unrounded
+        return out
+
+    def convert_many(self, exam_type, scores):
+        """``convert`` for an array of ``exam_type`` scores: an (n, exams)
+        array in ``self.exams`` order."""
+        lo, hi = EXAM_LIMITS[exam_type]
+        scores = np.clip(np.asarray(scores, dtype=float), lo, hi)
+        i = np.floor((scores - lo) / self.steps[exam_type] + 1e-9).astype(int)
+        out = self.tables[exam_type][i]
+        out[:, self.exams.index(exam_type)] = scores
+        return out
+
+
+CONCORDANCE = ConcordanceTable()
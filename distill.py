@@ -0,0 +1,206 @@
+"""
+distill.py
+──────────
+Distil the forest in model.pkl into a small boosted student for serving.
+
+Usage:
+    python distill.py [--samples 200000] [--max-deviation 8.0] [--p99-deviation 3.0]
+
+Output: model_distilled.pkl  (serve it with ADMISSION_BACKEND=distilled)
+
+The input domain is small and bounded (13 features, three categoricals),
+so the forest's output can be learned directly: draw dense uniform samples
+of every valid profile, label them with the forest, and fit a depth-6
+binned_gbm.BinnedGBM on the labels.  Bin edges are the forest's own split
+thresholds, so the student can only cut where the teacher does.
+
+The student is shipped only if, on a fresh synthetic sample AND on every
+real CSV row (plus jittered neighbours), no admit chance moves by more
+than ``--max-deviation`` percentage points and the 99th percentile stays
+under ``--p99-deviation``.  The report compares size, latency and error with the
+forest; a failed gate writes nothing and exits non-zero.
+"""
+
+import argparse
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from inference import (
+    DISTILLED_PATH, EXAM_COLUMNS, EXAM_LIMITS, EXAM_OFFSET, FEATURE_COLUMNS, MODEL_PATH,
+    load_artifact, make_backend,
+)
+
+# Gate, in percentage points of admit chance.  A fully grown forest has
+# sharp spikes around its training rows that no compact smooth model
+# reproduces exactly, so the worst case is bounded loosely and the bulk
+# (p99) tightly.
+MAX_DEVIATION = 8.0
+P99_DEVIATION = 3.0
+
+ROUNDS, DEPTH = 600, 6
+
+
+def sample_domain(n, payload, rng):
+    """``n`` uniform encoded rows over every valid profile."""
+    X = np.zeros((n, len(FEATURE_COLUMNS)))
+    col = FEATURE_COLUMNS.index
+    exams = sorted(payload["exam_map"])
+    exam = rng.integers(0, len(exams), n)
+    X[:, col("Degree_Encoded")]        = rng.choice(list(payload["degree_map"].values()), n)
+    X[:, col("Country_Encoded")]       = rng.choice(list(payload["country_map"].values()), n)
+    X[:, col("Exam_Encoded")]          = np.array([payload["exam_map"][e] for e in exams])[exam]
+    X[:, col("Work_Experience_Years")] = rng.integers(0, 11, n)
+    X[:, col("CGPA")]                  = rng.uniform(6.0, 10.0, n)
+    X[:, col("SOP")]                   = rng.uniform(1.0, 5.0, n)
+    X[:, col("LOR")]                   = rng.uniform(1.0, 5.0, n)
+    X[:, col("Research")]              = rng.integers(0, 2, n)
+    lo = np.array([EXAM_LIMITS[e][0] for e in exams])[exam]
+    hi = np.array([EXAM_LIMITS[e][1] for e in exams])[exam]
+    slot = np.array([EXAM_OFFSET + EXAM_COLUMNS.index(e) for e in exams])[exam]
+    X[np.arange(n), slot] = rng.uniform(lo, hi)
+    return X
+
+
+def around_real(X_real, copies, rng):
+    """The real rows plus ``copies`` jittered neighbours of each — a fully
+    grown forest is spikiest right around its training points."""
+    col = FEATURE_COLUMNS.index
+    X = np.repeat(X_real, copies, axis=0)
+    n = len(X)
+    X[:, col("CGPA")] = np.clip(X[:, col("CGPA")] + rng.normal(0, 0.15, n), 6.0, 10.0)
+    X[:, col("SOP")]  = np.clip(X[:, col("SOP")] + rng.normal(0, 0.25, n), 1.0, 5.0)
+    X[:, col("LOR")]  = np.clip(X[:, col("LOR")] + rng.normal(0, 0.25, n), 1.0, 5.0)
+    for i, exam in enumerate(EXAM_COLUMNS):
+        lo, hi = EXAM_LIMITS[exam]
+        c = EXAM_OFFSET + i
+        taken = X[:, c] > 0
+        X[taken, c] = np.clip(X[taken, c] + rng.normal(0, (hi - lo) * 0.03, taken.sum()), lo, hi)
+    return np.vstack([X_real, X])
+
+
+def split_edges(forest, max_bins=255):
+    """Per feature, the forest's split thresholds (most-used ones if > max_bins)."""
+    thresholds = [[] for _ in FEATURE_COLUMNS]
+    for est in forest.estimators_:
+        t = est.tree_
+        split = t.children_left >= 0
+        for f, thr in zip(t.feature[split], t.threshold[split]):
+            thresholds[f].append(thr)
+    edges = []
+    for thr in thresholds:
+        values, counts = np.unique(np.asarray(thr, dtype=np.float64), return_counts=True)
+        if len(values) > max_bins - 1:
+            cum = np.cumsum(counts)
+            values = values[np.unique(np.searchsorted(cum, cum[-1] * np.arange(1, max_bins) / max_bins))]
+        edges.append(values)
+    return edges
+
+
+def _deviation(a, b):
+    d = np.abs(np.clip(a, 0, 1) - np.clip(b, 0, 1)) * 100
+    return {"mean": round(float(d.mean()), 3), "p99": round(float(np.percentile(d, 99)), 3),
+            "max": round(float(d.max()), 3)}
+
+
+def _latency_ms(backend, X, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        backend.predict(X)
+        best = min(best, time.perf_counter() - t0)
+    return round(best * 1000, 3)
+
+
+def real_rows(payload):
+    from train_model import load_dataset
+
+    data = load_dataset()
+    # Encoded with the artifact's maps, exactly as the front ends encode
+    data["Degree_Encoded"]  = data["Degree_Level"].map(payload["degree_map"])
+    data["Exam_Encoded"]    = data["Exam_Type"].map(payload["exam_map"])
+    data["Country_Encoded"] = data["Country_Aiming"].map(payload["country_map"])
+    return data[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+
+
+def distill(payload, samples=200_000, copies=100, seed=0, verbose=False):
+    """Return (student, report) for the forest in ``payload``."""
+    from binned_gbm import BinnedGBM, bin_matrix
+
+    forest = payload["model"]
+    teacher = make_backend("sklearn", forest)
+    rng = np.random.default_rng(seed)
+    X_real = real_rows(payload)
+
+    t0 = time.perf_counter()
+    X = np.vstack([sample_domain(samples, payload, rng), around_real(X_real, copies, rng)])
+    y = np.clip(teacher.predict(X), 0, 1)
+    edges = split_edges(forest)
+    t1 = time.perf_counter()
+    if verbose:
+        print(f"Labelled {len(X):,} samples in {t1 - t0:.1f}s; fitting student...")
+    student = BinnedGBM(n_rounds=ROUNDS, learning_rate=0.1, max_depth=DEPTH, min_samples_leaf=5)
+    student.fit(bin_matrix(X, edges), y, edges, verbose=verbose)
+    t2 = time.perf_counter()
+
+    X_check = np.vstack([sample_domain(samples // 3, payload, rng),
+                         around_real(X_real, copies // 10, rng)])
+    one, batch = X_check[:1], X_check[:64]
+    report = {
+        "samples":        len(X),
+        "label_s":        round(t1 - t0, 1),
+        "fit_s":          round(t2 - t1, 1),
+        "forest_bytes":   len(pickle.dumps(forest)),
+        "student_bytes":  len(pickle.dumps(student)),
+        "synthetic":      _deviation(teacher.predict(X_check), student.predict(X_check)),
+        "real":           _deviation(teacher.predict(X_real), student.predict(X_real)),
+        "latency_ms":     {
+            name: {"1": _latency_ms(b, one), "64": _latency_ms(b, batch)}
+            for name, b in (("sklearn", teacher), ("compiled", make_backend("compiled", forest)),
+                            ("distilled", make_backend("sklearn", student)))
+        },
+    }
+    return student, report
+
+
+def main():
+    from train_model import save_artifact
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--samples", type=int, default=200_000)
+    ap.add_argument("--max-deviation", type=float, default=MAX_DEVIATION,
+                    help="largest allowed change in admit chance, percentage points")
+    ap.add_argument("--p99-deviation", type=float, default=P99_DEVIATION)
+    ap.add_argument("--copies", type=int, default=100,
+                    help="jittered neighbours sampled around each real CSV row")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    payload = load_artifact(MODEL_PATH)
+    if not hasattr(payload["model"], "estimators_"):
+        sys.exit("model.pkl is not a forest — nothing to distil")
+    student, report = distill(payload, args.samples, args.copies, args.seed, verbose=True)
+
+    print(f"\nSize     forest {report['forest_bytes'] / 2**20:7.2f} MB   "
+          f"student {report['student_bytes'] / 2**20:7.2f} MB")
+    for name, lat in report["latency_ms"].items():
+        print(f"Latency  {name:9s}  1 row {lat['1']:7.3f} ms   64 rows {lat['64']:7.3f} ms")
+    for name in ("synthetic", "real"):
+        d = report[name]
+        print(f"Error    {name:9s}  mean {d['mean']:.3f}  p99 {d['p99']:.3f}  "
+              f"max {d['max']:.3f} pp")
+
+    worst = max(report["synthetic"]["max"], report["real"]["max"])
+    p99 = max(report["synthetic"]["p99"], report["real"]["p99"])
+    if worst > args.max_deviation or p99 > args.p99_deviation:
+        sys.exit(f"\n❌ Deviation max {worst:.3f} / p99 {p99:.3f} pp exceeds "
+                 f"{args.max_deviation} / {args.p99_deviation} — not shipped")
+    save_artifact({"model": student, "teacher_version": payload["version"], "report": report},
+                  DISTILLED_PATH)
+    print(f"\n✅ Saved → {DISTILLED_PATH}  (ADMISSION_BACKEND=distilled)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,712 @@
+"""
+inference.py
+────────────
+Shared inference core for every front end:
+
+    app.py                              Gradio UI (HTML result card)
+    api/predict.py                      Vercel serverless JSON API
+    admission_abroad_predictor (1).py   legacy standalone Gradio script
+
+Encoding, validation, scoring, the low-exam-score penalty, verdicts, the
+scorecard, tip selection and country–exam fit all live here, so each front
+end only turns a ``Prediction`` into its own output format (HTML, JSON, text).
+
+The forest itself is evaluated by a pluggable backend:
+
+    sklearn    model.predict on the unpickled RandomForestRegressor
+    compiled   all trees flattened into contiguous NumPy arrays, evaluated
+               for a whole batch with vectorised traversal (bit-identical)
+    lookup     memo table over exact feature rows in front of ``compiled``
+               (slider inputs are discrete, so repeat profiles are common)
+    packed     the forest quantised into one 5-byte-per-node buffer
+               (packed_forest.py); exact thresholds and leaf codebook,
+               so still bit-identical
+    distilled  small boosted student fitted to the forest (distill.py);
+               approximate, within the deviation gate it was shipped under
+
+Pick one with ``ADMISSION_BACKEND=<name>`` or ``InferenceEngine(..., backend=)``.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
+DISTILLED_PATH = os.path.join(BASE_DIR, "model_distilled.pkl")
+PACKED_PATH = os.path.join(BASE_DIR, "model_packed.npz")
+
+# ----------------------------------------
+# FEATURE SCHEMA  (train_model.py trains on these columns)
+# ----------------------------------------
+EXAM_COLUMNS = ["IELTS", "TOEFL", "PTE", "DET", "GRE"]
+
+FEATURE_COLUMNS = [
+    "Degree_Encoded", "Work_Experience_Years", "CGPA",
+    "SOP", "LOR", "Research",
+    "IELTS", "TOEFL", "PTE", "DET", "GRE",
+    "Exam_Encoded", "Country_Encoded",
+]
+EXAM_OFFSET = FEATURE_COLUMNS.index("IELTS")
+
+EXAM_LIMITS = {
+    "IELTS": (0, 9), "TOEFL": (0, 120),
+    "PTE": (10, 90), "DET": (10, 160), "GRE": (260, 340),
+}
+
+EU_COUNTRIES  = {"France", "Germany", "Netherlands", "Sweden", "Switzerland"}
+GRE_COUNTRIES = {"USA", "Canada", "Singapore", "Australia"}
+LANGUAGE_EXAMS = ("IELTS", "TOEFL", "PTE", "DET")
+
+# ----------------------------------------
+# SCORING POLICY
+# ----------------------------------------
+# Scores in the bottom 35% of an exam's range (e.g. PTE 13/90) lose
+# (0.35 - pct) * 150 percentage points of admit chance.
+PENALTY_CUTOFF = 0.35
+
+# (minimum %, verdict, bar colour) — first match wins
+VERDICTS = [
+    (70, "Strong Admit",    "#22c55e"),
+    (45, "Moderate Chance", "#f59e0b"),
+    (0,  "Low Chance",      "#ef4444"),
+]
+
+# (scorecard label, profile key, strong threshold, average threshold)
+SCORECARD = [
+    ("CGPA",     "cgpa",     8.0, 7.0),
+    ("SOP",      "sop",      4.5, 3.0),
+    ("LOR",      "lor",      4.5, 3.0),
+    ("Work Exp", "work_exp", 4,   2),
+]
+
+# Tip keys, in display order; each front end maps them to its own copy
+TIP_KEYS = [
+    "low_cgpa", "weak_sop", "weak_lor", "no_research",
+    "no_experience", "internship", "strong_profile",
+]
+
+
+def rate(val, strong, avg):
+    if val >= strong: return "Strong"
+    if val >= avg:    return "Average"
+    return "Weak"
+
+
+def exam_penalty(exam_type, exam_score):
+    lo, hi = EXAM_LIMITS[exam_type]
+    exam_percent = (exam_score - lo) / (hi - lo) if hi > lo else 0
+    if exam_percent < PENALTY_CUTOFF:
+        return (PENALTY_CUTOFF - exam_percent) * 100 * 1.5
+    return 0
+
+
+# Exam limits as arrays indexed like EXAM_COLUMNS
+_EXAM_LO = np.array([EXAM_LIMITS[e][0] for e in EXAM_COLUMNS], dtype=float)
+_EXAM_HI = np.array([EXAM_LIMITS[e][1] for e in EXAM_COLUMNS], dtype=float)
+
+
+def exam_penalties(exam_types, exam_scores):
+    """``exam_penalty`` over arrays of exam types (names, or indices into
+    EXAM_COLUMNS) and scores."""
+    idx = np.asarray(exam_types)
+    if idx.dtype.kind in "US":
+        names, inverse = np.unique(idx, return_inverse=True)
+        idx = np.array([EXAM_COLUMNS.index(e) for e in names])[inverse]
+    lo, hi = _EXAM_LO[idx], _EXAM_HI[idx]
+    pct = (np.asarray(exam_scores, dtype=float) - lo) / (hi - lo)
+    return np.where(pct < PENALTY_CUTOFF, (PENALTY_CUTOFF - pct) * 100 * 1.5, 0.0)
+
+
+def verdict_for(pred):
+    for floor, verdict, bar_color in VERDICTS:
+        if pred >= floor:
+            return verdict, bar_color
+    return VERDICTS[-1][1], VERDICTS[-1][2]
+
+
+def select_tips(cgpa, sop, lor, research, work_exp, internship):
+    tips = []
+    if cgpa < 7.0:
+        tips.append("low_cgpa")
+    if sop < 3.0:
+        tips.append("weak_sop")
+    if lor < 3.0:
+        tips.append("weak_lor")
+    if not research:
+        tips.append("no_research")
+    if work_exp == 0 and not internship:
+        tips.append("no_experience")
+    if work_exp == 0 and internship:
+        tips.append("internship")
+    if work_exp > 0 and cgpa >= 8.0 and research:
+        tips.append("strong_profile")
+    return tips
+
+
+def exam_fit(exam_type, country):
+    """"gre_in_eu", "gre_expected" or "" — front ends supply the wording."""
+    if exam_type == "GRE" and country in EU_COUNTRIES:
+        return "gre_in_eu"
+    if exam_type in LANGUAGE_EXAMS and country in GRE_COUNTRIES:
+        return "gre_expected"
+    return ""
+
+
+# ----------------------------------------
+# RESULT
+# ----------------------------------------
+@dataclass
+class Prediction:
+    """Structured outcome of scoring one profile.
+
+    ``prediction`` is the number every front end shows (0–100, 2 dp);
+    ``raw`` is the clipped forest output (0–1) before the exam penalty.
+    A non-empty ``error`` means the profile was rejected and nothing else
+    is meaningful.
+    """
+
+    prediction: float = 0.0
+    raw: float = 0.0
+    penalty: float = 0.0
+    verdict: str = ""
+    bar_color: str = ""
+    ratings: dict = field(default_factory=dict)
+    tips: list = field(default_factory=list)
+    fit: str = ""
+    error: str = ""
+
+
+def build_prediction(p, raw):
+    """Everything downstream of the forest, for a clipped output ``raw`` (0–1)."""
+    internship = bool(p.get("internship", False))
+    penalty = exam_penalty(p["exam_type"], p["exam_score"])
+    pred = round(max(0.0, raw * 100 - penalty), 2)
+    verdict, bar_color = verdict_for(pred)
+
+    ratings = {label: rate(p[key], strong, avg) for label, key, strong, avg in SCORECARD}
+    ratings["Research"]   = "Strong" if p["research"] else "Weak"
+    ratings["Internship"] = "Strong" if internship else "Weak"
+
+    return Prediction(
+        prediction=pred,
+        raw=raw,
+        penalty=penalty,
+        verdict=verdict,
+        bar_color=bar_color,
+        ratings=ratings,
+        tips=select_tips(p["cgpa"], p["sop"], p["lor"], p["research"],
+                         p["work_exp"], internship),
+        fit=exam_fit(p["exam_type"], p["country"]),
+    )
+
+
+def invalid_score_error(exam_type):
+    lo, hi = EXAM_LIMITS[exam_type]
+    return f"Invalid {exam_type} score. Allowed: {lo}–{hi}"
+
+
+# ----------------------------------------
+# BACKENDS
+# ----------------------------------------
+class SklearnBackend:
+    name = "sklearn"
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    def prefault(self):
+        if not hasattr(self.model, "estimators_"):
+            self.model.prefault()
+            return
+        # Each tree_ attribute is a view over the unpickled node buffer;
+        # summing it touches every page once.
+        for est in self.model.estimators_:
+            t = est.tree_
+            t.children_left.sum(); t.children_right.sum()
+            t.feature.sum(); t.threshold.sum(); t.value.sum()
+
+
+class CompiledBackend:
+    """Every tree packed into one set of node arrays.
+
+    Leaves point back to themselves (threshold +inf, feature 0), so a batch
+    is scored by ``max_depth`` rounds of gathers over a (rows × trees) node
+    matrix — no Python per tree, no per-call validation.  Inputs are rounded
+    through float32 exactly like sklearn's tree code, so results match
+    ``model.predict`` bit for bit.
+    """
+
+    name = "compiled"
+
+    def __init__(self, model):
+        trees = [est.tree_ for est in model.estimators_]
+        offsets = np.cumsum([0] + [t.node_count for t in trees[:-1]])
+
+        feature, threshold, left, right, value = [], [], [], [], []
+        for off, t in zip(offsets, trees):
+            leaf = t.children_left < 0
+            own = np.arange(t.node_count) + off
+            feature.append(np.where(leaf, 0, t.feature))
+            threshold.append(np.where(leaf, np.inf, t.threshold))
+            left.append(np.where(leaf, own, t.children_left + off))
+            right.append(np.where(leaf, own, t.children_right + off))
+            value.append(t.value[:, 0, 0])
+
+        self.feature   = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.left      = np.concatenate(left).astype(np.intp)
+        self.right     = np.concatenate(right).astype(np.intp)
+        self.value     = np.concatenate(value).astype(np.float64)
+        self.roots     = offsets.astype(np.intp)
+        self.depth     = max(t.max_depth for t in trees)
+
+    def prefault(self):
+        for arr in (self.feature, self.threshold, self.left, self.right, self.value):
+            arr.sum()
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n = X.shape[0]
+        rows = np.arange(n)[:, None]
+        node = np.broadcast_to(self.roots, (n, len(self.roots))).copy()
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        # Accumulate tree by tree, in order, as the forest does
+        leaves = self.value[node]
+        out = np.zeros(n)
+        for t in range(leaves.shape[1]):
+            out += leaves[:, t]
+        out /= leaves.shape[1]
+        return out
+
+
+class LookupBackend:
+    """LRU table of exact feature rows → score, in front of another backend."""
+
+    name = "lookup"
+
+    def __init__(self, inner, maxsize=65536):
+        self.inner = inner
+        self.maxsize = maxsize
+        self.table = OrderedDict()
+        self.hits = self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def last_hit(self):
+        """Whether the calling thread's last batch was served entirely from the table."""
+        return getattr(self._local, "hit", None)
+
+    def prefault(self):
+        self.inner.prefault()
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        out = np.empty(X.shape[0])
+        keys = [row.tobytes() for row in X]
+        todo = []
+        # The table is shared by request threads; the forest call runs unlocked
+        with self._lock:
+            for i, key in enumerate(keys):
+                score = self.table.get(key)
+                if score is None:
+                    todo.append(i)
+                else:
+                    self.table.move_to_end(key)
+                    out[i] = score
+            self.hits += len(keys) - len(todo)
+            self.misses += len(todo)
+        self._local.hit = not todo
+
+        if todo:
+            fresh = self.inner.predict(X[todo])
+            with self._lock:
+                for i, score in zip(todo, fresh):
+                    out[i] = score
+                    self.table[keys[i]] = score
+                while len(self.table) > self.maxsize:
+                    self.table.popitem(last=False)
+        return out
+
+
+class DistilledBackend:
+    """The small student written by distill.py, standing in for the forest.
+
+    Refuses to load if the student was distilled from a different
+    model.pkl than the one being served."""
+
+    name = "distilled"
+
+    def __init__(self, version=None, path=DISTILLED_PATH):
+        with open(path, "rb") as f:
+            artifact = pickle.load(f)
+        if version and artifact["teacher_version"] != version:
+            raise ValueError(f"{os.path.basename(path)} was distilled from model "
+                             f"{artifact['teacher_version']}, not {version} — rerun python distill.py")
+        self.model = artifact["model"]
+        self.report = artifact["report"]
+
+    def prefault(self):
+        self.model.prefault()
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+class PackedBackend:
+    """The forest as a ``packed_forest.PackedForest``.
+
+    Uses model_packed.npz when it was exported from the model being served,
+    otherwise packs the in-memory forest (exact codebook mode)."""
+
+    name = "packed"
+
+    def __init__(self, model, version=None, path=PACKED_PATH):
+        from packed_forest import PackedForest
+
+        packed = PackedForest.load(path) if os.path.exists(path) else None
+        if packed is None or packed.version != str(version):
+            packed = PackedForest.from_model(model, version=version)
+        self.model = packed
+
+    def prefault(self):
+        self.model.prefault()
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+def make_backend(name, model, version=None):
+    # Non-forest artifacts (train_model.py --out-of-core) already predict
+    # with vectorised NumPy; "compiled" has nothing to flatten for them.
+    compiled = CompiledBackend if hasattr(model, "estimators_") else SklearnBackend
+    if name == "sklearn":
+        return SklearnBackend(model)
+    if name == "compiled":
+        return compiled(model)
+    if name == "lookup":
+        return LookupBackend(compiled(model))
+    if name == "packed":
+        return PackedBackend(model, version) if hasattr(model, "estimators_") else SklearnBackend(model)
+    if name == "distilled":
+        return DistilledBackend(version)
+    raise ValueError(f"Unknown backend {name!r} "
+                     "(expected sklearn, compiled, lookup, packed or distilled)")
+
+
+# ----------------------------------------
+# ENGINE
+# ----------------------------------------
+def load_artifact(path=MODEL_PATH):
+    """Unpickle model.pkl.  Artifacts from before train_model.py stamped a
+    ``version`` get the first 12 hex digits of the file's SHA-1 instead."""
+    with open(path, "rb") as f:
+        blob = f.read()
+    payload = pickle.loads(blob)
+    payload.setdefault("version", hashlib.sha1(blob).hexdigest()[:12])
+    return payload
+
+
+class InferenceEngine:
+    """Scores profiles against one trained artifact.
+
+    A profile is a mapping with keys ``degree, exam_type, exam_score,
+    work_exp, cgpa, sop, lor, research, country`` and optional
+    ``internship``, already converted to Python numbers.
+    """
+
+    def __init__(self, payload, backend=None):
+        self.model       = payload["model"]
+        self.country_map = payload["country_map"]
+        self.exam_map    = payload["exam_map"]
+        self.degree_map  = payload["degree_map"]
+        self.version     = payload.get("version", "unversioned")
+        self.backend = make_backend(
+            backend or os.environ.get("ADMISSION_BACKEND", "sklearn"), self.model, self.version
+        )
+        self.warm = False
+        self.timings = {}
+        self.percentiles = None
+        self.similar = None
+        self.curves = None
+        self._batch_backend = None
+        self._recommender = None
+
+    @classmethod
+    def from_pickle(cls, path=MODEL_PATH, backend=None):
+        t0 = time.perf_counter()
+        payload = load_artifact(path)
+        t1 = time.perf_counter()
+        engine = cls(payload, backend=backend)
+        engine.timings["load_ms"] = round((t1 - t0) * 1000, 1)
+        engine.timings["init_ms"] = round((time.perf_counter() - t1) * 1000, 1)
+        engine.load_percentiles()
+        engine.load_similar()
+        engine.load_curves()
+        return engine
+
+    def load_percentiles(self):
+        """Index the historical CSV for ``percentile_ranks``; skipped (None)
+        when the CSV is not deployed next to the model."""
+        from percentile_index import DATA_PATH, PercentileIndex
+
+        if os.path.exists(DATA_PATH):
+            t0 = time.perf_counter()
+            self.percentiles = PercentileIndex.load(DATA_PATH)
+            self.timings["percentiles_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return self.percentiles
+
+    def load_similar(self):
+        """Load similar_applicants.pkl (built by train_model.py) if present."""
+        from similar_applicants import SIMILAR_PATH, load_index
+
+        if os.path.exists(SIMILAR_PATH):
+            t0 = time.perf_counter()
+            self.similar = load_index(SIMILAR_PATH)
+            self.timings["similar_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return self.similar
+
+    def load_curves(self):
+        """Partial-dependence curves saved for this model version at publish
+        (pdp.py); curves missing from the file are computed on first use."""
+        from pdp import CurveStore
+
+        t0 = time.perf_counter()
+        self.curves = CurveStore.load(self.version)
+        self.timings["curves_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return self.curves
+
+    def dependence_curves(self, p, features):
+        """{feature: (grid, pd, ice)} for ``p``'s country and degree."""
+        if self.curves is None or self.curves.version != self.version:
+            self.load_curves()
+        return {f: self.curves.get(self, p["country"], p["degree"], f) for f in features}
+
+    def similar_applicants(self, profiles, k=5):
+        """k nearest past applicants per profile (one batched query);
+        None if the index has not been built."""
+        if self.similar is None:
+            return None
+        return self.similar.query(profiles, k)
+
+    def exam_variants(self, p):
+        """``p`` re-scored with its language-exam score converted to every
+        language exam (concordance.py), for every country — all variants
+        in ONE backend call.  Returns ``(scores, {country: {exam: Prediction}})``,
+        or None for GRE profiles, which have no concordance."""
+        from concordance import CONCORDANCE
+
+        scores = CONCORDANCE.convert(p["exam_type"], p["exam_score"])
+        if scores is None:
+            return None
+        countries = sorted(self.country_map)
+        variants = [dict(p, exam_type=exam, exam_score=score, country=country)
+                    for country in countries for exam, score in scores.items()]
+        results = iter(self.predict_many(variants))
+        return scores, {country: {exam: next(results) for exam in scores} for country in countries}
+
+    def recommender(self):
+        """Every (country, degree, exam) combination of this model (recommend.py)."""
+        if self._recommender is None:
+            from recommend import Recommender
+
+            self._recommender = Recommender(self)
+        return self._recommender
+
+    def recommend(self, profiles, k=5):
+        """Top-k (country, degree, exam) combinations per profile — every
+        combination of every profile scored in ONE backend call."""
+        return self.recommender().recommend(profiles, k)
+
+    def percentile_ranks(self, p, result):
+        """Where ``p`` stands among past applicants to the same country and
+        degree; None if the index is not loaded, the group is empty or
+        ``result`` is an error."""
+        if self.percentiles is None or result.error:
+            return None
+        return self.percentiles.ranks(p, result.prediction / 100)
+
+    def batch_backend(self):
+        """Backend for large offline blocks (curves, bulk recommendations).
+        The exact forest backends agree bit for bit, and sklearn's tree code
+        is the fastest of them from a few hundred rows up."""
+        if self.backend.name in ("compiled", "lookup", "packed"):
+            if self._batch_backend is None:
+                self._batch_backend = SklearnBackend(self.model)
+            return self._batch_backend
+        return self.backend
+
+    def synthetic_profiles(self):
+        """One mid-range profile per (country, exam) — covers every encoding."""
+        degrees = sorted(self.degree_map)
+        profiles = []
+        for i, country in enumerate(sorted(self.country_map)):
+            for exam_type in sorted(self.exam_map):
+                lo, hi = EXAM_LIMITS[exam_type]
+                profiles.append({
+                    "degree": degrees[i % len(degrees)], "exam_type": exam_type,
+                    "exam_score": (lo + hi) / 2, "work_exp": i % 5, "cgpa": 8.0,
+                    "sop": 3.5, "lor": 3.5, "research": i % 2, "country": country,
+                })
+        return profiles
+
+    def warm_up(self):
+        """Pay the first-call costs (page faults on the tree arrays, sklearn's
+        lazy validation paths, joblib pool start-up) before real traffic."""
+        t0 = time.perf_counter()
+        self.backend.prefault()
+        t1 = time.perf_counter()
+        profiles = self.synthetic_profiles()
+        self.predict_many(profiles)
+        t2 = time.perf_counter()
+        self.predict(profiles[0])
+        t3 = time.perf_counter()
+        self.timings["prefault_ms"]   = round((t1 - t0) * 1000, 1)
+        self.timings["warm_batch_ms"] = round((t2 - t1) * 1000, 1)
+        self.timings["warm_single_ms"] = round((t3 - t2) * 1000, 1)
+        self.warm = True
+        return self
+
+    def encode(self, p):
+        row = [
+            self.degree_map[p["degree"]],
+            p["work_exp"], p["cgpa"], p["sop"], p["lor"], p["research"],
+            0, 0, 0, 0, 0,
+            self.exam_map[p["exam_type"]],
+            self.country_map[p["country"]],
+        ]
+        row[EXAM_OFFSET + EXAM_COLUMNS.index(p["exam_type"])] = p["exam_score"]
+        return row
+
+    def predict(self, profile):
+        return self.predict_many([profile])[0]
+
+    def predict_many(self, profiles):
+        """Validate and score a list of profiles with ONE backend call."""
+        results = [None] * len(profiles)
+        rows, idx = [], []
+        for i, p in enumerate(profiles):
+            lo, hi = EXAM_LIMITS[p["exam_type"]]
+            if not (lo <= p["exam_score"] <= hi):
+                results[i] = Prediction(error=invalid_score_error(p["exam_type"]))
+                continue
+            rows.append(self.encode(p))
+            idx.append(i)
+
+        if rows:
+            raw = np.clip(self.backend.predict(rows), 0, 1)
+            for i, r in zip(idx, raw):
+                results[i] = build_prediction(profiles[i], float(r))
+        return results
+
+
+# ----------------------------------------
+# LAZY LOADING + READINESS
+# ----------------------------------------
+class EngineLoader:
+    """Builds the engine off the request path and reports readiness.
+
+    ``start()`` loads model.pkl in a background thread and warms it up
+    before flipping ready.  If the artifact is missing it is only rebuilt
+    when ``build_if_missing`` is set (an explicit opt-in:
+    train_model.build_artifact on all cores, then an atomic save);
+    otherwise the loader stays not-ready with an error telling the operator
+    to run train_model.py.  Nothing here imports pandas or sklearn's
+    training code unless a build actually runs.
+
+    ``reload()`` swaps in a newly published model.pkl (see retrain.py); the
+    old engine keeps serving until the new one is warm.
+    """
+
+    def __init__(self, path=MODEL_PATH, backend=None, build_if_missing=False):
+        self.path = path
+        self.backend = backend
+        self.build_if_missing = build_if_missing
+        self.engine = None
+        self.error = ""
+        self.source = ""
+        self.timings = {}
+        self._ready = threading.Event()
+        self._finished = threading.Event()   # load attempt over, ready or failed
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="engine-loader", daemon=True)
+                self._thread.start()
+        return self
+
+    def get(self, timeout=None):
+        """The engine, waiting up to ``timeout`` seconds for it; None if not
+        ready.  Returns at once when the load has already failed."""
+        self.start()
+        if not self._ready.is_set():
+            self._finished.wait(timeout)
+        return self.engine
+
+    def status(self):
+        engine = self.engine
+        return {
+            "ready":         self.ready,
+            "warm":          bool(engine and engine.warm),
+            "model_version": engine.version if engine else None,
+            "backend":       engine.backend.name if engine else None,
+            "source":        self.source,
+            "error":         self.error,
+            "timings":       dict(self.timings),
+        }
+
+    def reload(self):
+        t0 = time.perf_counter()
+        engine = InferenceEngine.from_pickle(self.path, backend=self.backend).warm_up()
+        self.timings.update(engine.timings)
+        self.timings["reload_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        self.engine = engine
+        self.source = "reloaded"
+        self.error = ""
+        self._ready.set()
+        return engine
+
+    def _load(self):
+        t0 = time.perf_counter()
+        try:
+            if not os.path.exists(self.path):
+                if not self.build_if_missing:
+                    self.error = (f"{os.path.basename(self.path)} not found — run "
+                                  "python train_model.py (or set ADMISSION_AUTO_BUILD=1)")
+                    return
+                from train_model import build_artifact, save_artifact
+                save_artifact(build_artifact(n_jobs=-1), self.path)
+                self.timings["build_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                self.source = "built"
+            else:
+                self.source = "artifact"
+
+            engine = InferenceEngine.from_pickle(self.path, backend=self.backend).warm_up()
+            self.timings.update(engine.timings)
+            self.timings["total_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            self.engine = engine
+            self._ready.set()
+        except Exception as exc:  # surfaced through status(), never raised into requests
+            self.error = f"{type(exc).__name__}: {exc}"
+        finally:
+            self._finished.set()
@@ -0,0 +1,244 @@
+"""
+packed_forest.py
+────────────────
+The forest in one compact node buffer: 5 bytes per node instead of the
+~72 bytes sklearn keeps (64-byte node struct + float64 value).
+
+Usage:
+    python packed_forest.py [--values codebook|float16|uint8]
+
+Output: model_packed.npz  (served with ADMISSION_BACKEND=packed)
+
+Layout — one structured array over every tree, nodes in sklearn's
+depth-first order, so a split's left child is always the next node:
+
+    feature  uint8    split feature; 255 marks a leaf
+    key      uint16   split: index into that feature's threshold table
+                      leaf:  the leaf value (codebook index, float16 bits
+                             or uint8 level, see ``values``)
+    right    int16    right child, relative to this node (int32 if a tree
+                      ever exceeds 32767 nodes)
+
+Thresholds stay exact.  sklearn tests ``float32(x) <= t`` with ``t``
+float64, which for any float32 ``x`` is the same as ``x <= t32`` where
+``t32`` is the largest float32 not above ``t``.  Each feature keeps its
+sorted unique ``t32`` values; a row is turned into per-feature ranks once
+(``searchsorted``), and a split becomes ``rank <= key`` — true for every
+input, not just the valid ranges.
+
+Leaf values: ``codebook`` (default) stores an index into the sorted unique
+leaf values — exact, and tiny here because targets are 2-dp numbers.
+``float16`` and ``uint8`` (value * 255) are lossy, bounded by half a step
+per leaf and therefore per averaged prediction.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from inference import FEATURE_COLUMNS, MODEL_PATH, PACKED_PATH, load_artifact
+
+LEAF = 255
+VALUE_MODES = ("codebook", "float16", "uint8")
+
+
+def _floor32(t):
+    """Largest float32 <= t, elementwise."""
+    t32 = t.astype(np.float32)
+    over = t32.astype(np.float64) > t
+    t32[over] = np.nextafter(t32[over], np.float32(-np.inf))
+    return t32
+
+
+class PackedForest:
+    """Averaging forest over one packed node buffer (see module docstring)."""
+
+    def __init__(self, nodes, roots, depth, tables, codebook, values, version=None):
+        self.nodes = nodes
+        self.roots = roots
+        self.depth = int(depth)
+        self.tables = tables            # per feature: sorted float32 thresholds
+        self.codebook = codebook        # float64 leaf values ("codebook" mode)
+        self.values = values
+        self.version = version
+
+    # ── Building ───────────────────────────────────────────
+    @classmethod
+    def from_model(cls, forest, values="codebook", version=None):
+        if values not in VALUE_MODES:
+            raise ValueError(f"values must be one of {VALUE_MODES}")
+        trees = [est.tree_ for est in forest.estimators_]
+        F = len(FEATURE_COLUMNS)
+
+        tables = []
+        for f in range(F):
+            t = np.concatenate([tr.threshold[tr.feature == f] for tr in trees])
+            tables.append(np.unique(_floor32(t)))
+        if max(len(t) for t in tables) > 65536:
+            raise ValueError("a feature has more than 65536 distinct thresholds")
+
+        leaf_values = np.concatenate([tr.value[tr.children_left < 0, 0, 0] for tr in trees])
+        codebook = np.unique(leaf_values)
+        if values == "codebook" and len(codebook) > 65536:
+            raise ValueError(f"{len(codebook)} distinct leaf values — use float16 or uint8")
+
+        counts = [tr.node_count for tr in trees]
+        right_dtype = "<i2" if max(counts) < 2 ** 15 else "<i4"
+        node_dtype = np.dtype([("feature", "u1"), ("key", "<u2"), ("right", right_dtype)])
+        nodes = np.empty(sum(counts), dtype=node_dtype)
+
+        off = 0
+        for tr in trees:
+            n = tr.node_count
+            leaf = tr.children_left < 0
+            block = nodes[off:off + n]
+            block["feature"] = np.where(leaf, LEAF, tr.feature)
+            key = np.zeros(n, dtype=np.uint16)
+            split = ~leaf
+            key[split] = [np.searchsorted(tables[f], t32)
+                          for f, t32 in zip(tr.feature[split], _floor32(tr.threshold[split]))]
+            v = tr.value[leaf, 0, 0]
+            if values == "codebook":
+                key[leaf] = np.searchsorted(codebook, v)
+            elif values == "float16":
+                key[leaf] = v.astype(np.float16).view(np.uint16)
+            else:
+                key[leaf] = np.rint(np.clip(v, 0, 1) * 255).astype(np.uint16)
+            block["key"] = key
+            block["right"] = np.where(leaf, 0, tr.children_right - np.arange(n))
+            off += n
+
+        roots = np.cumsum([0] + counts[:-1]).astype(np.int64)
+        depth = max(tr.max_depth for tr in trees)
+        return cls(nodes, roots, depth, tables,
+                   codebook if values == "codebook" else np.empty(0), values, version)
+
+    # ── Serving ────────────────────────────────────────────
+    def _leaf_value(self, key):
+        if self.values == "codebook":
+            return self.codebook[key]
+        if self.values == "float16":
+            return key.astype(np.uint16).view(np.float16).astype(np.float64)
+        return key / 255.0
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        n = X.shape[0]
+        ranks = np.empty((n, len(self.tables) + 1), dtype=np.int64)
+        for f, table in enumerate(self.tables):
+            ranks[:, f] = np.searchsorted(table, X[:, f], side="left")
+        ranks[:, -1] = 0  # column for leaves; never decides anything
+
+        # Field views into the one buffer — nothing is unpacked up front
+        feature, key, right = self.nodes["feature"], self.nodes["key"], self.nodes["right"]
+        F = len(self.tables)
+
+        rows = np.arange(n)[:, None]
+        node = np.broadcast_to(self.roots, (n, len(self.roots))).copy()
+        for _ in range(self.depth):
+            f = feature[node]
+            leaf = f == LEAF
+            if leaf.all():
+                break
+            go_left = ranks[rows, np.minimum(f, F)] <= key[node]
+            step = np.where(go_left, node + 1, node + right[node])
+            node = np.where(leaf, node, step)
+
+        # Accumulate tree by tree, in order, as the forest does
+        leaves = self._leaf_value(key[node])
+        out = np.zeros(n)
+        for t in range(leaves.shape[1]):
+            out += leaves[:, t]
+        out /= leaves.shape[1]
+        return out
+
+    def prefault(self):
+        self.nodes.view(np.uint8).sum()
+
+    @property
+    def nbytes(self):
+        return (self.nodes.nbytes + self.roots.nbytes + self.codebook.nbytes
+                + sum(t.nbytes for t in self.tables))
+
+    # ── Persistence ────────────────────────────────────────
+    def save(self, path=PACKED_PATH):
+        offsets = np.cumsum([0] + [len(t) for t in self.tables])
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, nodes=self.nodes, roots=self.roots, depth=self.depth,
+                 tables=np.concatenate(self.tables), table_offsets=offsets,
+                 codebook=self.codebook, values=self.values, version=str(self.version))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=PACKED_PATH):
+        with np.load(path) as z:
+            off = z["table_offsets"]
+            flat = z["tables"]
+            tables = [flat[a:b] for a, b in zip(off[:-1], off[1:])]
+            return cls(z["nodes"], z["roots"], z["depth"], tables, z["codebook"],
+                       str(z["values"]), str(z["version"]))
+
+
+def report(forest, packed, X):
+    """Bytes per tree and the prediction error against sklearn on ``X``."""
+    import pickle
+
+    from inference import CompiledBackend
+
+    T = len(forest.estimators_)
+    nodes = sum(e.tree_.node_count for e in forest.estimators_)
+    compiled = CompiledBackend(forest)
+    compiled_bytes = sum(a.nbytes for a in (compiled.feature, compiled.threshold,
+                                            compiled.left, compiled.right, compiled.value))
+    err = np.abs(packed.predict(X) - forest.predict(X))
+    bound = {"codebook": 0.0, "float16": 2.0 ** -12, "uint8": 0.5 / 255}[packed.values]
+    return {
+        "trees":             T,
+        "nodes_per_tree":    round(nodes / T, 1),
+        "sklearn_pickle":    round(len(pickle.dumps(forest)) / T),
+        "sklearn_arrays":    round(sum(e.tree_.node_count * (64 + 8) for e in forest.estimators_) / T),
+        "compiled_arrays":   round(compiled_bytes / T),
+        "packed":            round(packed.nbytes / T),
+        "max_abs_error_pp":  float(err.max() * 100),
+        "error_bound_pp":    bound * 100,
+    }
+
+
+def main():
+    import warnings
+
+    from distill import real_rows, sample_domain
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--values", choices=VALUE_MODES, default="codebook")
+    ap.add_argument("--samples", type=int, default=100_000)
+    args = ap.parse_args()
+
+    payload = load_artifact(MODEL_PATH)
+    forest = payload["model"]
+    if not hasattr(forest, "estimators_"):
+        sys.exit("model.pkl is not a forest — nothing to pack")
+    packed = PackedForest.from_model(forest, args.values, payload["version"])
+    X = np.vstack([sample_domain(args.samples, payload, np.random.default_rng(0)),
+                   real_rows(payload)])
+    r = report(forest, packed, X)
+
+    print(f"Bytes per tree ({r['trees']} trees, {r['nodes_per_tree']} nodes each)")
+    print(f"  sklearn pickle   {r['sklearn_pickle']:>8,}")
+    print(f"  sklearn arrays   {r['sklearn_arrays']:>8,}")
+    print(f"  compiled arrays  {r['compiled_arrays']:>8,}")
+    print(f"  packed           {r['packed']:>8,}   ({packed.nodes.dtype.itemsize} B/node, "
+          f"values={packed.values})")
+    print(f"Max |error| on {len(X):,} rows: {r['max_abs_error_pp']:.6f} pp "
+          f"(bound {r['error_bound_pp']:.4f} pp)")
+    if r["max_abs_error_pp"] > r["error_bound_pp"] + 1e-9:
+        sys.exit("❌ error above the bound — not saved")
+    packed.save(PACKED_PATH)
+    print(f"\n✅ Saved → {PACKED_PATH}  (ADMISSION_BACKEND=packed)")
+
+
+if __name__ == "__main__":
+    main()
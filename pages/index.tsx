@@ -17,6 +17,8 @@ const DEGREES = ['🎓 Undergraduate', '🎓 Masters', '🎓 PhD']
 const EXAM_INFO: Record<string, string> = {
     IELTS: '0 – 9', TOEFL: '0 – 120', PTE: '10 – 90', DET: '10 – 160', GRE: '260 – 340',
 }
+// Form field behind each non-exam curve feature (an exam curve uses exam_score)
+const CURVE_FIELD: Record<string, string> = { CGPA: 'cgpa', SOP: 'sop', LOR: 'lor' }
 const COLOR: Record<string, string> = {
     Strong: '#10b981', Average: '#f59e0b', Weak: '#ef4444',
 }
@@ -127,6 +129,7 @@ export default function Home() {
                     exam_score: +form.exam_score, work_exp: +form.work_exp,
                     cgpa: +form.cgpa, sop: +form.sop, lor: +form.lor,
                     research: +form.research, internship: form.internship === 'true',
+                    curves: ['CGPA', 'SOP', 'LOR', form.exam_type],
                 }),
             })
             const data = await res.json()
@@ -387,6 +390,19 @@ export default function Home() {
                                 </div>
                             </>
                         )}
+
+                        {result.curves && (
+                            <>
+                                <HR />
+                                <SectionTitle icon="📉">What Moves Your Chance</SectionTitle>
+                                <div style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fit, minmax(200px, 1fr))', gap: 16, marginTop: 12 }}>
+                                    {Object.entries(result.curves).map(([feature, c]: [string, any]) => (
+                                        <CurveChart key={feature} feature={feature} curve={c}
+                                            value={+(form as any)[CURVE_FIELD[feature] ?? 'exam_score']} />
+                                    ))}
+                                </div>
+                            </>
+                        )}
                     </div>
                 )}
 
@@ -642,6 +658,33 @@ function CountrySelect({ value, onChange }: { value: string; onChange: (v: strin
     )
 }
 
+// Partial-dependence curve (bold) over the per-applicant ICE curves (faint)
+function CurveChart({ feature, curve, value }: {
+    feature: string; curve: { grid: number[]; pd: number[]; ice: number[][] }; value: number
+}) {
+    const W = 220, H = 80
+    const lo = curve.grid[0], span = (curve.grid[curve.grid.length - 1] - lo) || 1
+    const x = (g: number) => ((g - lo) / span * W).toFixed(1)
+    const y = (c: number) => ((1 - c / 100) * (H - 12)).toFixed(1)
+    const points = (ys: number[]) => curve.grid.map((g, i) => `${x(g)},${y(ys[i])}`).join(' ')
+    const v = Math.min(Math.max(value, lo), lo + span)
+    const i = curve.grid.reduce((best, g, j) => Math.abs(g - v) < Math.abs(curve.grid[best] - v) ? j : best, 0)
+    return (
+        <div>
+            <div style={{ color: '#d6d3d1', fontSize: '.8rem', marginBottom: 4 }}>{feature} (you: {value})</div>
+            <svg viewBox={`0 0 ${W} ${H}`} style={{ width: '100%', height: 'auto', background: 'rgba(0,0,0,0.25)', borderRadius: 8 }}>
+                {curve.ice.map((row, k) => (
+                    <polyline key={k} points={points(row)} fill="none" stroke="rgba(245, 158, 11, 0.15)" strokeWidth={1} />
+                ))}
+                <polyline points={points(curve.pd)} fill="none" stroke="#fcd34d" strokeWidth={2} />
+                <circle cx={x(v)} cy={y(curve.pd[i])} r={3.5} fill="#10b981" />
+                <text x={4} y={H - 2} fontSize={9} fill="#a8a29e">{lo}</text>
+                <text x={W - 4} y={H - 2} fontSize={9} fill="#a8a29e" textAnchor="end">{lo + span}</text>
+            </svg>
+        </div>
+    )
+}
+
 function HR() {
     return <hr style={{ border: 'none', borderTop: '1px solid rgba(245, 158, 11, 0.1)', margin: '24px 0', boxShadow: '0 1px 0 rgba(0,0,0,0.5)' }} />
 }
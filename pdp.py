@@ -0,0 +1,181 @@
+"""
+pdp.py
+──────
+Partial-dependence and ICE curves of admit chance against CGPA, SOP, LOR
+and each exam score, per (country, degree).
+
+    python pdp.py            # precompute every curve for model.pkl
+
+Output: pdp_curves.pkl  (written by train_model.py / retrain.py on publish)
+
+For one (country, degree, feature) the base profiles are up to
+``ICE_LINES`` past applicants to that country and degree from the CSV
+(the engine's synthetic profiles if there are none).  Every base profile
+is swept over the feature's grid and the whole (lines × grid) block is
+scored in ONE batched forest call; the ICE curves are its rows and the
+partial-dependence curve their mean.  Values are the admit chance users
+see (0–100, after the low-exam-score penalty), stored as float32.
+
+An exam feature (IELTS, TOEFL, ...) also switches the base profiles to
+that exam, since a profile has exactly one exam score.
+
+``CurveStore`` keys everything by model version: a store loaded from a
+file written for another model starts empty, and missing curves are
+computed on first request and kept, so charts are lookups either way.
+"""
+
+import csv
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+
+from inference import (
+    BASE_DIR, EXAM_COLUMNS, EXAM_LIMITS, EXAM_OFFSET, FEATURE_COLUMNS, MODEL_PATH, exam_penalties,
+)
+
+CURVES_PATH = os.path.join(BASE_DIR, "pdp_curves.pkl")
+DATA_PATH = os.path.join(BASE_DIR, "Admission_Predict_Final_With_Degree.csv")
+
+ICE_LINES = 30
+ICE_DRAWN = 8   # lines a chart shows / the API returns; the PD curve uses all ICE_LINES
+
+GRIDS = {
+    "CGPA": np.round(np.arange(6.0, 10.001, 0.1), 2),
+    "SOP":  np.arange(1.0, 5.001, 0.25),
+    "LOR":  np.arange(1.0, 5.001, 0.25),
+    "IELTS": np.arange(0.0, 9.001, 0.25),
+    "TOEFL": np.arange(0.0, 120.001, 4.0),
+    "PTE":   np.arange(10.0, 90.001, 2.0),
+    "DET":   np.arange(10.0, 160.001, 5.0),
+    "GRE":   np.arange(260.0, 340.001, 2.0),
+}
+FEATURES = list(GRIDS)
+
+
+def _history(path=DATA_PATH):
+    """Past applicants as engine profiles, grouped by (country, degree)."""
+    groups = {}
+    if not os.path.exists(path):
+        return groups
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            row = {k.strip(): v.strip() for k, v in row.items()}
+            exam = row["Exam_Type"]
+            groups.setdefault((row["Country_Aiming"], row["Degree_Level"]), []).append({
+                "degree": row["Degree_Level"], "exam_type": exam,
+                "exam_score": float(row[exam] or 0),
+                "work_exp": int(float(row["Work_Experience_Years"])),
+                "cgpa": float(row["CGPA"]), "sop": float(row["SOP"]), "lor": float(row["LOR"]),
+                "research": int(float(row["Research"])), "country": row["Country_Aiming"],
+            })
+    return groups
+
+
+def drawn_ice(ice, n=ICE_DRAWN):
+    """At most ``n`` evenly spaced rows of an ICE block."""
+    if len(ice) <= n:
+        return ice
+    return ice[np.linspace(0, len(ice) - 1, n).astype(int)]
+
+
+class CurveStore:
+    """(country, degree, feature) → (grid, pd, ice) for one model version."""
+
+    def __init__(self, version, curves=None, lines=ICE_LINES):
+        self.version = version
+        self.curves = curves or {}
+        self.lines = lines
+        self._history = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, version, path=CURVES_PATH):
+        """The saved store if it was computed for ``version``, else an empty one."""
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+            if saved["version"] == version:
+                return cls(version, saved["curves"], saved["lines"])
+        return cls(version)
+
+    def save(self, path=CURVES_PATH):
+        from train_model import save_artifact
+
+        save_artifact({"version": self.version, "lines": self.lines, "curves": self.curves}, path)
+
+    # ── Computing ──────────────────────────────────────────
+    def _base(self, engine, country, degree):
+        if self._history is None:
+            self._history = _history()
+        rows = self._history.get((country, degree))
+        if not rows:
+            rows = [dict(p, country=country, degree=degree) for p in engine.synthetic_profiles()]
+        if len(rows) > self.lines:
+            pick = np.random.default_rng(0).choice(len(rows), self.lines, replace=False)
+            rows = [rows[i] for i in sorted(pick)]
+        return rows
+
+    def compute(self, engine, country, degree, feature):
+        grid = GRIDS[feature]
+        base = self._base(engine, country, degree)
+        X = np.array([engine.encode(p) for p in base], dtype=float)
+        col = FEATURE_COLUMNS.index(feature)
+        if feature in EXAM_LIMITS:
+            X[:, EXAM_OFFSET:EXAM_OFFSET + len(EXAM_COLUMNS)] = 0
+            X[:, FEATURE_COLUMNS.index("Exam_Encoded")] = engine.exam_map[feature]
+        # (lines × grid) block: row i*G + j is base profile i at grid value j
+        block = np.repeat(X, len(grid), axis=0)
+        block[:, col] = np.tile(grid, len(base))
+
+        raw = np.clip(engine.batch_backend().predict(block), 0, 1)
+        if feature in EXAM_LIMITS:
+            exams, scores = [feature] * len(block), block[:, col]
+        else:
+            exams = [p["exam_type"] for p in base for _ in grid]
+            scores = np.repeat([p["exam_score"] for p in base], len(grid))
+        chance = np.maximum(0.0, raw * 100 - exam_penalties(exams, scores))
+        ice = chance.reshape(len(base), len(grid)).astype(np.float32)
+        return grid.astype(np.float32), ice.mean(axis=0), ice
+
+    def get(self, engine, country, degree, feature):
+        key = (country, degree, feature)
+        curve = self.curves.get(key)
+        if curve is None:
+            curve = self.compute(engine, country, degree, feature)
+            with self._lock:
+                self.curves[key] = curve
+        return curve
+
+    def precompute(self, engine):
+        for country in sorted(engine.country_map):
+            for degree in sorted(engine.degree_map):
+                for feature in FEATURES:
+                    self.get(engine, country, degree, feature)
+        return self
+
+
+def publish(engine, path=CURVES_PATH):
+    """Precompute every curve for ``engine``'s model and save them."""
+    store = CurveStore(engine.version).precompute(engine)
+    store.save(path)
+    return store
+
+
+def main():
+    import warnings
+
+    from inference import InferenceEngine
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    engine = InferenceEngine.from_pickle(MODEL_PATH)
+    t0 = time.perf_counter()
+    store = publish(engine)
+    print(f"✅ {len(store.curves)} curves for model {engine.version} in "
+          f"{time.perf_counter() - t0:.1f}s → {CURVES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
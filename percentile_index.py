@@ -0,0 +1,167 @@
+"""
+percentile_index.py
+───────────────────
+Where does a profile stand among past applicants to the same country and
+degree?  The index keeps, per (country, degree) group, one sorted NumPy
+array per field — CGPA, each exam score and Chance_of_Admit — built once
+from Admission_Predict_Final_With_Degree.csv when the model loads.  A
+percentile rank is then two binary searches (``np.searchsorted``), O(log n),
+instead of a DataFrame scan per request.
+
+Exam columns hold 0 for applicants who did not sit that exam, so exam
+arrays only contain the non-zero scores.  The synthetic UAE rows that
+train_model.py injects are not historical applicants and are not indexed.
+
+The CSV is treated as append-only: ``refresh()`` parses only the bytes
+added since the last read and merges them into the affected groups.  If
+the file shrank, was rewritten without growing, or its already-indexed
+tail changed, it rebuilds from scratch.
+"""
+
+import csv
+import io
+import os
+import threading
+import time
+
+import numpy as np
+
+from inference import EXAM_COLUMNS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "Admission_Predict_Final_With_Degree.csv")
+
+FIELDS = ["CGPA", *EXAM_COLUMNS, "Chance_of_Admit"]
+
+_TAIL_BYTES = 256
+
+
+def percentile_rank(arr, value):
+    """Share of ``arr`` below ``value`` (ties count half), as 0–100."""
+    n = arr.shape[0]
+    if not n:
+        return None
+    lo = np.searchsorted(arr, value, side="left")
+    hi = np.searchsorted(arr, value, side="right")
+    return round((lo + hi) * 50.0 / n, 1)
+
+
+class PercentileIndex:
+    """Sorted per-(country, degree) arrays over the historical CSV."""
+
+    def __init__(self, path=DATA_PATH, min_interval=1.0):
+        self.path = path
+        self.min_interval = min_interval
+        self.groups = {}
+        self.rows = 0
+        self._offset = 0
+        self._mtime = None
+        self._tail = b""
+        self._columns = None
+        self._pending = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=DATA_PATH, **kwargs):
+        index = cls(path, **kwargs)
+        index.refresh(force=True)
+        return index
+
+    # ── Building ───────────────────────────────────────────
+    def _reset(self):
+        self._pending = {}  # rebuilt off to the side, swapped in when complete
+        self.rows = 0
+        self._offset = 0
+        self._tail = b""
+        self._columns = None
+
+    def _parse(self, blob):
+        lines = io.StringIO(blob.decode("utf-8"))
+        reader = csv.reader(lines)
+        if self._columns is None:
+            header = [c.strip() for c in next(reader)]
+            self._columns = {c: header.index(c)
+                             for c in ("Country_Aiming", "Degree_Level", *FIELDS)}
+        cols = self._columns
+        batch = {}
+        for rec in reader:
+            if not rec:
+                continue
+            key = (rec[cols["Country_Aiming"]].strip(), rec[cols["Degree_Level"]].strip())
+            bucket = batch.setdefault(key, {f: [] for f in FIELDS})
+            for f in FIELDS:
+                v = float(rec[cols[f]] or 0)
+                if f in EXAM_COLUMNS and v <= 0:
+                    continue
+                bucket[f].append(v)
+            self.rows += 1
+        return batch
+
+    def _merge(self, groups, batch):
+        for key, bucket in batch.items():
+            group = groups.setdefault(key, {f: np.empty(0) for f in FIELDS})
+            for f, values in bucket.items():
+                if not values:
+                    continue
+                new = np.sort(np.asarray(values, dtype=np.float64))
+                old = group[f]
+                # Linear merge of two sorted runs; the old array is never
+                # mutated, so concurrent readers see either version whole.
+                group[f] = np.insert(old, np.searchsorted(old, new), new)
+            group["n"] = group.get("n", 0) + len(bucket["Chance_of_Admit"])
+
+    def refresh(self, force=False):
+        """Index rows appended since the last call; return how many were added.
+
+        Cheap when nothing changed: one ``os.stat``, at most once per
+        ``min_interval`` seconds unless ``force``."""
+        now = time.monotonic()
+        if not force and now - self._checked < self.min_interval:
+            return 0
+        with self._lock:
+            self._checked = now
+            st = os.stat(self.path)
+            size = st.st_size
+            if st.st_mtime_ns == self._mtime:
+                return 0
+            self._mtime = st.st_mtime_ns
+            with open(self.path, "rb") as f:
+                if self._offset:
+                    f.seek(self._offset - len(self._tail))
+                    if size <= self._offset or f.read(len(self._tail)) != self._tail:
+                        self._reset()
+                        f.seek(0)
+                blob = f.read(size - self._offset)
+            end = blob.rfind(b"\n") + 1  # leave a half-written last line for later
+            before = self.rows
+            groups = self.groups if self._pending is None else self._pending
+            if end:
+                self._merge(groups, self._parse(blob[:end]))
+                self._offset += end
+                self._tail = (self._tail + blob[:end])[-_TAIL_BYTES:]
+            if self._pending is not None:
+                self.groups, self._pending = self._pending, None
+                return self.rows
+            return self.rows - before
+
+    # ── Queries ────────────────────────────────────────────
+    def rank(self, country, degree, field, value):
+        group = self.groups.get((country, degree))
+        if group is None:
+            return None
+        return percentile_rank(group[field], value)
+
+    def ranks(self, p, chance):
+        """Percentiles of a profile's CGPA, exam score and predicted ``chance``
+        (0–1) within its (country, degree) group, or None if the group is empty."""
+        self.refresh()
+        group = self.groups.get((p["country"], p["degree"]))
+        if group is None:
+            return None
+        return {
+            "n":               group["n"],
+            "CGPA":            percentile_rank(group["CGPA"], p["cgpa"]),
+            p["exam_type"]:    percentile_rank(group[p["exam_type"]], p["exam_score"]),
+            "Chance_of_Admit": percentile_rank(group["Chance_of_Admit"], chance),
+        }
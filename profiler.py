@@ -0,0 +1,193 @@
+"""
+profiler.py
+───────────
+Opt-in sampling profiler for the predict hot path.
+
+    ADMISSION_PROFILE=0.05 python start_api.py      # profile 5% of requests
+
+A profiled request registers its thread with one shared sampler thread,
+which every ``ADMISSION_PROFILE_INTERVAL_MS`` reads the stacks of the
+registered threads from ``sys._current_frames()``.  Nothing is traced per
+call, so unprofiled requests pay only a ``random()`` and profiled ones
+a few µs per sample.  Python hands the sampler the GIL at most every
+switch interval (5 ms) while a request runs pure-Python code; time spent
+in NumPy / sklearn C loops that release the GIL is sampled at the full
+rate.
+
+Samples are aggregated per front end and written to
+``ADMISSION_PROFILE_DIR`` by a writer thread, at most once a second —
+``flush()`` on the request path only wakes it:
+
+    <name>.collapsed   "frame;frame;frame count" lines — feed to
+                       flamegraph.pl or speedscope as-is
+    <name>.top.txt     top-N functions by self and by inclusive samples
+
+Setting ``ADMISSION_PROFILE_TOKEN`` also lets a single API request opt in
+with the header ``X-Admission-Profile: <token>``.  The Gradio app
+(``predict_admission`` / ``predict_admission_batch``) profiles by fraction
+only — queued clicks carry no admin header.
+"""
+
+import atexit
+import hmac
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILE_FRACTION = float(os.environ.get("ADMISSION_PROFILE", 0) or 0)
+PROFILE_TOKEN    = os.environ.get("ADMISSION_PROFILE_TOKEN", "")
+PROFILE_DIR      = os.environ.get("ADMISSION_PROFILE_DIR",
+                                  os.path.join(tempfile.gettempdir(), "admission-profiles"))
+INTERVAL_MS      = float(os.environ.get("ADMISSION_PROFILE_INTERVAL_MS", 1))
+TOP_N            = int(os.environ.get("ADMISSION_PROFILE_TOP", 25))
+
+HEADER = "X-Admission-Profile"
+FLUSH_EVERY = 1.0   # seconds between file writes
+
+
+def _frame_name(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}"
+
+
+class SamplingProfiler:
+    """Aggregates sampled stacks of opted-in requests for one front end."""
+
+    def __init__(self, name, fraction=PROFILE_FRACTION, token=PROFILE_TOKEN,
+                 out_dir=PROFILE_DIR, interval_ms=INTERVAL_MS, top_n=TOP_N):
+        self.name = name
+        self.fraction = fraction
+        self.token = token
+        self.out_dir = out_dir
+        self.interval = interval_ms / 1000
+        self.top_n = top_n
+        self.stacks = Counter()
+        self.requests = 0
+        self._active = {}            # thread id -> Counter of that request's stacks
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._dirty = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self):
+        return self.fraction > 0 or bool(self.token)
+
+    def wants(self, header=None):
+        """Decide whether this request is profiled."""
+        if header and self.token and hmac.compare_digest(header, self.token):
+            return True
+        return self.fraction > 0 and random.random() < self.fraction
+
+    # ── Request path ───────────────────────────────────────
+    @contextmanager
+    def sample(self, header=None):
+        """Profile the enclosed block if this request is picked."""
+        if not self.enabled or not self.wants(header):
+            yield
+            return
+        tid = threading.get_ident()
+        with self._lock:
+            self._active[tid] = Counter()
+            self._start()
+        self._wake.set()
+        try:
+            yield
+        finally:
+            with self._lock:
+                stacks = self._active.pop(tid)
+                if not self._active:
+                    self._wake.clear()
+                self.stacks.update(stacks)
+                self.requests += 1
+
+    def flush(self, force=False):
+        """Hand the aggregate files to the writer thread; never blocks on
+        disk.  ``force`` writes them now and returns their base path."""
+        if force:
+            return self._write_files()
+        if self.stacks:
+            self._dirty.set()
+        return None
+
+    def _write_files(self):
+        with self._lock:
+            if not self.stacks:
+                return None
+            stacks = Counter(self.stacks)
+            requests = self.requests
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, self.name)
+        self._write(base + ".collapsed",
+                    "".join(f"{stack} {n}\n" for stack, n in stacks.most_common()))
+        self._write(base + ".top.txt", self.top_table(stacks, requests))
+        return base
+
+    # ── Sampler and writer threads ─────────────────────────
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"profiler-{self.name}",
+                                            daemon=True)
+            self._thread.start()
+            threading.Thread(target=self._writer, name=f"profiler-{self.name}-writer",
+                             daemon=True).start()
+            atexit.register(self.flush, force=True)
+
+    def _writer(self):
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            try:
+                self._write_files()
+            except OSError:
+                pass  # a full or read-only disk must not kill the writer; retried next flush
+            time.sleep(FLUSH_EVERY)
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            self._wake.wait()
+            frames = sys._current_frames()
+            with self._lock:
+                for tid, counter in self._active.items():
+                    frame = frames.get(tid)
+                    if frame is None or tid == own:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(_frame_name(frame.f_code))
+                        frame = frame.f_back
+                    counter[";".join(reversed(stack))] += 1
+            del frames
+            time.sleep(self.interval)
+
+    # ── Output ─────────────────────────────────────────────
+    def top_table(self, stacks, requests):
+        own, total = Counter(), Counter()
+        for stack, n in stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += n
+            for frame in set(frames):
+                total[frame] += n
+        samples = sum(stacks.values())
+        ms = self.interval * 1000
+        lines = [f"{self.name}: {requests} profiled requests, {samples} samples "
+                 f"(~{ms:g} ms each)", ""]
+        for title, counts in (("self", own), ("inclusive", total)):
+            lines.append(f"Top {self.top_n} by {title} samples")
+            lines.append(f"{'samples':>8}  {'%':>6}  function")
+            for frame, n in counts.most_common(self.top_n):
+                lines.append(f"{n:8d}  {100 * n / samples:6.1f}  {frame}")
+            lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _write(path, text):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
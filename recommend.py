@@ -0,0 +1,217 @@
+"""
+recommend.py
+────────────
+Top-k (country, degree, exam) combinations for an applicant, out of every
+country × degree level × exam type the model knows (13 × 3 × 5 = 195).
+
+    python recommend.py [--data applicants.csv] [--k 5] [--out recs.jsonl]
+
+A profile is scored under each combination with its own CGPA, SOP, LOR,
+research and experience.  The exam score for each exam type comes from:
+
+  • ``exam_scores`` on the profile ({exam: score}) — scores the applicant
+    has or plans to sit; a score outside an exam's range is ignored
+  • otherwise the language-exam concordance of the applicant's own score
+    (concordance.py), and the GRE only if that is the applicant's exam
+
+An exam with no score is not recommended (a profile says nothing about a
+GRE it never sat), so a language-exam profile has 156 candidates and a
+GRE-only one 39, unless ``exam_scores`` fills the gaps.
+
+The candidate block is built from the encoding maps as one array — each
+profile's encoded row repeated per combination, with the degree, exam and
+country columns overwritten — and scored in ONE forest call for any number
+of profiles.  The low-exam-score penalty, country–exam fit and the ranking
+are array operations over the same block.  The CLI streams a CSV in chunks
+of ``--chunk`` applicants and writes one JSON line per applicant.
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from inference import (
+    BASE_DIR, EXAM_COLUMNS, EXAM_LIMITS, EXAM_OFFSET, FEATURE_COLUMNS, LANGUAGE_EXAMS,
+    MODEL_PATH, exam_fit, exam_penalties, verdict_for,
+)
+
+DATA_PATH = os.path.join(BASE_DIR, "Admission_Predict_Final_With_Degree.csv")
+
+CHUNK = 1024
+
+_DEGREE_COL  = FEATURE_COLUMNS.index("Degree_Encoded")
+_EXAM_COL    = FEATURE_COLUMNS.index("Exam_Encoded")
+_COUNTRY_COL = FEATURE_COLUMNS.index("Country_Encoded")
+_BASE_COLS   = ["Work_Experience_Years", "CGPA", "SOP", "LOR", "Research"]
+
+
+def profile_scores(p):
+    """{exam: score} for every exam ``p`` can be scored under."""
+    from concordance import CONCORDANCE
+
+    scores = CONCORDANCE.convert(p["exam_type"], p["exam_score"]) or {p["exam_type"]: p["exam_score"]}
+    scores.update(p.get("exam_scores") or {})
+    return scores
+
+
+class Recommender:
+    """Every (country, degree, exam) combination of one engine's encoding
+    maps, as parallel arrays, plus the vectorised scoring over them."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.countries = sorted(engine.country_map)
+        self.degrees   = sorted(engine.degree_map)
+        self.exams     = [e for e in EXAM_COLUMNS if e in engine.exam_map]
+        grid = np.array([(c, d, e) for c in range(len(self.countries))
+                         for d in range(len(self.degrees)) for e in range(len(self.exams))])
+        self.country_idx, self.degree_idx, self.exam_idx = grid.T
+        # Codes and positions the candidate rows need, one entry per combination
+        self.country_code = np.array([engine.country_map[c] for c in self.countries])[self.country_idx]
+        self.degree_code  = np.array([engine.degree_map[d] for d in self.degrees])[self.degree_idx]
+        self.exam_code    = np.array([engine.exam_map[e] for e in self.exams])[self.exam_idx]
+        self.exam_column  = EXAM_OFFSET + np.array([EXAM_COLUMNS.index(e) for e in self.exams])[self.exam_idx]
+        self.exam_type    = np.array([EXAM_COLUMNS.index(e) for e in self.exams])[self.exam_idx]
+        self.fit = np.array([exam_fit(self.exams[e], self.countries[c])
+                             for c, e in zip(self.country_idx, self.exam_idx)])
+
+    def __len__(self):
+        return len(self.exam_idx)
+
+    def score(self, base, scores, backend=None):
+        """Admit chance (0–100) for every profile × combination.
+
+        ``base`` is (n, features) encoded rows — only the non-categorical,
+        non-exam columns are read — and ``scores`` is (n, exams) exam scores
+        in ``self.exams`` order, NaN where the profile has none.  Returns an
+        (n, combinations) array with NaN for combinations without a score.
+        """
+        n, c = len(base), len(self)
+        # Validity is checked before widening: out-of-range scores are dropped
+        lo = np.array([EXAM_LIMITS[e][0] for e in self.exams])
+        hi = np.array([EXAM_LIMITS[e][1] for e in self.exams])
+        scores = np.where((scores >= lo) & (scores <= hi), scores, np.nan)
+
+        cand_scores = scores[:, self.exam_idx]                 # (n, c)
+        valid = ~np.isnan(cand_scores)
+        X = np.repeat(np.asarray(base, dtype=float), c, axis=0)
+        X[:, EXAM_OFFSET:EXAM_OFFSET + len(EXAM_COLUMNS)] = 0
+        X[:, _DEGREE_COL]  = np.tile(self.degree_code, n)
+        X[:, _EXAM_COL]    = np.tile(self.exam_code, n)
+        X[:, _COUNTRY_COL] = np.tile(self.country_code, n)
+        X[np.arange(n * c), np.tile(self.exam_column, n)] = cand_scores.ravel()
+
+        keep = valid.ravel()
+        raw = np.clip((backend or self.engine.backend).predict(X[keep]), 0, 1)
+        penalty = exam_penalties(np.tile(self.exam_type, n)[keep], cand_scores.ravel()[keep])
+        chance = np.full(n * c, np.nan)
+        chance[keep] = np.maximum(0.0, raw * 100 - penalty)
+        return chance.reshape(n, c), cand_scores
+
+    def top_k(self, chance, cand_scores, k):
+        """Best ``k`` combinations per row of ``score``'s output, as dicts."""
+        order = np.argsort(np.where(np.isnan(chance), np.inf, -chance), axis=1, kind="stable")[:, :max(k, 0)]
+        out = []
+        for i, row in enumerate(order):
+            recs = []
+            for j in row:
+                if np.isnan(chance[i, j]):
+                    break
+                pred = round(float(chance[i, j]), 2)
+                recs.append({
+                    "country":    self.countries[self.country_idx[j]],
+                    "degree":     self.degrees[self.degree_idx[j]],
+                    "exam_type":  self.exams[self.exam_idx[j]],
+                    "exam_score": float(cand_scores[i, j]),
+                    "prediction": pred,
+                    "verdict":    verdict_for(pred)[0],
+                    "fit":        str(self.fit[j]),
+                })
+            out.append(recs)
+        return out
+
+    def recommend(self, profiles, k=5, backend=None):
+        """Top-k combinations for each profile dict, all scored in one call."""
+        base = np.array([self.engine.encode(p) for p in profiles], dtype=float)
+        scores = np.full((len(profiles), len(self.exams)), np.nan)
+        for i, p in enumerate(profiles):
+            for exam, score in profile_scores(p).items():
+                if exam in self.exams:
+                    scores[i, self.exams.index(exam)] = score
+        return self.top_k(*self.score(base, scores, backend), k)
+
+
+# ----------------------------------------
+# BULK (CSV)
+# ----------------------------------------
+def _frame_arrays(df, exams):
+    """Encoded base rows and (n, exams) scores for a chunk of the CSV —
+    ``profile_scores`` over whole columns."""
+    from concordance import CONCORDANCE
+
+    base = np.zeros((len(df), len(FEATURE_COLUMNS)))
+    for col in _BASE_COLS:
+        base[:, FEATURE_COLUMNS.index(col)] = df[col].to_numpy(dtype=float)
+    exam_type = df["Exam_Type"].to_numpy()
+    scores = np.full((len(df), len(exams)), np.nan)
+    for src in np.unique(exam_type):
+        rows = np.flatnonzero(exam_type == src)
+        own = df[src].to_numpy(dtype=float)[rows]
+        if src in LANGUAGE_EXAMS:
+            converted = CONCORDANCE.convert_many(src, own)
+            for j, dst in enumerate(CONCORDANCE.exams):
+                if dst in exams:
+                    scores[rows, exams.index(dst)] = converted[:, j]
+        elif src in exams:
+            scores[rows, exams.index(src)] = own
+    return base, scores
+
+
+def recommend_csv(engine, path=DATA_PATH, k=5, chunk=CHUNK, out=sys.stdout):
+    """Stream ``path`` in chunks; one JSON line of recommendations per row.
+    Returns (rows, seconds)."""
+    import pandas as pd
+
+    rec = engine.recommender()
+    backend = engine.batch_backend()
+    rows, t0 = 0, time.perf_counter()
+    for df in pd.read_csv(path, chunksize=chunk, skipinitialspace=True):
+        df.columns = df.columns.str.strip()
+        df[EXAM_COLUMNS] = df[EXAM_COLUMNS].fillna(0)
+        base, scores = _frame_arrays(df, rec.exams)
+        for recs in rec.top_k(*rec.score(base, scores, backend), k):
+            out.write(json.dumps(recs) + "\n")
+        rows += len(df)
+    return rows, time.perf_counter() - t0
+
+
+def main():
+    import argparse
+    import warnings
+
+    from inference import InferenceEngine
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_PATH)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--chunk", type=int, default=CHUNK, help="applicants per forest call")
+    ap.add_argument("--out", help="JSON-lines output (default: stdout)")
+    args = ap.parse_args()
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    engine = InferenceEngine.from_pickle(MODEL_PATH)
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        rows, secs = recommend_csv(engine, args.data, args.k, args.chunk, out)
+    finally:
+        if args.out:
+            out.close()
+    print(f"✅ top-{args.k} of {len(engine.recommender())} combinations for {rows} applicants "
+          f"in {secs:.2f}s ({rows / secs:,.0f}/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+result_card.py
+──────────────
+Precompiled HTML for the Gradio result card rendered by app.predict_admission.
+
+Every template is split ONCE at import time into static segments plus named
+slots, so a render only fills the slots and does a single "".join().
+Fragments that depend on a small closed set of inputs (country, verdict,
+exam type, scorecard values coming from stepped sliders, tip combinations)
+are cached and reused across clicks.
+"""
+
+from functools import lru_cache
+from string import Formatter
+
+import numpy as np
+
+from inference import EXAM_LIMITS, SCORECARD, VERDICTS
+from pdp import drawn_ice
+
+# ISO codes for flagcdn.com — renders real flag images on any OS
+COUNTRY_ISO = {
+    "Australia": "au", "Canada": "ca", "France": "fr", "Germany": "de",
+    "Ireland": "ie", "Netherlands": "nl", "New Zealand": "nz", "Singapore": "sg",
+    "Sweden": "se", "Switzerland": "ch", "UAE": "ae", "UK": "gb", "USA": "us",
+}
+
+# ── Tip / fit-warning copy, keyed like inference.TIP_KEYS / exam_fit() ──
+TIPS_HTML = {
+    "low_cgpa":       ("📊 <b>CGPA below 7.0</b> — Address this gap directly in your SOP; "
+                       "highlight upward trends or strong final-year grades."),
+    "weak_sop":       ("📄 <b>Weak SOP</b> — A compelling SOP can compensate for other gaps. "
+                       "Focus on your 'why this program' and specific research/career goals."),
+    "weak_lor":       ("📋 <b>Weak LOR</b> — Request LORs from professors or managers who "
+                       "know your work well, not just senior titles."),
+    "no_research":    ("🔬 <b>No research experience</b> — Even a short research assistantship "
+                       "or published paper significantly boosts Masters admits at top schools."),
+    "no_experience":  ("💼 <b>No work/internship experience</b> — Even short internships, "
+                       "projects, or co-ops significantly strengthen professional Masters applications."),
+    "internship":     ("💼 <b>Good — internship/project counted</b>. Full-time experience further "
+                       "strengthens your application for competitive programs."),
+    "strong_profile": ("✨ <b>Strong overall profile</b> — Consider applying to reach schools "
+                       "in your target country; your profile can handle competitive programs."),
+}
+
+FIT_GRE_IN_EU = (
+    "⚠️ <b>Heads up:</b> Most <b>EU universities</b> (France, Germany, Netherlands, "
+    "Sweden, Switzerland) do <b>not require GRE</b>. "
+    "Consider adding an IELTS or TOEFL score for language proficiency."
+)
+
+
+def gre_tip(country):
+    return (
+        f"💡 <b>Tip:</b> Many top programs in <b>{country}</b> for Masters "
+        f"expect a <b>GRE score</b> alongside a language test. "
+        f"Check if your target programs require GRE."
+    )
+
+
+# ----------------------------------------
+# TEMPLATE COMPILER
+# ----------------------------------------
+class CardTemplate:
+    """A template compiled into static segments and ``{name}`` slots."""
+
+    __slots__ = ("_parts", "_slots")
+
+    def __init__(self, source):
+        parts, slots = [], []
+        for literal, field, _, _ in Formatter().parse(source):
+            if literal:
+                parts.append(literal)
+            if field is not None:
+                slots.append((len(parts), field))
+                parts.append("")
+        self._parts = parts
+        self._slots = tuple(slots)
+
+    def render(self, values):
+        out = self._parts.copy()
+        for i, name in self._slots:
+            out[i] = values[name]
+        return "".join(out)
+
+
+# ----------------------------------------
+# STATIC FRAGMENTS
+# ----------------------------------------
+HR = "<hr style='border:none;border-top:1px solid rgba(139,92,246,.2);margin:14px 0'>"
+SEC = ("<div style='color:#fcd34d;font-weight:700;font-size:0.8rem;"
+       "letter-spacing:.06em;text-transform:uppercase;margin-bottom:6px'>")
+
+VERDICT_EMOJI = {
+    "Strong Admit":    "🎉",
+    "Moderate Chance": "🎯",
+    "Low Chance":      "📉",
+}
+
+RATING_COLORS = {"Strong": "#22c55e", "Average": "#f59e0b", "Weak": "#ef4444"}
+
+_ERROR = CardTemplate(
+    "<div style='padding:18px;border-radius:14px;"
+    "background:rgba(220,38,38,.15);border:1px solid rgba(220,38,38,.4);"
+    "color:#fca5a5;font-size:1rem;text-align:center'>"
+    "❌ <strong>Invalid score for {exam_type}.</strong><br>"
+    "Allowed range: {lo} – {hi}</div>"
+)
+
+_NOTICE = CardTemplate(
+    "<div style='padding:18px;border-radius:14px;"
+    "background:rgba(251,191,36,.08);border:1px solid rgba(251,191,36,.3);"
+    "color:#fde68a;font-size:1rem;text-align:center'>{message}</div>"
+)
+
+_FLAG = CardTemplate(
+    "<img src='https://flagcdn.com/20x15/{iso}.png' "
+    "style='height:{h}px;border-radius:2px;"
+    "vertical-align:middle;margin-right:4px;object-fit:cover'>"
+)
+
+_CHIP = CardTemplate(
+    "<span style='display:inline-block;margin:3px 4px;"
+    "padding:4px 13px;border-radius:999px;"
+    "background:rgba(245, 158, 11,.10);"
+    "border:1px solid rgba(245, 158, 11,.3);"
+    "color:#fcd34d;font-size:0.8rem;font-weight:600'>"
+    "{flag}{country}</span>"
+)
+
+_SCORE_BAR = CardTemplate(
+    "<div style='margin:7px 0'>"
+    "<div style='display:flex;justify-content:space-between;"
+    "font-size:0.82rem;color:#d6d3d1;margin-bottom:3px'>"
+    "<span>{icon} {label}</span>"
+    "<span style='color:{color};font-weight:700'>{val}{unit} — {tag}</span></div>"
+    "<div style='background:rgba(255,255,255,.08);border-radius:999px;height:6px'>"
+    "<div style='width:{pct}%;height:100%;background:{color};"
+    "border-radius:999px'></div></div></div>"
+)
+
+_RESEARCH = {
+    bool(flag): (
+        "<div style='margin:7px 0;display:flex;justify-content:space-between;"
+        "font-size:0.82rem;color:#d6d3d1'>"
+        "<span>🔬 Research Experience</span>"
+        f"<span style='color:{'#22c55e' if flag else '#ef4444'};font-weight:700'>"
+        f"{'Yes — Strong' if flag else 'No — Weak'}</span></div>"
+    )
+    for flag in (0, 1)
+}
+
+_FIT = CardTemplate(
+    HR +
+    "<div style='background:rgba(251,191,36,.08);"
+    "border:1px solid rgba(251,191,36,.3);"
+    "border-radius:10px;padding:10px 14px;"
+    "font-size:0.85rem;color:#fde68a'>{warning}</div>"
+)
+
+_CURVES_OPEN = (
+    HR + SEC + "📉 What Moves Your Chance</div>"
+    "<div style='display:flex;flex-wrap:wrap;gap:10px'>"
+)
+
+_CURVE = CardTemplate(
+    "<div style='flex:1 1 220px'>"
+    "<div style='font-size:0.78rem;color:#d6d3d1;margin-bottom:2px'>{label}</div>"
+    "<svg viewBox='0 0 {w} {h}' style='width:100%;height:auto;"
+    "background:rgba(255,255,255,.04);border-radius:8px'>"
+    "{body}<circle cx='{x}' cy='{y}' r='3.5' fill='#a78bfa'/>"
+    "</svg></div>"
+)
+
+_CURVE_BODY = CardTemplate(
+    "{ice}<polyline points='{pd}' fill='none' stroke='#fcd34d' stroke-width='2'/>"
+    "<text x='4' y='{h_text}' font-size='9' fill='#a8a29e'>{lo}</text>"
+    "<text x='{w_text}' y='{h_text}' font-size='9' fill='#a8a29e' text-anchor='end'>{hi}</text>"
+)
+
+_TIPS_OPEN = (
+    HR + SEC + "💡 Improvement Tips</div>"
+    "<ul style='margin:6px 0 0 4px;padding-left:16px;"
+    "color:#d6d3d1;font-size:0.85rem;line-height:1.7'>"
+)
+
+_CARD = CardTemplate(
+    "<div style='"
+    "background:linear-gradient(135deg,rgba(109,40,217,.22),rgba(79,70,229,.18));"
+    "border:1.5px solid rgba(139,92,246,.55);"
+    "border-radius:18px;padding:24px 28px;"
+    "box-shadow:0 0 32px rgba(109,40,217,.3);"
+    "font-family:Inter,sans-serif'>"
+
+    # Big result
+    "<div style='text-align:center'>"
+    "<div style='font-size:3.2rem;font-weight:800;line-height:1;"
+    "display:flex;justify-content:center;align-items:center;gap:12px'>"
+    "{emoji_span}"
+    "<span style='background:linear-gradient(90deg,#a78bfa,#818cf8);"
+    "-webkit-background-clip:text;-webkit-text-fill-color:transparent'>{pred}%</span></div>"
+    "{verdict_div}"
+    "</div>"
+
+    # Progress bar
+    "<div style='margin:16px 0 4px;background:rgba(255,255,255,.08);"
+    "border-radius:999px;height:10px;overflow:hidden'>"
+    "<div style='width:{pred}%;height:100%;"
+    "{bar_fill}"
+    "border-radius:999px'></div></div>"
+    "<div style='display:flex;justify-content:space-between;"
+    "font-size:0.75rem;color:#a8a29e;margin-bottom:4px'>"
+    "<span>0%</span><span>50% Moderate</span><span>70% Strong</span></div>"
+
+    # Profile summary
+    + HR + SEC + "📋 Your Profile</div>" +
+    "<div style='display:grid;grid-template-columns:1fr 1fr;"
+    "gap:6px 24px;margin:10px 0 0;font-size:0.85rem;color:#d6d3d1'>"
+    "<span>🎓 <b style='color:#fcd34d'>Degree</b></span><span>{degree}</span>"
+    "<span>🌍 <b style='color:#fcd34d'>Country</b></span>"
+    "<span>{country_cell}</span>"
+    "<span>📝 <b style='color:#fcd34d'>Exam</b></span><span>{exam_type} — {exam_score}</span>"
+    "<span>📊 <b style='color:#fcd34d'>CGPA</b></span><span>{cgpa}</span>"
+    "<span>📄 <b style='color:#fcd34d'>SOP</b></span><span>{sop}/5</span>"
+    "<span>📋 <b style='color:#fcd34d'>LOR</b></span><span>{lor}/5</span>"
+    "<span>🔬 <b style='color:#fcd34d'>Research</b></span><span>{research_label}</span>"
+    "<span>💼 <b style='color:#fcd34d'>Work Exp</b></span><span>{work_exp} yr(s)</span>"
+    "</div>"
+
+    # Scorecard
+    + HR + SEC + "📈 Profile Strength</div>" + "{scorecard}"
+
+    # Tips + country fit
+    "{tips_html}{fit_html}{curves_html}"
+    "</div>"
+)
+
+
+# ----------------------------------------
+# CACHED FRAGMENTS
+# ----------------------------------------
+def _verdict_fragments(emoji, bar_color, verdict):
+    return {
+        "emoji_span": (
+            "<span style='-webkit-text-fill-color:initial;"
+            f"-webkit-background-clip:initial'>{emoji}</span>"
+        ),
+        "verdict_div": (
+            f"<div style='color:{bar_color};font-weight:700;"
+            f"font-size:1.1rem;margin-top:6px'>{verdict}</div>"
+        ),
+        "bar_fill": f"background:linear-gradient(90deg,{bar_color},{bar_color}99);",
+    }
+
+
+_VERDICT_FRAGMENTS = {
+    verdict: _verdict_fragments(VERDICT_EMOJI[verdict], color, verdict)
+    for _, verdict, color in VERDICTS
+}
+
+
+@lru_cache(maxsize=64)
+def flag_img(country, h=14):
+    return _FLAG.render({"iso": COUNTRY_ISO.get(country, "un"), "h": str(h)})
+
+
+@lru_cache(maxsize=32)
+def country_chip(country):
+    return _CHIP.render({"flag": flag_img(country), "country": country})
+
+
+@lru_cache(maxsize=32)
+def _country_cell(country):
+    return flag_img(country) + country
+
+
+@lru_cache(maxsize=16)
+def error_card(exam_type, lo, hi):
+    return _ERROR.render({"exam_type": exam_type, "lo": str(lo), "hi": str(hi)})
+
+
+def notice_card(message):
+    return _NOTICE.render({"message": message})
+
+
+# typed=True: a slider may send 8 or 8.0 and they must render differently
+@lru_cache(maxsize=1024, typed=True)
+def score_bar(label, icon, val, strong_thresh, tag, unit=""):
+    pct = min(int((val / strong_thresh) * 100), 100)
+    return _SCORE_BAR.render({
+        "icon": icon, "label": label, "color": RATING_COLORS[tag],
+        "val": str(val), "unit": unit, "tag": tag, "pct": str(pct),
+    })
+
+
+def research_bar(research):
+    return _RESEARCH[bool(research)]
+
+
+@lru_cache(maxsize=256)
+def tips_block(tips):
+    """``tips`` is a tuple of tip strings — the combinations are few, so cache them."""
+    if not tips:
+        return ""
+    return "".join([_TIPS_OPEN, *(f"<li>{t}</li>" for t in tips), "</ul>"])
+
+
+@lru_cache(maxsize=64)
+def fit_block(warning):
+    return _FIT.render({"warning": warning}) if warning else ""
+
+
+_CURVE_W, _CURVE_H = 220, 80
+
+
+def _xy(g, c, lo, span):
+    """SVG coordinates: grid on x, chance 0–100 on y (top = 100)."""
+    return f"{(g - lo) / span * _CURVE_W:.1f}", f"{(1 - c / 100) * (_CURVE_H - 12):.1f}"
+
+
+def _points(grid, chance):
+    lo, span = grid[0], (grid[-1] - grid[0]) or 1
+    return " ".join(",".join(_xy(g, c, lo, span)) for g, c in zip(grid, chance))
+
+
+def _curve_body(grid, pd, ice):
+    """Everything in a chart except the applicant's dot; at most ``ICE_DRAWN``
+    evenly spaced ICE curves are drawn."""
+    return _CURVE_BODY.render({
+        "ice": "".join(
+            f"<polyline points='{_points(grid, row)}' fill='none' "
+            "stroke='rgba(167,139,250,.18)' stroke-width='1'/>"
+            for row in drawn_ice(ice)
+        ),
+        "pd": _points(grid, pd), "lo": f"{grid[0]:g}", "hi": f"{grid[-1]:g}",
+        "w_text": str(_CURVE_W - 4), "h_text": str(_CURVE_H - 2),
+    })
+
+
+# (model version, country, degree, feature) → chart body; cleared when full
+_CURVE_BODIES = {}
+_CURVE_BODIES_MAX = 2048
+
+
+def curve_chart(key, feature, value, grid, pd, ice):
+    """Small SVG of the partial-dependence curve (bold) over ICE curves
+    (faint), with a dot at the applicant's own ``value``.  Only the dot is
+    rendered per call; the rest is cached under ``key``."""
+    body = _CURVE_BODIES.get(key)
+    if body is None:
+        if len(_CURVE_BODIES) >= _CURVE_BODIES_MAX:
+            _CURVE_BODIES.clear()
+        body = _CURVE_BODIES[key] = _curve_body(grid, pd, ice)
+    value = min(max(value, grid[0]), grid[-1])
+    x, y = _xy(value, np.interp(value, grid, pd), grid[0], (grid[-1] - grid[0]) or 1)
+    return _CURVE.render({
+        "label": f"{feature} (you: {value:g})", "w": str(_CURVE_W), "h": str(_CURVE_H),
+        "body": body, "x": x, "y": y,
+    })
+
+
+def curves_block(p, curves, version):
+    """``curves`` is ``InferenceEngine.dependence_curves`` output for ``p``
+    under model ``version``."""
+    if not curves:
+        return ""
+    own = {"CGPA": p["cgpa"], "SOP": p["sop"], "LOR": p["lor"], p["exam_type"]: p["exam_score"]}
+    return "".join([_CURVES_OPEN, *(
+        curve_chart((version, p["country"], p["degree"], f), f, own.get(f, grid[0]), grid, pd, ice)
+        for f, (grid, pd, ice) in curves.items()
+    ), "</div>"])
+
+
+# ----------------------------------------
+# FULL CARD
+# ----------------------------------------
+def render_card(pred, verdict, degree, country, exam_type, exam_score,
+                cgpa, sop, lor, research, work_exp, scorecard, tips, fit_warning,
+                curves_html=""):
+    values = {
+        "pred":           str(pred),
+        "degree":         str(degree),
+        "country_cell":   _country_cell(country),
+        "exam_type":      exam_type,
+        "exam_score":     str(exam_score),
+        "cgpa":           str(cgpa),
+        "sop":            str(sop),
+        "lor":            str(lor),
+        "research_label": "Yes ✅" if research == 1 else "No ❌",
+        "work_exp":       str(work_exp),
+        "scorecard":      scorecard,
+        "tips_html":      tips_block(tuple(tips)),
+        "fit_html":       fit_block(fit_warning),
+        "curves_html":    curves_html,
+    }
+    values.update(_VERDICT_FRAGMENTS[verdict])
+    return _CARD.render(values)
+
+
+_STRONG = {label: strong for label, _, strong, _ in SCORECARD}
+
+
+def render_result(result, p, curves=None, version=None):
+    """HTML card for an ``inference.Prediction`` and the profile it scored,
+    plus charts for ``curves`` (``InferenceEngine.dependence_curves`` of
+    model ``version``) if given."""
+    if result.error:
+        return error_card(p["exam_type"], *EXAM_LIMITS[p["exam_type"]])
+
+    ratings = result.ratings
+    scorecard = "".join((
+        score_bar("CGPA",            "📊", p["cgpa"],     _STRONG["CGPA"],     ratings["CGPA"]),
+        score_bar("SOP Strength",    "📄", p["sop"],      _STRONG["SOP"],      ratings["SOP"], "/5"),
+        score_bar("LOR Strength",    "📋", p["lor"],      _STRONG["LOR"],      ratings["LOR"], "/5"),
+        score_bar("Work Experience", "💼", p["work_exp"], _STRONG["Work Exp"], ratings["Work Exp"], " yrs"),
+        research_bar(p["research"]),
+    ))
+
+    country = p["country"]
+    if result.fit == "gre_in_eu":
+        fit_warning = FIT_GRE_IN_EU
+    elif result.fit == "gre_expected":
+        fit_warning = gre_tip(country)
+    else:
+        fit_warning = ""
+
+    return render_card(result.prediction, result.verdict, p["degree"], country,
+                       p["exam_type"], p["exam_score"], p["cgpa"], p["sop"], p["lor"],
+                       p["research"], p["work_exp"], scorecard,
+                       [TIPS_HTML[t] for t in result.tips], fit_warning,
+                       curves_block(p, curves, version))
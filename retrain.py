@@ -0,0 +1,324 @@
+"""
+retrain.py
+──────────
+Absorb reported admit/reject outcomes without re-running train_model.py.
+
+    record_outcome(body)     append one labelled profile to outcomes.jsonl
+    OutcomeGate              token check + per-client rate limit for POST /outcomes
+    retrain_once()           grow trees on the rows added since the last round
+    Retrainer(...).start()   run rounds on a background thread (app.py)
+
+Usage:
+    python retrain.py                        # one round now
+    python retrain.py --ingest outcomes.jsonl  # append a file of outcomes, then a round
+
+A round reads only the bytes appended to the store since the last
+published round, fits ``TREES_PER_ROUND`` new trees on those rows with
+``warm_start`` (admitted = 1.0, rejected = 0.0), then retires the oldest
+*outcome* trees beyond ``TREE_BUDGET``.  Time and memory scale with the
+new rows, not the full history.
+
+The forest averages its trees, and outcome trees are fit on a few dozen
+hard 0/1 labels while the CSV trees learnt the continuous Chance_of_Admit,
+so every outcome tree drags predictions towards 0 or 100.  Two limits
+bound that skew:
+
+  • the CSV trees (``payload["base_trees"]``, set by train_model.py) are
+    never retired — only outcome trees age out
+  • outcome trees are capped at ``MAX_OUTCOME_SHARE`` of the forest
+    (default 0.2: at most 50 next to 200 CSV trees), so reported outcomes
+    move any prediction by at most that share of its distance to 0 / 100  The store offset is saved inside the artifact, so
+the model and "what it has seen" are published together by one atomic
+rename; a crash before the rename just repeats the round.
+
+Reported rows become training data, so ``POST /outcomes`` (app.py) only
+accepts requests carrying ``X-Admission-Outcomes-Token: <token>`` matching
+``ADMISSION_OUTCOMES_TOKEN`` (unset = endpoint disabled), at most
+``ADMISSION_OUTCOMES_PER_MINUTE`` per client, and only values inside the
+ranges the UI offers.
+
+A full ``python train_model.py`` starts from the CSV again and resets the
+offset, so the next round re-absorbs every reported outcome.
+"""
+
+import argparse
+import hmac
+import json
+import os
+import resource
+import threading
+import time
+import tracemalloc
+
+from inference import (
+    BASE_DIR, EXAM_LIMITS, FEATURE_COLUMNS, MODEL_PATH, InferenceEngine, load_artifact,
+)
+
+OUTCOMES_PATH = os.path.join(BASE_DIR, "outcomes.jsonl")
+
+TREES_PER_ROUND  = int(os.environ.get("ADMISSION_TREES_PER_ROUND", 20))
+TREE_BUDGET      = int(os.environ.get("ADMISSION_TREE_BUDGET", 300))
+MAX_OUTCOME_SHARE = float(os.environ.get("ADMISSION_MAX_OUTCOME_SHARE", 0.2))
+MIN_ROWS         = int(os.environ.get("ADMISSION_RETRAIN_MIN_ROWS", 50))
+RETRAIN_INTERVAL = float(os.environ.get("ADMISSION_RETRAIN_INTERVAL", 0))
+OUTCOMES_TOKEN   = os.environ.get("ADMISSION_OUTCOMES_TOKEN", "")
+OUTCOMES_PER_MIN = int(os.environ.get("ADMISSION_OUTCOMES_PER_MINUTE", 30))
+
+OUTCOMES_HEADER = "X-Admission-Outcomes-Token"
+
+# Accepted ranges for reported profile fields (the Gradio sliders' ranges)
+FIELD_LIMITS = {"cgpa": (6.0, 10.0), "sop": (1.0, 5.0), "lor": (1.0, 5.0), "work_exp": (0, 10)}
+
+_append_lock = threading.Lock()
+_round_lock = threading.Lock()
+
+
+# ----------------------------------------
+# INGESTION
+# ----------------------------------------
+def parse_outcome(body):
+    """Coerce a reported outcome; raises ValueError if it can't be used.
+
+    ``admitted`` must be a JSON boolean and ``research`` the integer 0 or 1 —
+    the label is the one thing ``bool()``/``int()`` would silently get wrong
+    ("false" → True, "1.0" → error, true → 1).
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Invalid outcome: expected a JSON object")
+    admitted, research = body.get("admitted"), body.get("research")
+    if not isinstance(admitted, bool):
+        raise ValueError("Invalid outcome: admitted must be true or false")
+    if type(research) is not int or research not in (0, 1):
+        raise ValueError("Invalid research. Allowed: 0 or 1")
+    try:
+        row = {
+            "degree":     str(body["degree"]),
+            "exam_type":  str(body["exam_type"]),
+            "exam_score": float(body["exam_score"]),
+            "work_exp":   int(body["work_exp"]),
+            "cgpa":       float(body["cgpa"]),
+            "sop":        float(body["sop"]),
+            "lor":        float(body["lor"]),
+            "research":   research,
+            "country":    str(body["country"]),
+            "admitted":   admitted,
+        }
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid outcome: {exc}") from None
+    if row["exam_type"] not in EXAM_LIMITS:
+        raise ValueError(f"Unknown exam type {row['exam_type']!r}")
+    lo, hi = EXAM_LIMITS[row["exam_type"]]
+    if not (lo <= row["exam_score"] <= hi):
+        raise ValueError(f"Invalid {row['exam_type']} score. Allowed: {lo}–{hi}")
+    for key, (lo, hi) in FIELD_LIMITS.items():
+        if not (lo <= row[key] <= hi):
+            raise ValueError(f"Invalid {key}. Allowed: {lo}–{hi}")
+    return row
+
+
+class OutcomeGate:
+    """Who may report outcomes: a shared token, then a sliding one-minute
+    window of at most ``per_minute`` reports per client."""
+
+    def __init__(self, token=OUTCOMES_TOKEN, per_minute=OUTCOMES_PER_MIN):
+        self.token = token
+        self.per_minute = per_minute
+        self._recent = {}
+        self._lock = threading.Lock()
+
+    def check(self, header, client):
+        """None if the report may proceed, else (HTTP status, error message)."""
+        if not self.token:
+            return 403, "outcome reporting is disabled (ADMISSION_OUTCOMES_TOKEN is not set)"
+        if not header or not hmac.compare_digest(header, self.token):
+            return 401, f"missing or wrong {OUTCOMES_HEADER}"
+        now = time.monotonic()
+        with self._lock:
+            recent = [t for t in self._recent.get(client, ()) if now - t < 60]
+            if len(recent) >= self.per_minute:
+                self._recent[client] = recent
+                return 429, f"at most {self.per_minute} outcomes per minute"
+            recent.append(now)
+            self._recent[client] = recent
+            if len(self._recent) > 10000:  # forget idle clients
+                self._recent = {c: ts for c, ts in self._recent.items() if now - ts[-1] < 60}
+        return None
+
+
+def record_outcome(body, path=OUTCOMES_PATH):
+    """Append one outcome as a JSON line (single O_APPEND write)."""
+    row = parse_outcome(body)
+    row["reported_at"] = round(time.time(), 3)
+    line = (json.dumps(row) + "\n").encode()
+    with _append_lock:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    return row
+
+
+def read_outcomes(path=OUTCOMES_PATH, offset=0):
+    """Complete lines after ``offset``; returns (rows, new offset)."""
+    if not os.path.exists(path):
+        return [], offset
+    with open(path, "rb") as f:
+        f.seek(offset)
+        blob = f.read()
+    end = blob.rfind(b"\n") + 1  # a half-written last line waits for the next round
+    rows = []
+    for line in blob[:end].splitlines():
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            continue  # torn or blank line; never let one bad row block every round
+    return rows, offset + end
+
+
+# ----------------------------------------
+# RETRAIN
+# ----------------------------------------
+def outcome_tree_cap(base_trees, tree_budget=TREE_BUDGET, max_share=MAX_OUTCOME_SHARE):
+    """Most outcome trees allowed next to ``base_trees`` CSV trees."""
+    share = min(max(max_share, 0.0), 0.95)
+    return max(0, min(tree_budget - base_trees, int(base_trees * share / (1 - share))))
+
+
+def retrain_once(model_path=MODEL_PATH, store=OUTCOMES_PATH, trees_per_round=TREES_PER_ROUND,
+                 tree_budget=TREE_BUDGET, min_rows=MIN_ROWS, trace_memory=False,
+                 max_outcome_share=MAX_OUTCOME_SHARE):
+    """Run one round; return its stats, or None if there was too little new data.
+
+    ``trace_memory`` adds the round's peak Python allocation (``peak_mb``)
+    via tracemalloc, which slows every allocation while on — the CLI sets
+    it, the background ``Retrainer`` does not.
+    """
+    import pandas as pd
+
+    import pdp
+    from train_model import save_artifact
+
+    with _round_lock:
+        payload = load_artifact(model_path)
+        offset = payload.get("outcomes_offset", 0)
+        rows, end = read_outcomes(store, offset)
+        if len(rows) < min_rows:
+            return None
+
+        model = payload["model"]
+        if not hasattr(model, "estimators_"):
+            raise ValueError("incremental retraining needs a RandomForest artifact "
+                             "(this model.pkl came from train_model.py --out-of-core)")
+
+        # Artifacts from before base_trees was recorded: pin whatever they hold
+        base = payload.get("base_trees", len(model.estimators_))
+        cap = outcome_tree_cap(base, tree_budget, max_outcome_share)
+        grow = min(trees_per_round, cap)
+
+        t0 = time.perf_counter()
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            engine = InferenceEngine(payload, backend="sklearn")
+            X, y, skipped = [], [], 0
+            for r in rows:
+                if (r["country"] not in engine.country_map or r["degree"] not in engine.degree_map
+                        or r["exam_type"] not in engine.exam_map):
+                    skipped += 1  # the trees have no code for it; kept for the next full retrain
+                    continue
+                X.append(engine.encode(r))
+                y.append(1.0 if r["admitted"] else 0.0)
+
+            if X and grow:
+                model.set_params(warm_start=True, n_estimators=len(model.estimators_) + grow)
+                model.fit(pd.DataFrame(X, columns=FEATURE_COLUMNS), y)
+                model.set_params(warm_start=False)
+            outcome_trees = model.estimators_[base:]
+            retired = max(0, len(outcome_trees) - cap)
+            if retired:
+                # CSV trees stay; the oldest outcome trees go first
+                model.estimators_ = model.estimators_[:base] + outcome_trees[retired:]
+            model.n_estimators = len(model.estimators_)
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+
+        stats = {
+            "rows":          len(X),
+            "skipped":       skipped,
+            "trees_added":   grow if X else 0,
+            "trees_retired": retired,
+            "trees":         len(model.estimators_),
+            "outcome_trees": len(model.estimators_) - base,
+            "fit_s":         round(time.perf_counter() - t0, 3),
+            # Process high-water mark; cheap enough to report from the server
+            "max_rss_mb":    round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+        if peak is not None:
+            stats["peak_mb"] = round(peak / 2**20, 1)
+        payload = dict(payload, model=model, base_trees=base, outcomes_offset=end,
+                       version=time.strftime("%Y%m%d-%H%M%S") + f"+{len(X)}", retrain=stats)
+        save_artifact(payload, model_path)
+        if model_path == MODEL_PATH:
+            pdp.publish(InferenceEngine(payload, backend="sklearn"))
+        stats["version"] = payload["version"]
+        return stats
+
+
+class Retrainer:
+    """Runs ``retrain_once`` every ``interval`` seconds on a daemon thread
+    and calls ``on_publish(stats)`` after each new artifact."""
+
+    def __init__(self, interval=RETRAIN_INTERVAL, on_publish=None, **kwargs):
+        self.interval = interval
+        self.on_publish = on_publish
+        self.kwargs = kwargs
+        self.last = None
+        self.error = ""
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="retrainer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                stats = retrain_once(**self.kwargs)
+                if stats:
+                    self.last = stats
+                    self.error = ""
+                    if self.on_publish:
+                        self.on_publish(stats)
+            except Exception as exc:  # keep serving the current model
+                self.error = f"{type(exc).__name__}: {exc}"
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ingest", help="JSON-lines file of outcomes to append first")
+    ap.add_argument("--min-rows", type=int, default=MIN_ROWS)
+    args = ap.parse_args()
+
+    if args.ingest:
+        with open(args.ingest) as f:
+            n = sum(1 for line in f if line.strip() and record_outcome(json.loads(line)))
+        print(f"Appended {n} outcomes → {OUTCOMES_PATH}")
+
+    stats = retrain_once(min_rows=args.min_rows, trace_memory=True)
+    if stats is None:
+        print(f"Fewer than {args.min_rows} new outcomes — nothing to do.")
+    else:
+        print(f"✅ Published {stats['version']}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
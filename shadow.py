@@ -0,0 +1,162 @@
+"""
+shadow.py
+─────────
+Score a sampled share of live traffic with a candidate model, off the
+request path, and summarise how it differs from the model being served.
+
+    ADMISSION_SHADOW_MODEL=model_candidate.pkl  python start_api.py
+
+The user always gets the primary model's answer.  For a sampled fraction
+of requests (``ADMISSION_SHADOW_FRACTION``) the handler drops
+(profile, primary result, primary latency) into a bounded queue — one
+``random()`` and one ``put_nowait`` on the hot path — and a daemon thread
+scores the candidate and records the delta.  If the queue is full the
+sample is dropped and counted, never waited for.
+
+Serverless instances get about one vCPU and no /dev/shm for
+multiprocessing queues, so a separate process would only compete for the
+same core.  Instead the handler marks each primary request with
+``primary()`` and the shadow thread only starts a candidate prediction
+while no primary request is in flight: shadow work fills idle time and
+backs off (then drops samples) under load.
+
+``ShadowScorer.summary()`` (served under ``shadow`` in ``GET /api/health``)
+reports the absolute admit-chance delta (mean / p50 / p99 / max, in
+percentage points), verdict flips and p50 / p99 latency of both models on
+the same requests.  ``python benchmarks/bench_shadow.py`` measures what the
+shadow costs the primary path's p99.
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from inference import InferenceEngine, load_artifact
+
+SHADOW_MODEL    = os.environ.get("ADMISSION_SHADOW_MODEL", "")
+SHADOW_BACKEND  = os.environ.get("ADMISSION_SHADOW_BACKEND", "compiled")
+SHADOW_FRACTION = float(os.environ.get("ADMISSION_SHADOW_FRACTION", 0.1))
+
+QUEUE_SIZE = 1024
+WINDOW     = 10_000   # most recent samples kept for the summary
+
+
+class ShadowScorer:
+    """Background candidate scoring for a sampled fraction of requests."""
+
+    def __init__(self, candidate, fraction=SHADOW_FRACTION, queue_size=QUEUE_SIZE, window=WINDOW):
+        self.candidate = candidate
+        self.fraction = fraction
+        self.seen = self.sampled = self.dropped = self.scored = self.flips = 0
+        self.errors = 0
+        self.deltas = deque(maxlen=window)
+        self.primary_ms = deque(maxlen=window)
+        self.candidate_ms = deque(maxlen=window)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._gate = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = None
+
+    @classmethod
+    def from_path(cls, path, backend=SHADOW_BACKEND, fraction=SHADOW_FRACTION):
+        engine = InferenceEngine(load_artifact(path), backend=backend).warm_up()
+        return cls(engine, fraction)
+
+    @classmethod
+    def from_env(cls):
+        """A started scorer if ``ADMISSION_SHADOW_MODEL`` is set, else None."""
+        if not SHADOW_MODEL:
+            return None
+        return cls.from_path(SHADOW_MODEL).start()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="shadow", daemon=True)
+            self._thread.start()
+        return self
+
+    # ── Request path ───────────────────────────────────────
+    @contextmanager
+    def primary(self):
+        """Wrap the primary request; the shadow thread waits until none are open."""
+        with self._gate:
+            self._in_flight += 1
+            self._idle.clear()
+        try:
+            yield
+        finally:
+            with self._gate:
+                self._in_flight -= 1
+                if not self._in_flight:
+                    self._idle.set()
+
+    def submit(self, profile, result, primary_ms):
+        """Maybe enqueue one scored request; never blocks."""
+        self.seen += 1
+        if result.error or random.random() >= self.fraction:
+            return
+        self.sampled += 1
+        try:
+            self._queue.put_nowait((profile, result, primary_ms))
+        except queue.Full:
+            self.dropped += 1
+
+    # ── Background ─────────────────────────────────────────
+    def _run(self):
+        while True:
+            profile, result, primary_ms = self._queue.get()
+            self._idle.wait()
+            try:
+                t0 = time.perf_counter()
+                shadow = self.candidate.predict(profile)
+                ms = (time.perf_counter() - t0) * 1000
+            except Exception:  # a broken candidate must not take the thread down
+                self.errors += 1
+                continue
+            with self._lock:
+                self.scored += 1
+                self.flips += shadow.verdict != result.verdict
+                self.deltas.append(shadow.prediction - result.prediction)
+                self.primary_ms.append(primary_ms)
+                self.candidate_ms.append(ms)
+
+    def summary(self):
+        with self._lock:
+            deltas = np.abs(np.array(self.deltas, dtype=float))
+            primary = np.array(self.primary_ms, dtype=float)
+            cand = np.array(self.candidate_ms, dtype=float)
+            flips, scored = self.flips, self.scored
+
+        def pct(a, q):
+            return round(float(np.percentile(a, q)), 3) if a.size else None
+
+        return {
+            "candidate_version": self.candidate.version,
+            "fraction":   self.fraction,
+            "seen":       self.seen,
+            "sampled":    self.sampled,
+            "scored":     scored,
+            "dropped":    self.dropped,
+            "errors":     self.errors,
+            "queued":     self._queue.qsize(),
+            "verdict_flips": flips,
+            "abs_delta_pp": {
+                "mean": round(float(deltas.mean()), 3) if deltas.size else None,
+                "p50":  pct(deltas, 50),
+                "p99":  pct(deltas, 99),
+                "max":  round(float(deltas.max()), 3) if deltas.size else None,
+            },
+            "latency_ms": {
+                "primary":   {"p50": pct(primary, 50), "p99": pct(primary, 99)},
+                "candidate": {"p50": pct(cand, 50),    "p99": pct(cand, 99)},
+            },
+        }
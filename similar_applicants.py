@@ -0,0 +1,175 @@
+"""
+similar_applicants.py
+─────────────────────
+"Applicants like you" — the k most similar historical profiles and their
+outcomes, from a spatial index built once and saved next to model.pkl.
+
+Usage:
+    python similar_applicants.py        # (re)build similar_applicants.pkl
+
+train_model.py also rebuilds it after every training run.
+
+Country and degree are matched exactly: rows are partitioned by their
+codes in the model's ``country_map`` / ``degree_map`` and each partition
+gets its own ``sklearn.neighbors.KDTree``.  Inside a partition, distance
+is Euclidean over standardized CGPA, SOP, LOR, work experience, research
+and exam strength — the exam score scaled to 0–1 over its allowed range,
+so an IELTS 7.5 and a TOEFL 104 are comparable.  Six dimensions keep the
+trees shallow: a query is O(log n) per partition, a few hundred
+microseconds at a million rows.
+
+As in percentile_index.py, only the CSV's historical rows are indexed —
+not the synthetic UAE rows used for training.
+"""
+
+import os
+
+import numpy as np
+
+from inference import BASE_DIR, EXAM_COLUMNS, EXAM_LIMITS
+
+SIMILAR_PATH = os.path.join(BASE_DIR, "similar_applicants.pkl")
+
+NUMERIC_COLUMNS = ["CGPA", "SOP", "LOR", "Work_Experience_Years", "Research"]
+
+_LO = np.array([EXAM_LIMITS[e][0] for e in EXAM_COLUMNS], dtype=np.float64)
+_SPAN = np.array([EXAM_LIMITS[e][1] - EXAM_LIMITS[e][0] for e in EXAM_COLUMNS],
+                 dtype=np.float64)
+
+
+class SimilarApplicantIndex:
+    """Per-(country, degree) KD-trees over standardized profile features."""
+
+    def __init__(self, groups, mean, scale, country_map, degree_map):
+        self.groups = groups            # (country code, degree code) -> (tree, rows, exams)
+        self.mean = mean
+        self.scale = scale
+        self.country_map = country_map
+        self.degree_map = degree_map
+        self.size = sum(rows.shape[0] for _, rows, _ in groups.values())
+
+    def payload(self):
+        """Plain dict for pickling, so the file does not depend on where
+        this class was imported from."""
+        return {"groups": self.groups, "mean": self.mean, "scale": self.scale,
+                "country_map": self.country_map, "degree_map": self.degree_map}
+
+    # ── Building ───────────────────────────────────────────
+    @classmethod
+    def build(cls, data, country_map, degree_map, leaf_size=40):
+        """Index a DataFrame with the CSV's columns.  Rows whose country,
+        degree or exam is unknown to the maps are skipped."""
+        from sklearn.neighbors import KDTree
+
+        exam_idx = data["Exam_Type"].map({e: i for i, e in enumerate(EXAM_COLUMNS)})
+        keep = (data["Country_Aiming"].isin(country_map)
+                & data["Degree_Level"].isin(degree_map)
+                & exam_idx.notna()).to_numpy()
+        data = data[keep]
+        exam_idx = exam_idx[keep].to_numpy(dtype=np.int64)
+
+        scores = data[EXAM_COLUMNS].to_numpy(dtype=np.float64)[np.arange(len(data)), exam_idx]
+        features = np.column_stack([
+            data[NUMERIC_COLUMNS].to_numpy(dtype=np.float64),
+            (scores - _LO[exam_idx]) / _SPAN[exam_idx],
+        ])
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        features = (features - mean) / scale
+
+        # Stored rows: the raw numbers shown back to the user
+        rows = np.column_stack([
+            data[NUMERIC_COLUMNS].to_numpy(dtype=np.float64),
+            scores,
+            data["Chance_of_Admit"].to_numpy(dtype=np.float64),
+        ])
+        keys = (data["Country_Aiming"].map(country_map).to_numpy(dtype=np.int64) * 64
+                + data["Degree_Level"].map(degree_map).to_numpy(dtype=np.int64))
+
+        groups = {}
+        for key in np.unique(keys):
+            sel = np.flatnonzero(keys == key)
+            groups[(int(key) // 64, int(key) % 64)] = (
+                KDTree(features[sel], leaf_size=leaf_size),
+                rows[sel],
+                exam_idx[sel].astype(np.int8),
+            )
+        return cls(groups, mean, scale, country_map, degree_map)
+
+    @classmethod
+    def from_csv(cls, path=None, payload=None):
+        """Build from the historical CSV using model.pkl's category maps."""
+        import pandas as pd
+
+        from inference import load_artifact
+        from train_model import csv_path
+
+        payload = payload or load_artifact()
+        data = pd.read_csv(path or csv_path)
+        data.columns = data.columns.str.strip()
+        data[EXAM_COLUMNS] = data[EXAM_COLUMNS].fillna(0)
+        return cls.build(data, payload["country_map"], payload["degree_map"])
+
+    # ── Queries ────────────────────────────────────────────
+    def _features(self, profiles):
+        exam_idx = np.array([EXAM_COLUMNS.index(p["exam_type"]) for p in profiles])
+        X = np.array([[p["cgpa"], p["sop"], p["lor"], p["work_exp"], p["research"],
+                       p["exam_score"]] for p in profiles], dtype=np.float64)
+        X[:, 5] = (X[:, 5] - _LO[exam_idx]) / _SPAN[exam_idx]
+        return (X - self.mean) / self.scale
+
+    def query(self, profiles, k=5):
+        """k nearest past applicants for each profile, nearest first.
+
+        Profiles are grouped by (country, degree) so each partition's tree
+        is queried once for the whole batch.  A profile whose partition is
+        empty gets ``[]``."""
+        out = [[] for _ in profiles]
+        batches = {}
+        for i, p in enumerate(profiles):
+            key = (self.country_map.get(p["country"]), self.degree_map.get(p["degree"]))
+            if key in self.groups:
+                batches.setdefault(key, []).append(i)
+
+        for key, idx in batches.items():
+            tree, rows, exams = self.groups[key]
+            n = min(k, rows.shape[0])
+            dist, ind = tree.query(self._features([profiles[i] for i in idx]), k=n)
+            for i, d_row, j_row in zip(idx, dist, ind):
+                out[i] = [self._record(rows[j], exams[j], d) for j, d in zip(j_row, d_row)]
+        return out
+
+    @staticmethod
+    def _record(row, exam, distance):
+        cgpa, sop, lor, work_exp, research, score, chance = row.tolist()
+        return {
+            "exam_type":  EXAM_COLUMNS[exam],
+            "exam_score": score,
+            "cgpa":       cgpa,
+            "sop":        sop,
+            "lor":        lor,
+            "work_exp":   int(work_exp),
+            "research":   int(research),
+            "chance":     round(chance * 100, 2),
+            "distance":   round(float(distance), 4),
+        }
+
+
+def load_index(path=SIMILAR_PATH):
+    import pickle
+
+    with open(path, "rb") as f:
+        return SimilarApplicantIndex(**pickle.load(f))
+
+
+def main():
+    from train_model import save_artifact
+
+    index = SimilarApplicantIndex.from_csv()
+    save_artifact(index.payload(), SIMILAR_PATH)
+    print(f"✅ Saved → {SIMILAR_PATH}  ({index.size} rows, {len(index.groups)} groups)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,12 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from api.predict import handler
 
 if __name__ == "__main__":
-    port = 8000
+    port = int(os.environ.get("PORT", 8000))
     server_address = ('', port)
     
     print(f"🚀 Starting local Python API server on http://localhost:{port}")
     print("This allows Next.js 'npm run dev' to proxy /api/predict correctly.")
+    print(f"Health check: curl http://localhost:{port}/api/health")
     print("Press Ctrl+C to stop.")
     
     try:
@@ -3,106 +3,288 @@ train_model.py
 ──────────────
 Run this ONCE to train the model and save everything needed for inference.
 Output: model.pkl  (includes model + all category maps)
+        similar_applicants.pkl  (k-NN index over the CSV, see similar_applicants.py)
+        pdp_curves.pkl  (partial-dependence / ICE curves, see pdp.py)
 
 Usage:
     python train_model.py
+    python train_model.py --out-of-core [--chunksize 100000] [--compare]
+
+--out-of-core streams the CSV in chunks into uint8 bins on disk and trains
+a histogram gradient-boosting model (binned_gbm.py) instead of loading
+everything into a DataFrame; it writes the same model.pkl payload.
+
+The same build is importable (build_artifact / save_artifact) so the app can
+run it in a background thread when model.pkl is missing — pandas and sklearn
+are only imported when a build actually happens.
 """
 
 import os
 import pickle
-import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import cross_val_score
+import tempfile
+import time
+
+from inference import EXAM_COLUMNS, FEATURE_COLUMNS
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+csv_path = os.path.join(base_dir, "Admission_Predict_Final_With_Degree.csv")
+pkl_path = os.path.join(base_dir, "model.pkl")
+
+X_cols = FEATURE_COLUMNS
+
 
 # ----------------------------------------
 # LOAD & PREPARE DATASET
 # ----------------------------------------
-base_dir = os.path.dirname(os.path.abspath(__file__))
-csv_path = os.path.join(base_dir, "Admission_Predict_Final_With_Degree.csv")
+def _clean(data):
+    data.columns = data.columns.str.strip()
+    if "Program_Competitiveness" in data.columns:
+        data = data.drop(columns=["Program_Competitiveness"])
+    data[EXAM_COLUMNS] = data[EXAM_COLUMNS].fillna(0)
+    return data
 
-data = pd.read_csv(csv_path)
-data.columns = data.columns.str.strip()
-
-if "Program_Competitiveness" in data.columns:
-    data = data.drop(columns=["Program_Competitiveness"])
-
-exam_columns = ["IELTS", "TOEFL", "PTE", "DET", "GRE"]
-data[exam_columns] = data[exam_columns].fillna(0)
-
-# ── Inject synthetic UAE rows ──────────────────────────
-np.random.seed(99)
-n = 80
-uae_rows = pd.DataFrame({
-    "Degree_Level":          np.random.choice(["Undergraduate", "Masters", "PhD"], n, p=[.3, .55, .15]),
-    "Country_Aiming":        "UAE",
-    "Exam_Type":             np.random.choice(["IELTS", "TOEFL", "PTE"], n, p=[.55, .35, .10]),
-    "IELTS":                 np.where(np.random.choice(["IELTS", "TOEFL", "PTE"], n, p=[.55, .35, .10]) == "IELTS",
-                                      np.round(np.random.uniform(6.0, 9.0, n), 1), 0.0),
-    "TOEFL":                 np.where(np.random.choice(["IELTS", "TOEFL", "PTE"], n, p=[.55, .35, .10]) == "TOEFL",
-                                      np.random.randint(80, 118, n).astype(float), 0.0),
-    "PTE":                   np.where(np.random.choice(["IELTS", "TOEFL", "PTE"], n, p=[.55, .35, .10]) == "PTE",
-                                      np.random.randint(50, 88, n).astype(float), 0.0),
-    "DET":                   0.0,
-    "GRE":                   0.0,
-    "CGPA":                  np.round(np.random.uniform(6.0, 9.8, n), 2),
-    "SOP":                   np.round(np.random.uniform(1.0, 5.0, n) * 2) / 2,
-    "LOR":                   np.round(np.random.uniform(1.0, 5.0, n) * 2) / 2,
-    "Research":              np.random.randint(0, 2, n),
-    "Work_Experience_Years": np.random.randint(0, 10, n),
-    "Chance_of_Admit":       np.round(np.random.uniform(0.38, 0.88, n), 2),
-})
-data = pd.concat([data, uae_rows], ignore_index=True)
-
-# ── Encode categoricals ────────────────────────────────
-data["Country_Aiming"]  = data["Country_Aiming"].astype("category")
-data["Country_Encoded"] = data["Country_Aiming"].cat.codes
-country_map = dict(zip(data["Country_Aiming"].cat.categories,
-                       data["Country_Aiming"].cat.codes.unique()))
-
-data["Exam_Type"]    = data["Exam_Type"].astype("category")
-data["Exam_Encoded"] = data["Exam_Type"].cat.codes
-exam_map = dict(zip(data["Exam_Type"].cat.categories,
-                    data["Exam_Type"].cat.codes.unique()))
-
-data["Degree_Level"]   = data["Degree_Level"].astype("category")
-data["Degree_Encoded"] = data["Degree_Level"].cat.codes
-degree_map = dict(zip(data["Degree_Level"].cat.categories,
-                      data["Degree_Level"].cat.codes.unique()))
-
-# ── Features & target ──────────────────────────────────
-X_cols = [
-    "Degree_Encoded", "Work_Experience_Years", "CGPA",
-    "SOP", "LOR", "Research",
-    "IELTS", "TOEFL", "PTE", "DET", "GRE",
-    "Exam_Encoded", "Country_Encoded",
-]
-X = data[X_cols]
-y = data["Chance_of_Admit"]
-
-# ── Train ──────────────────────────────────────────────
-print("Training Random Forest (200 trees)...")
-model = RandomForestRegressor(n_estimators=200, random_state=42, n_jobs=-1)
-
-scores = cross_val_score(model, X, y, cv=5, scoring="r2")
-print(f"  Cross-val R² : {scores.mean():.4f}  (±{scores.std():.4f})")
-
-model.fit(X, y)
-print("  Training complete.")
-
-# ── Save everything to one pkl ─────────────────────────
-payload = {
-    "model":      model,
-    "country_map": country_map,
-    "exam_map":    exam_map,
-    "degree_map":  degree_map,
-}
 
-pkl_path = os.path.join(base_dir, "model.pkl")
-with open(pkl_path, "wb") as f:
-    pickle.dump(payload, f)
+def synthetic_uae_rows():
+    import numpy as np
+    import pandas as pd
+
+    # ── Inject synthetic UAE rows ──────────────────────────
+    np.random.seed(99)
+    n = 80
+    return pd.DataFrame({
+        "Degree_Level":          np.random.choice(["Undergraduate", "Masters", "PhD"], n, p=[.3, .55, .15]),
+        "Country_Aiming":        "UAE",
+        "Exam_Type":             np.random.choice(["IELTS", "TOEFL", "PTE"], n, p=[.55, .35, .10]),
+        "IELTS":                 np.where(np.random.choice(["IELTS", "TOEFL", "PTE"], n, p=[.55, .35, .10]) == "IELTS",
+                                          np.round(np.random.uniform(6.0, 9.0, n), 1), 0.0),
+        "TOEFL":                 np.where(np.random.choice(["IELTS", "TOEFL", "PTE"], n, p=[.55, .35, .10]) == "TOEFL",
+                                          np.random.randint(80, 118, n).astype(float), 0.0),
+        "PTE":                   np.where(np.random.choice(["IELTS", "TOEFL", "PTE"], n, p=[.55, .35, .10]) == "PTE",
+                                          np.random.randint(50, 88, n).astype(float), 0.0),
+        "DET":                   0.0,
+        "GRE":                   0.0,
+        "CGPA":                  np.round(np.random.uniform(6.0, 9.8, n), 2),
+        "SOP":                   np.round(np.random.uniform(1.0, 5.0, n) * 2) / 2,
+        "LOR":                   np.round(np.random.uniform(1.0, 5.0, n) * 2) / 2,
+        "Research":              np.random.randint(0, 2, n),
+        "Work_Experience_Years": np.random.randint(0, 10, n),
+        "Chance_of_Admit":       np.round(np.random.uniform(0.38, 0.88, n), 2),
+    })
+
+
+def load_dataset(path=csv_path):
+    import pandas as pd
+
+    data = _clean(pd.read_csv(path))
+    return pd.concat([data, synthetic_uae_rows()], ignore_index=True)
+
+
+def iter_chunks(path=csv_path, chunksize=100_000):
+    """The same rows as ``load_dataset``, ``chunksize`` at a time."""
+    import pandas as pd
+
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        yield _clean(chunk)
+    yield synthetic_uae_rows()
+
+
+def encode(data):
+    """Add *_Encoded columns in place; return (country_map, exam_map, degree_map)."""
+    data["Country_Aiming"]  = data["Country_Aiming"].astype("category")
+    data["Country_Encoded"] = data["Country_Aiming"].cat.codes
+    country_map = dict(zip(data["Country_Aiming"].cat.categories,
+                           data["Country_Aiming"].cat.codes.unique()))
+
+    data["Exam_Type"]    = data["Exam_Type"].astype("category")
+    data["Exam_Encoded"] = data["Exam_Type"].cat.codes
+    exam_map = dict(zip(data["Exam_Type"].cat.categories,
+                        data["Exam_Type"].cat.codes.unique()))
+
+    data["Degree_Level"]   = data["Degree_Level"].astype("category")
+    data["Degree_Encoded"] = data["Degree_Level"].cat.codes
+    degree_map = dict(zip(data["Degree_Level"].cat.categories,
+                          data["Degree_Level"].cat.codes.unique()))
+
+    return country_map, exam_map, degree_map
+
+
+# ----------------------------------------
+# TRAIN
+# ----------------------------------------
+def build_artifact(path=csv_path, n_jobs=-1, cross_validate=False, verbose=False):
+    """Train the 200-tree forest on every core and return the model.pkl payload."""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import cross_val_score
+
+    data = load_dataset(path)
+    country_map, exam_map, degree_map = encode(data)
+    X = data[X_cols]
+    y = data["Chance_of_Admit"]
+
+    if verbose:
+        print("Training Random Forest (200 trees)...")
+    model = RandomForestRegressor(n_estimators=200, random_state=42, n_jobs=n_jobs)
+
+    if cross_validate:
+        scores = cross_val_score(model, X, y, cv=5, scoring="r2")
+        print(f"  Cross-val R² : {scores.mean():.4f}  (±{scores.std():.4f})")
+
+    model.fit(X, y)
+    if verbose:
+        print("  Training complete.")
+
+    return {
+        "model":      model,
+        "country_map": country_map,
+        "exam_map":    exam_map,
+        "degree_map":  degree_map,
+        "base_trees":  len(model.estimators_),  # retrain.py never retires these
+        "version":     time.strftime("%Y%m%d-%H%M%S"),
+    }
+
+
+def _holdout_metrics(y, pred):
+    import numpy as np
+
+    y = np.asarray(y, dtype=np.float64)
+    pred = np.clip(np.asarray(pred, dtype=np.float64), 0, 1)
+    ss_res = float(((y - pred) ** 2).sum())
+    ss_tot = float(((y - y.mean()) ** 2).sum())
+    return {"r2": round(1 - ss_res / ss_tot, 4), "mae": round(float(np.abs(y - pred).mean()), 4)}
+
+
+def build_binned_artifact(path=csv_path, chunksize=100_000, holdout_every=5,
+                          n_rounds=300, verbose=False):
+    """Out-of-core build: two streaming passes into uint8 bins on disk, then
+    a histogram GBM (binned_gbm.py).  Same payload shape as build_artifact,
+    plus a ``report`` with time, peak memory and holdout accuracy."""
+    import shutil
+    import tracemalloc
+
+    import numpy as np
+
+    from binned_gbm import CATEGORICAL, BinnedGBM, bin_to_disk, category_maps, \
+        edges_from_counts, scan
+
+    t0 = time.perf_counter()
+    tracemalloc.start()
+    try:
+        n, categories, counts = scan(iter_chunks(path, chunksize))
+        maps = category_maps(categories)
+        edges = [np.arange(len(maps[CATEGORICAL[c]]) - 1) + 0.5 if c in CATEGORICAL
+                 else edges_from_counts(*counts[c]) for c in X_cols]
+        (Xtr, ytr), (Xho, yho), workdir = bin_to_disk(
+            iter_chunks(path, chunksize), n, maps, edges, holdout_every)
+        t1 = time.perf_counter()
+        if verbose:
+            print(f"Binned {n:,} rows in {t1 - t0:.2f}s → {workdir}")
+            print(f"Training histogram GBM ({n_rounds} rounds)...")
+        try:
+            model = BinnedGBM(n_rounds=n_rounds).fit(Xtr, ytr, edges, verbose=verbose)
+            metrics = _holdout_metrics(yho, model.predict_binned(Xho)) if holdout_every else {}
+        finally:
+            del Xtr, ytr, Xho, yho
+            shutil.rmtree(workdir, ignore_errors=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    report = {
+        "rows":        n,
+        "bin_s":       round(t1 - t0, 2),
+        "train_s":     round(time.perf_counter() - t1, 2),
+        "peak_mb":     round(peak / 2**20, 1),
+        "model_mb":    round(model.nbytes / 2**20, 2),
+        "holdout":     metrics,
+    }
+    return {
+        "model":       model,
+        "country_map": maps["Country_Aiming"],
+        "exam_map":    maps["Exam_Type"],
+        "degree_map":  maps["Degree_Level"],
+        "version":     time.strftime("%Y%m%d-%H%M%S") + "-gbm",
+        "report":      report,
+    }
+
+
+def forest_baseline(path=csv_path, holdout_every=5):
+    """The current in-memory forest on the same train/holdout split, for
+    comparison with build_binned_artifact's report."""
+    import tracemalloc
+
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+
+    t0 = time.perf_counter()
+    tracemalloc.start()
+    try:
+        data = load_dataset(path)
+        encode(data)
+        hold = np.arange(len(data)) % holdout_every == 0
+        X, y = data[X_cols], data["Chance_of_Admit"]
+        model = RandomForestRegressor(n_estimators=200, random_state=42, n_jobs=-1)
+        model.fit(X[~hold], y[~hold])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "rows":     len(data),
+        "train_s":  round(time.perf_counter() - t0, 2),
+        "peak_mb":  round(peak / 2**20, 1),
+        "holdout":  _holdout_metrics(y[hold], model.predict(X[hold])),
+    }
+
+
+def save_artifact(payload, path=pkl_path):
+    """Write to a temp file in the same directory, then rename over ``path``,
+    so readers never see a half-written pickle."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".pkl.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def main():
+    import argparse
+
+    import pdp
+    from inference import InferenceEngine
+    from similar_applicants import SIMILAR_PATH, SimilarApplicantIndex
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out-of-core", action="store_true",
+                    help="stream the CSV in chunks and train a histogram GBM on uint8 bins")
+    ap.add_argument("--data", default=csv_path)
+    ap.add_argument("--chunksize", type=int, default=100_000)
+    ap.add_argument("--rounds", type=int, default=300)
+    ap.add_argument("--compare", action="store_true",
+                    help="also train the in-memory forest on the same split and compare")
+    ap.add_argument("--output", default=pkl_path)
+    args = ap.parse_args()
+
+    if args.out_of_core:
+        payload = build_binned_artifact(args.data, args.chunksize, n_rounds=args.rounds,
+                                        verbose=True)
+        print(f"  Out-of-core : {payload['report']}")
+        if args.compare:
+            print(f"  Forest      : {forest_baseline(args.data)}")
+    else:
+        payload = build_artifact(args.data, cross_validate=True, verbose=True)
+    save_artifact(payload, args.output)
+    if args.output == pkl_path:
+        save_artifact(SimilarApplicantIndex.from_csv(payload=payload).payload(), SIMILAR_PATH)
+        pdp.publish(InferenceEngine(payload, backend="sklearn"))
+
+    print(f"\n✅ Saved → {args.output}  (version {payload['version']})")
+    print(f"   Countries : {sorted(payload['country_map'].keys())}")
+    print(f"   Exams     : {sorted(payload['exam_map'].keys())}")
+    print(f"   Degrees   : {sorted(payload['degree_map'].keys())}")
+
 
-print(f"\n✅ Saved → {pkl_path}")
-print(f"   Countries : {sorted(country_map.keys())}")
-print(f"   Exams     : {sorted(exam_map.keys())}")
-print(f"   Degrees   : {sorted(degree_map.keys())}")
+if __name__ == "__main__":
+    main()